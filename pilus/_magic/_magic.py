@@ -35,6 +35,10 @@ def detect_media_type(medium: RawMedium) -> str:
         io.seek(0)
     # First, we special-case some SBT-specific data formats
     if data.startswith(IQS_SIGNATURE):
+        # Version 1.0.0 files start with an SHDR chunk (after the signature and
+        # the length of said chunk).
+        if data[12:16] == b"SHDR":
+            return "application/vnd.sbt.iqs;version=1.0.0"
         return "application/vnd.sbt.iqs"
     if data.startswith(BDR_SIGNATURE):
         return "application/vnd.sbt.bdr"
@@ -1,10 +1,11 @@
 from typer import Typer
 
-from ._commands import convert, show
+from ._commands import IQS_APP, convert, show
 
 CLI_APP = Typer(no_args_is_help=True)
 CLI_APP.command()(convert)
 CLI_APP.command()(show)
+CLI_APP.add_typer(IQS_APP, name="iqs")
 # TODO: Remove this dummy command. We only need as long as there only is
 # a single command.
 CLI_APP.command()(lambda: 42)
@@ -1,2 +1,3 @@
 from ._convert import convert as convert
+from ._iqs import IQS_APP as IQS_APP
 from ._show import show as show
@@ -0,0 +1 @@
+from ._iqs import IQS_APP as IQS_APP
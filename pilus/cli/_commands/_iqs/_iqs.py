@@ -0,0 +1,52 @@
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Annotated, BinaryIO
+
+from typer import Argument, Option, Typer
+
+from ....sbt import iqs_concat_io, iqs_crop_io, iqs_split_io
+
+IQS_APP = Typer(no_args_is_help=True, help="Edit IQS files at the chunk level.")
+
+
+@IQS_APP.command()
+def concat(output: Path, inputs: list[Path]) -> None:
+    """Concatenate the input IQS files (in the given order) into the output file."""
+    with ExitStack() as stack:
+        input_ios = [stack.enter_context(file.open("rb")) for file in inputs]
+        output_io = stack.enter_context(output.open("wb"))
+        iqs_concat_io(input_ios, output_io)
+
+
+@IQS_APP.command()
+def crop(
+    input: Path,  # pylint: disable=redefined-builtin  # noqa: A002
+    output: Path,
+    *,
+    start_ns: int | None = Option(None, help="Offset from the start of the file."),
+    end_ns: int | None = Option(None, help="Offset from the start of the file."),
+) -> None:
+    """Write the part of the IQS file within the given time window."""
+    with input.open("rb") as input_io, output.open("wb") as output_io:
+        iqs_crop_io(input_io, output_io, start=start_ns, end=end_ns)
+
+
+@IQS_APP.command()
+def split(
+    input: Path,  # pylint: disable=redefined-builtin  # noqa: A002
+    sites: Annotated[list[str] | None, Argument(help="Defaults to all sites.")] = None,
+) -> None:
+    """Write each site into its own IQS file (e.g., "data.site0.iqs")."""
+    with ExitStack() as stack:
+        input_io = stack.enter_context(input.open("rb"))
+
+        def open_output(site_name: str) -> BinaryIO:
+            output = input.with_suffix(f".{site_name}{input.suffix}")
+            return stack.enter_context(output.open("wb"))
+
+        if sites:
+            outputs = {site_name: open_output(site_name) for site_name in sites}
+            iqs_split_io(input_io, outputs)
+        else:
+            # Every site of the header
+            iqs_split_io(input_io, open_output)
@@ -21,6 +21,7 @@ from .._magic import Medium, MediumSpec, RawMediumType
 from ._combiner import Combiner
 from ._combiner_map import CombinerMap
 from ._morph import (
+    ConvertFunc,
     DeserializeFunc,
     Morpher,
     SerializeFunc,
@@ -71,6 +72,10 @@ class Forge:
 
     def __init__(self) -> None:
         self._morphers = MorphGraph()
+        # Converters take two arguments (input and output medium). Therefore, we
+        # keep them out of the morph graph: We can't chain them with the
+        # (unary) morphs of the graph.
+        self._converters: dict[tuple[MediumSpec, MediumSpec], ConvertFunc] = {}
         self._combiners = CombinerMap()
         self._on_demand_registration_funcs: dict[str, Callable[[], None]] = {}
 
@@ -164,6 +169,25 @@ class Forge:
         # We don't change the function itself, we simply register it.
         return func
 
+    def register_converter(self, func: Callable[P, R]) -> Callable[P, R]:
+        """Register the decorated converter.
+
+        A converter goes directly from one medium to another (e.g., from one
+        version of a file format to the next). This way, `convert` doesn't have
+        to go through the in-memory representation.
+
+        Note that `convert` only uses a converter if it matches both the input
+        and output medium spec exactly. Converters are not part of the morph
+        graph. Hence, we never chain them with other morphs.
+        """
+        type_hints = iter(get_type_hints(func, include_extras=True).values())
+        # We expect that a converter has (at least) two arguments
+        input_spec = _annotation_to_medium_spec(next(type_hints))
+        output_spec = _annotation_to_medium_spec(next(type_hints))
+        self._converters[(input_spec, output_spec)] = cast(ConvertFunc, func)
+        # We don't change the function itself, we simply register it.
+        return func
+
     def register_transformer(self, func: TransformFunc) -> TransformFunc:
         """Register the decorated transformer."""
         type_hints = get_type_hints(func, include_extras=False)
@@ -271,6 +295,12 @@ class Forge:
         self._register_on_demand(input_medium)
         self._register_on_demand(output_medium)
 
+        # Early out if there is a converter for this exact pair of media
+        converter = self._converters.get((input_medium.spec, output_medium.spec))
+        if converter is not None:
+            converter(input_medium.raw, output_medium.raw)
+            return
+
         # Find a sequence of morphs that takes us from the input medium
         # to the output type.
         morphs = tuple(self._morphers.get_morphs(input_medium.spec, output_medium.spec))
@@ -375,6 +405,18 @@ class Forge:
             register_func()
 
 
+def _annotation_to_medium_spec(annotation: Any) -> MediumSpec:
+    """Return the medium spec of, e.g., `Annotated[BinaryIO, "text/csv"]`."""
+    raw_type, media_type = get_args(annotation)
+    match raw_type:
+        case t if issubclass(t, BinaryIO):
+            return MediumSpec(raw_type=BinaryIO, media_type=media_type)
+        case t if issubclass(t, PathLike):
+            return MediumSpec(raw_type=PathLike, media_type=media_type)
+        case _:
+            raise TypeError("Unsupported argument type")
+
+
 def _maybe_enter(stack: ExitStack, obj: Any) -> Any:
     # Special case for `pathlib.Path`: While technically a context manager (until
     # python 3.13), the enter/exit logic is a no-op. It also emits a deprecation
@@ -1,4 +1,5 @@
 # Import each for the side effects: Add on-demand type registration to the global forge
+from . import _numpy as _numpy
 from . import _pilus_basic as _pilus_basic
 from . import _pilus_sbt as _pilus_sbt
 from . import _polars as _polars
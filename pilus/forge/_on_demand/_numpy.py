@@ -0,0 +1,17 @@
+from .._forge import Forge
+from .._global_forge import FORGE
+
+
+@FORGE.call_on_demand(
+    type_repr_any_of=("<class 'numpy.ndarray'>",),
+)
+def register_numpy(forge: Forge) -> None:
+    """Register morphers (serializers/deserializers/etc.) in the given forge.
+
+    Uses the global forge if you don't explicitly provide a forge.
+    """
+    if forge is not FORGE:
+        raise NotImplementedError
+    # Indirectly, the following `import` registers all morphers in the
+    # global `FORGE` instance.
+    from ... import numpy  # noqa: F401, PLC0415
@@ -9,6 +9,7 @@ from .._global_forge import FORGE
     ),
     media_type_any_of=(
         "application/vnd.sbt.iqs",
+        "application/vnd.sbt.iqs;version=1.0.0",
         "application/vnd.sbt.bdr",
         "application/vnd.sbt.extrema+json",
     ),
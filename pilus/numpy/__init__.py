@@ -0,0 +1,26 @@
+"""NumPy views and tools for IQS and BDR data.
+
+Requires the "numpy" extra (e.g., `pip install pilus[numpy]`).
+"""
+
+from ._bdr_arrays import TRANSITION_FIT_DTYPE as TRANSITION_FIT_DTYPE
+from ._bdr_arrays import TranArrays as TranArrays
+from ._bdr_arrays import load_bdr_arrays as load_bdr_arrays
+from ._bdr_arrays import tran_data_arrays as tran_data_arrays
+from ._bdr_arrays import tran_record_dtype as tran_record_dtype
+from ._iqs_arrays import IqsPart as IqsPart
+from ._iqs_arrays import SampleArray as SampleArray
+from ._iqs_arrays import iqs_channel_arrays as iqs_channel_arrays
+from ._iqs_arrays import iqs_channel_complex as iqs_channel_complex
+from ._iqs_arrays import iqs_channel_data_arrays as iqs_channel_data_arrays
+from ._iqs_arrays import iqs_channel_scaled as iqs_channel_scaled
+from ._iqs_arrays import iqs_channel_to_ndarray as iqs_channel_to_ndarray
+from ._iqs_arrays import sample_dtype as sample_dtype
+from ._iqs_cache import DEFAULT_MAX_CACHE_SIZE as DEFAULT_MAX_CACHE_SIZE
+from ._iqs_cache import IqsCache as IqsCache
+from ._iqs_envelope import DEFAULT_BLOCK_SIZES as DEFAULT_BLOCK_SIZES
+from ._iqs_envelope import ChannelEnvelope as ChannelEnvelope
+from ._iqs_envelope import EnvelopeLevel as EnvelopeLevel
+from ._iqs_envelope import IqsEnvelope as IqsEnvelope
+from ._iqs_envelope import channel_envelope as channel_envelope
+from ._iqs_envelope import load_iqs_envelope as load_iqs_envelope
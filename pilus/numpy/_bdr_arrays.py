@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from collections.abc import Buffer, Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, BinaryIO, ClassVar, cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .._magic.signatures import BDR_SIGNATURE
+from ..errors import PilusDeserializeError
+from ..sbt._format._chunk import CrcPolicy, require_single_chunk, stream_chunks
+from ..sbt._format._io import ByteCursor, map_io, read_and_validate_signature, read_view
+from ..sbt._format.bdr._chunks import AhdrChunk
+from ._iqs_arrays import IqsPart
+
+# Same order (and byte layout) as the fields of `TransitionFit`. Packed and
+# little-endian as in the tRAN chunk.
+TRANSITION_FIT_DTYPE = np.dtype(
+    [
+        ("scale", "<f8"),
+        ("center", "<f8"),
+        ("width", "<f8"),
+        ("baseline", "<f8"),
+        ("offset", "<f8"),
+        ("peak_height", "<f8"),
+        ("transition_time", "<f8"),
+        ("mse", "<f8"),
+        ("noise", "<f8"),
+        ("snr", "<f8"),
+        ("ascend", "<f8"),
+        ("iterations", "<u4"),
+        ("origin", "<u4"),
+    ]
+)
+
+
+@cache
+def tran_record_dtype(channel_names: tuple[str, ...]) -> np.dtype[np.void]:
+    """Return the structured data type of a single transition record.
+
+    That is, the time span of the transition followed by the real and imaginary
+    fit (see `TRANSITION_FIT_DTYPE`) of each channel. E.g., 400 bytes for two
+    channels.
+    """
+    return np.dtype(
+        [
+            ("time_start", "<f8"),
+            ("time_end", "<f8"),
+            (
+                "channels",
+                [
+                    (
+                        channel_name,
+                        [("re", TRANSITION_FIT_DTYPE), ("im", TRANSITION_FIT_DTYPE)],
+                    )
+                    for channel_name in channel_names
+                ],
+            ),
+        ]
+    )
+
+
+@dataclass(frozen=True)
+class TranArrays:
+    """Transition records of a BDR site as a NumPy structured array.
+
+    Each column is a (strided) zero-copy view into `records`. E.g., the centers of
+    the real fits of the "hf" channel:
+
+        arrays.fits("hf", "re")["center"]
+
+    Unlike `BdrAggregate`, we keep the transitions in file order.
+    """
+
+    records: NDArray[np.void]
+
+    @property
+    def channel_names(self) -> tuple[str, ...]:
+        """Return the channel names in file order."""
+        channels = self.records.dtype["channels"]
+        assert channels.names is not None
+        return channels.names
+
+    @property
+    def time_start(self) -> NDArray[np.float64]:
+        """Return the start time of each transition."""
+        return self.records["time_start"]
+
+    @property
+    def time_end(self) -> NDArray[np.float64]:
+        """Return the end time of each transition."""
+        return self.records["time_end"]
+
+    def fits(self, channel_name: str, part: IqsPart) -> NDArray[np.void]:
+        """Return the fits of the channel part (see `TRANSITION_FIT_DTYPE`).
+
+        May raise `KeyError` if there is no such channel.
+        """
+        if channel_name not in self.channel_names:
+            raise KeyError(channel_name)
+        return self.records["channels"][channel_name][part]
+
+
+def tran_data_arrays(
+    data: Buffer, *, channel_names: Sequence[str], validate: bool = True
+) -> TranArrays:
+    """Interpret the data of a tRAN chunk as transition records.
+
+    This is a single zero-copy `np.frombuffer` call. There are no Python objects
+    per transition (unlike `TranChunk`). The arrays are read-only if the data is
+    (e.g., `bytes` or a memory-mapped file).
+
+    If `validate` is true, we apply the same checks as `FitComplex` (in bulk).
+
+    May raise `PilusDeserializeError` if the data isn't a whole number of records
+    or if the validation fails.
+    """
+    dtype = tran_record_dtype(tuple(channel_names))
+    view = memoryview(data)
+    if view.nbytes % dtype.itemsize != 0:
+        raise PilusDeserializeError("Invalid chunk tRAN chunk length.")
+    arrays = TranArrays(np.frombuffer(view, dtype=dtype))
+    if validate:
+        _raise_if_invalid(arrays)
+    return arrays
+
+
+def load_bdr_arrays(
+    io: BinaryIO,
+    *,
+    memory_map: bool = False,
+    verify_crc: CrcPolicy | None = None,
+    validate: bool = True,
+) -> dict[str, TranArrays]:
+    """Deserialize IO stream into the transition records of each site.
+
+    This is the columnar counterpart of `bdr_from_io`. We interpret each tRAN
+    chunk with `tran_data_arrays` and concatenate the records of each site (in
+    file order). If a site has a single tRAN chunk and `memory_map` is true, its
+    records refer directly to the mapped pages.
+
+    See `CrcPolicy` for the options of `verify_crc`. Defaults to "strict".
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    if memory_map:
+        io = cast(BinaryIO, map_io(io))
+    read_and_validate_signature(io, BDR_SIGNATURE)
+    header = cast(
+        AhdrChunk,
+        require_single_chunk(io, chunk_models=(AhdrChunk,), verify_crc=verify_crc),
+    )
+    site_records: dict[str, list[memoryview]] = {}
+    for chunk in stream_chunks(
+        io,
+        chunk_models=(AhdrChunk, _TranRecordsChunk),
+        verify_crc=verify_crc,
+        channel_names=header.channel_names,
+    ):
+        if isinstance(chunk, AhdrChunk):
+            if header.channel_names != chunk.channel_names:
+                raise PilusDeserializeError(
+                    "Channel names changed in the middle of the data stream"
+                )
+            # Remember the latest header
+            header = chunk
+            continue
+        assert isinstance(chunk, _TranRecordsChunk)
+        site_records.setdefault(header.site_name, []).append(chunk.data)
+    sites: dict[str, TranArrays] = {}
+    for site_name, records in site_records.items():
+        # Zero-copy if there is a single chunk
+        data = records[0] if len(records) == 1 else b"".join(records)
+        arrays = TranArrays(
+            np.frombuffer(data, dtype=tran_record_dtype(header.channel_names))
+        )
+        if validate:
+            _raise_if_invalid(arrays)
+        sites[site_name] = arrays
+    return sites
+
+
+@dataclass(frozen=True)
+class _TranRecordsChunk:
+    """tRAN chunk that we keep as raw data (see `tran_data_arrays`)."""
+
+    type_: ClassVar[bytes] = b"tRAN"
+
+    data: memoryview
+
+    @classmethod
+    def from_io(cls, io: BinaryIO, **kwargs: Any) -> _TranRecordsChunk:
+        """Read the raw data of the tRAN chunk."""
+        data_length = kwargs["data_length"]
+        assert isinstance(data_length, int)
+        return cls(cls._validate_length(read_view(io, data_length), **kwargs))
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> _TranRecordsChunk:
+        """Return a (zero-copy) view of the raw data of the tRAN chunk."""
+        data_length = kwargs["data_length"]
+        assert isinstance(data_length, int)
+        return cls(cls._validate_length(cursor.read_view(data_length), **kwargs))
+
+    @staticmethod
+    def _validate_length(data: memoryview, **kwargs: Any) -> memoryview:
+        """Return the data as-is if it's a whole number of records.
+
+        May raise `PilusDeserializeError` if it's not.
+        """
+        channel_names: tuple[str, ...] = kwargs["channel_names"]
+        assert isinstance(channel_names, tuple)
+        if len(data) % tran_record_dtype(channel_names).itemsize != 0:
+            raise PilusDeserializeError("Invalid chunk tRAN chunk length.")
+        return data
+
+
+def _raise_if_invalid(arrays: TranArrays) -> None:
+    """Apply the checks of `FitComplex` to all transitions at once.
+
+    May raise `PilusDeserializeError` if any transition fails them.
+    """
+    time_start, time_end = arrays.time_start, arrays.time_end
+    _raise_if_any(time_start > time_end, "Start time must come before end time")
+    parts: tuple[tuple[IqsPart, str], ...] = (("re", "Real"), ("im", "Imaginary"))
+    for channel_name in arrays.channel_names:
+        for part, name in parts:
+            center = arrays.fits(channel_name, part)["center"]
+            _raise_if_any(
+                (center < time_start) | (center > time_end),
+                f"{name} part center must be within the overall time interval "
+                f'(channel "{channel_name}")',
+            )
+
+
+def _raise_if_any(invalid: NDArray[np.bool_], message: str) -> None:
+    """Raise `PilusDeserializeError` about the first invalid transition (if any)."""
+    if invalid.any():
+        index = int(np.argmax(invalid))
+        raise PilusDeserializeError(f"{message} (transition {index})")
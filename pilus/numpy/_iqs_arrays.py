@@ -0,0 +1,92 @@
+from typing import Any, Literal
+
+import numpy as np
+from numpy.typing import DTypeLike, NDArray
+
+from ..forge import FORGE
+from ..sbt import IqsAggregateChannel, IqsChannelData
+
+# Raw samples as they are stored in IQS files: Signed, little-endian integers
+SampleArray = NDArray[np.signedinteger[Any]]
+
+# Real or imaginary part of the complex samples (or of the fits thereof)
+IqsPart = Literal["re", "im"]
+
+
+def sample_dtype(byte_depth: int) -> np.dtype[np.signedinteger[Any]]:
+    """Return the NumPy data type of raw samples with the given byte depth.
+
+    May raise `ValueError` if NumPy has no integer type of that size.
+    """
+    if byte_depth not in (1, 2, 4, 8):
+        raise ValueError(f"Unsupported byte depth: {byte_depth}")
+    return np.dtype(f"<i{byte_depth}")
+
+
+def iqs_channel_data_arrays(
+    data: IqsChannelData, *, byte_depth: int
+) -> tuple[SampleArray, SampleArray]:
+    """Return the real and imaginary parts as zero-copy NumPy arrays.
+
+    The arrays refer directly to the underlying raw data. They are read-only if
+    the raw data is (e.g., `bytes` or a memory-mapped file).
+
+    May raise `ValueError` if the byte depth is unsupported.
+    """
+    dtype = sample_dtype(byte_depth)
+    return np.frombuffer(data.re, dtype=dtype), np.frombuffer(data.im, dtype=dtype)
+
+
+def iqs_channel_arrays(
+    channel: IqsAggregateChannel,
+) -> tuple[SampleArray, SampleArray]:
+    """Return the real and imaginary parts as zero-copy NumPy arrays.
+
+    See `iqs_channel_data_arrays` for details.
+    """
+    return iqs_channel_data_arrays(channel, byte_depth=channel.byte_depth)
+
+
+def iqs_channel_scaled(
+    channel: IqsAggregateChannel, *, dtype: DTypeLike | None = None
+) -> tuple[NDArray[np.floating[Any]], NDArray[np.floating[Any]]]:
+    """Return the real and imaginary parts normalized by the max amplitude.
+
+    Defaults to `float32`. We scale straight into a single array per part. There
+    is no intermediate `float64` array.
+
+    May raise `ValueError` if the byte depth is unsupported.
+    """
+    # Default arguments
+    if dtype is None:
+        dtype = np.float32
+    re, im = iqs_channel_arrays(channel)
+    scale = 1 / channel.max_amplitude
+    return np.multiply(re, scale, dtype=dtype), np.multiply(im, scale, dtype=dtype)
+
+
+def iqs_channel_complex(
+    channel: IqsAggregateChannel, *, dtype: DTypeLike | None = None
+) -> NDArray[np.complexfloating[Any, Any]]:
+    """Return the channel as a complex array normalized by the max amplitude.
+
+    Defaults to `complex64`. We scale both parts straight into the complex array.
+    This is the only allocation.
+
+    May raise `ValueError` if the byte depth is unsupported.
+    """
+    # Default arguments
+    if dtype is None:
+        dtype = np.complex64
+    re, im = iqs_channel_arrays(channel)
+    result = np.empty(len(re), dtype=dtype)
+    scale = 1 / channel.max_amplitude
+    np.multiply(re, scale, out=result.real)
+    np.multiply(im, scale, out=result.imag)
+    return result
+
+
+@FORGE.register_transformer
+def iqs_channel_to_ndarray(channel: IqsAggregateChannel) -> np.ndarray:
+    """Convert IQS channel to a normalized `complex64` array."""
+    return iqs_channel_complex(channel)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from contextlib import suppress
+from datetime import datetime
+from hashlib import sha256
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Any
+
+import numpy as np
+
+from ..sbt import (
+    IqsAggregate,
+    IqsAggregateChannel,
+    IqsAggregateSite,
+    IqsGap,
+    iqs_from_io,
+)
+from ..sbt._format._io import FileStamp, read_through_sidecar
+from ._iqs_arrays import sample_dtype
+
+# Upper bound on the total size (in bytes) of all cache entries
+DEFAULT_MAX_CACHE_SIZE = 16 * 1024**3
+
+# Bump this whenever the layout of a cache entry changes
+_CACHE_VERSION = 1
+
+# We write this file last. Its modification time marks the last use of the entry.
+_HEADER_NAME = "header.json"
+
+
+class IqsCache:
+    """Cache of merged IQS channel data as memory-mappable NumPy (`.npy`) files.
+
+    The first `load` of an IQS file merges the data as usual and writes each
+    channel part into its own `.npy` file. Subsequent loads of the same file (same
+    size and modification time) memory-map these files instead. That is, we skip
+    the chunk parsing, the CRC verification, and the merge altogether. The `.npy`
+    format aligns the data. The channel data of the returned aggregate refers
+    directly to the mapped pages (zero-copy).
+
+    We keep the total size of the cache below `max_size` (in bytes). We evict the
+    least recently used entries first. Defaults to `DEFAULT_MAX_CACHE_SIZE`.
+    """
+
+    def __init__(
+        self, directory: Path | None = None, *, max_size: int | None = None
+    ) -> None:
+        """Use the given cache directory. Defaults to "$XDG_CACHE_HOME/pilus/iqs"."""
+        # Default arguments
+        if directory is None:
+            directory = _default_directory()
+        if max_size is None:
+            max_size = DEFAULT_MAX_CACHE_SIZE
+        self._directory = directory
+        self._max_size = max_size
+
+    @property
+    def directory(self) -> Path:
+        """Return the cache directory."""
+        return self._directory
+
+    def load(self, file: Path) -> IqsAggregate:
+        """Return the IQS aggregate of the given file.
+
+        Uses the cache entry of the file if it exists and is up to date. Otherwise,
+        we read the file itself and (re)write the cache entry.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        entry = self._directory / sha256(str(file.resolve()).encode()).hexdigest()
+
+        def load() -> tuple[IqsAggregate, FileStamp]:
+            aggregate, stamp = _read_entry(entry)
+            _mark_as_used(entry)
+            return aggregate, stamp
+
+        def compute(_stamp: FileStamp) -> IqsAggregate:
+            with file.open("rb") as io:
+                return iqs_from_io(io, memory_map=True)
+
+        def store(aggregate: IqsAggregate, stamp: FileStamp) -> None:
+            # The data may not fit the byte depth. We simply don't cache it then.
+            with suppress(ValueError):
+                self._write_entry(entry, aggregate, stamp=stamp)
+                self.evict()
+
+        return read_through_sidecar(file, load=load, compute=compute, store=store)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until we are within `max_size`."""
+        # Early out if there is nothing to evict
+        if not self._directory.is_dir():
+            return
+        entries: list[tuple[int, int, Path]] = []
+        for entry in self._directory.iterdir():
+            # Skip the entries that someone is still writing
+            if entry.name.startswith("."):
+                continue
+            # Another process may remove the entry while we look at it
+            with suppress(OSError):
+                last_used_ns = (entry / _HEADER_NAME).stat().st_mtime_ns
+                size = sum(part.stat().st_size for part in entry.iterdir())
+                entries.append((last_used_ns, size, entry))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def _write_entry(
+        self,
+        entry: Path,
+        aggregate: IqsAggregate,
+        *,
+        stamp: FileStamp,
+    ) -> None:
+        """Write the aggregate into the given cache entry.
+
+        We write into a temporary directory first and then rename it. This way,
+        concurrent readers never see a partial entry.
+
+        May raise:
+          * `OSError` if we can't write the entry.
+          * `ValueError` if the data doesn't fit the byte depth.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        temporary = Path(mkdtemp(prefix=".", dir=self._directory))
+        try:
+            channels: list[tuple[str, str, int, int, int]] = []
+            for site_name, site in aggregate.sites.items():
+                for channel_name, channel in site.items():
+                    i = len(channels)
+                    channels.append(
+                        (
+                            site_name,
+                            channel_name,
+                            channel.time_step_ns,
+                            channel.byte_depth,
+                            channel.max_amplitude,
+                        )
+                    )
+                    dtype = _part_dtype(channel.byte_depth)
+                    for part, data in (("re", channel.re), ("im", channel.im)):
+                        array = np.frombuffer(data, dtype=dtype)
+                        np.save(
+                            temporary / f"{i}.{part}.npy", array, allow_pickle=False
+                        )
+            header = {
+                "version": _CACHE_VERSION,
+                "start_time": aggregate.start_time.isoformat(),
+                "duration_ns": aggregate.duration_ns,
+                "gap_map": [[gap.start_ns, gap.end_ns] for gap in aggregate.gap_map],
+                "channels": channels,
+                "file_size": stamp.size,
+                "file_mtime_ns": stamp.mtime_ns,
+            }
+            (temporary / _HEADER_NAME).write_text(json.dumps(header))
+            _mark_as_used(temporary)
+            # Replace the stale entry (if any). If another process beats us to
+            # it, we simply use theirs.
+            shutil.rmtree(entry, ignore_errors=True)
+            temporary.rename(entry)
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+
+def _read_entry(entry: Path) -> tuple[IqsAggregate, FileStamp]:
+    """Memory-map the cache entry.
+
+    Also returns the stamp of the file that we cached.
+
+    May raise:
+      * `OSError` if we can't read the entry.
+      * `ValueError` if the entry isn't a (supported) cache entry.
+      * `KeyError` if the entry lacks some fields.
+    """
+    header: dict[str, Any] = json.loads((entry / _HEADER_NAME).read_text())
+    if header["version"] != _CACHE_VERSION:
+        raise ValueError("Unsupported cache entry version")
+    sites: dict[str, IqsAggregateSite] = {}
+    for i, (
+        site_name,
+        channel_name,
+        time_step_ns,
+        byte_depth,
+        max_amplitude,
+    ) in enumerate(header["channels"]):
+        re, im = (
+            np.load(entry / f"{i}.{part}.npy", mmap_mode="r", allow_pickle=False)
+            for part in ("re", "im")
+        )
+        sites.setdefault(site_name, {})[channel_name] = IqsAggregateChannel(
+            time_step_ns,
+            byte_depth,
+            max_amplitude,
+            memoryview(re.view(np.uint8)),
+            memoryview(im.view(np.uint8)),
+        )
+    aggregate = IqsAggregate(
+        start_time=datetime.fromisoformat(header["start_time"]),
+        duration_ns=header["duration_ns"],
+        sites=sites,
+        gap_map=tuple(
+            IqsGap(start_ns, end_ns) for start_ns, end_ns in header["gap_map"]
+        ),
+    )
+    return aggregate, FileStamp(header["file_size"], header["file_mtime_ns"])
+
+
+def _mark_as_used(entry: Path) -> None:
+    """Set the modification time of the entry's header to now.
+
+    Note that we give the time explicitly. Otherwise, the file system uses its
+    coarse clock (with a resolution of several milliseconds on Linux). The
+    order of recent uses would then be ambiguous.
+
+    May raise `OSError` if we can't touch the header.
+    """
+    now_ns = time.time_ns()
+    os.utime(entry / _HEADER_NAME, ns=(now_ns, now_ns))
+
+
+def _part_dtype(byte_depth: int) -> np.dtype[Any]:
+    """Return the data type that we store the channel parts as.
+
+    Raw bytes for byte depths that NumPy has no integer type for.
+    """
+    try:
+        return sample_dtype(byte_depth)
+    except ValueError:
+        return np.dtype(np.uint8)
+
+
+def _default_directory() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pilus" / "iqs"
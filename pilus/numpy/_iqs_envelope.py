@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..sbt import IqsAggregate, IqsAggregateChannel, IqsTimeBound, iqs_from_io
+from ..sbt._format._io import FileStamp, read_through_sidecar, write_atomically
+from ._iqs_arrays import IqsPart, sample_dtype
+
+# Number of samples per block of each level (finest first). Each block size must
+# be a multiple of the previous one.
+DEFAULT_BLOCK_SIZES = (64, 4096, 262144)
+
+# We compute the finest level in windows of (about) this many samples. This way,
+# the temporary arrays stay small regardless of the channel length.
+STREAM_WINDOW_SIZE = 1024 * 1024
+
+# Bump this whenever the sidecar layout changes
+_SIDECAR_VERSION = 1
+
+
+@dataclass(frozen=True, eq=False)
+class EnvelopeLevel:
+    """Per-block minimum, maximum, and mean of a single channel part.
+
+    The values are normalized by the max amplitude of the channel. The last block
+    may hold fewer samples than `block_size`.
+    """
+
+    # Number of samples per block
+    block_size: int
+    # Time of the first block relative to the start of the recording
+    offset_ns: int
+    minimum: NDArray[np.float32]
+    maximum: NDArray[np.float32]
+    mean: NDArray[np.float32]
+
+    def __len__(self) -> int:
+        return len(self.minimum)
+
+    def blocks(self, start: int, end: int) -> EnvelopeLevel:
+        """Return the blocks in the `[start, end)` range (zero-copy)."""
+        start = max(0, start)
+        end = max(start, end)
+        return replace(
+            self,
+            minimum=self.minimum[start:end],
+            maximum=self.maximum[start:end],
+            mean=self.mean[start:end],
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class ChannelEnvelope:
+    """Envelope pyramid of both parts of a single channel."""
+
+    time_step_ns: int
+    # One level per block size (finest first)
+    re: tuple[EnvelopeLevel, ...]
+    im: tuple[EnvelopeLevel, ...]
+
+
+@dataclass(frozen=True, eq=False)
+class IqsEnvelope:
+    """Envelope pyramids of all channels of an IQS recording.
+
+    Use this to, e.g., plot an entire recording without loading all its samples.
+    See `select`.
+    """
+
+    start_time: datetime
+    block_sizes: tuple[int, ...]
+    sites: dict[str, dict[str, ChannelEnvelope]]
+    # Key that identifies the source file. We use it to detect stale sidecar files.
+    file_size: int = 0
+    file_mtime_ns: int = 0
+
+    def select(  # noqa: PLR0913
+        self,
+        site_name: str,
+        channel_name: str,
+        part: IqsPart,
+        *,
+        width: int,
+        start: IqsTimeBound | None = None,
+        end: IqsTimeBound | None = None,
+    ) -> EnvelopeLevel | None:
+        """Return the coarsest level with at least `width` blocks in the range.
+
+        Give `width` as, e.g., the number of pixels that you plot the range on.
+        Each bound is either a timezone-aware `datetime` or an offset in
+        nanoseconds from the start of the recording. We only return the blocks
+        that overlap the range.
+
+        Returns `None` if even the finest level has fewer than `width` blocks in
+        the range. Use the samples themselves in that case.
+
+        May raise `KeyError` if there is no such site or channel.
+        """
+        channel = self.sites[site_name][channel_name]
+        levels = channel.re if part == "re" else channel.im
+        start_ns = 0 if start is None else self._to_offset_ns(start)
+        end_ns = None if end is None else self._to_offset_ns(end)
+        for level in reversed(levels):
+            block_ns = level.block_size * channel.time_step_ns
+            first = start_ns // block_ns
+            last = len(level) if end_ns is None else -(-end_ns // block_ns)
+            last = min(last, len(level))
+            if last - first >= width:
+                blocks = level.blocks(first, last)
+                return replace(blocks, offset_ns=first * block_ns)
+        return None
+
+    def _to_offset_ns(self, bound: IqsTimeBound) -> int:
+        if isinstance(bound, datetime):
+            return round((bound - self.start_time).total_seconds() * 1e9)
+        return bound
+
+    @classmethod
+    def from_aggregate(
+        cls, aggregate: IqsAggregate, *, block_sizes: Sequence[int] | None = None
+    ) -> IqsEnvelope:
+        """Compute the envelope pyramids of all channels of the aggregate.
+
+        See `channel_envelope` for details.
+        """
+        # Default arguments
+        if block_sizes is None:
+            block_sizes = DEFAULT_BLOCK_SIZES
+        return cls(
+            aggregate.start_time,
+            tuple(block_sizes),
+            {
+                site_name: {
+                    channel_name: channel_envelope(channel, block_sizes=block_sizes)
+                    for channel_name, channel in site.items()
+                }
+                for site_name, site in aggregate.sites.items()
+            },
+        )
+
+    @classmethod
+    def from_file(cls, file: Path) -> IqsEnvelope:
+        """Deserialize an envelope sidecar file.
+
+        May raise:
+          * `OSError` if we can't read the file
+          * `ValueError` if the file isn't a (supported) envelope sidecar
+        """
+        with np.load(file, allow_pickle=False) as arrays:
+            header = json.loads(arrays["header"].tobytes())
+            if header.get("version") != _SIDECAR_VERSION:
+                raise ValueError("Unsupported envelope sidecar version")
+            block_sizes = tuple(header["block_sizes"])
+            sites: dict[str, dict[str, ChannelEnvelope]] = {}
+            for i, (site_name, channel_name, time_step_ns) in enumerate(
+                header["channels"]
+            ):
+                re, im = (
+                    tuple(
+                        EnvelopeLevel(
+                            block_size,
+                            0,
+                            arrays[f"{i}/{part}/{block_size}/min"],
+                            arrays[f"{i}/{part}/{block_size}/max"],
+                            arrays[f"{i}/{part}/{block_size}/mean"],
+                        )
+                        for block_size in block_sizes
+                    )
+                    for part in ("re", "im")
+                )
+                sites.setdefault(site_name, {})[channel_name] = ChannelEnvelope(
+                    time_step_ns, re, im
+                )
+        return cls(
+            datetime.fromtimestamp(header["start_time_us"] * 1e-6, tz=UTC),
+            block_sizes,
+            sites,
+            file_size=header["file_size"],
+            file_mtime_ns=header["file_mtime_ns"],
+        )
+
+    def to_file(self, file: Path) -> None:
+        """Serialize this envelope into a sidecar file (NumPy `.npz` archive).
+
+        We write atomically (see `write_atomically`).
+
+        May raise `OSError` if we can't write the file.
+        """
+        channels: list[tuple[str, str, int]] = []
+        arrays: dict[str, NDArray[Any]] = {}
+        for site_name, site in self.sites.items():
+            for channel_name, channel in site.items():
+                i = len(channels)
+                channels.append((site_name, channel_name, channel.time_step_ns))
+                for part, levels in (("re", channel.re), ("im", channel.im)):
+                    for level in levels:
+                        prefix = f"{i}/{part}/{level.block_size}"
+                        arrays[f"{prefix}/min"] = level.minimum
+                        arrays[f"{prefix}/max"] = level.maximum
+                        arrays[f"{prefix}/mean"] = level.mean
+        header = {
+            "version": _SIDECAR_VERSION,
+            "start_time_us": int(self.start_time.timestamp() * 1e6),
+            "block_sizes": self.block_sizes,
+            "channels": channels,
+            "file_size": self.file_size,
+            "file_mtime_ns": self.file_mtime_ns,
+        }
+        arrays["header"] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+        # Note that we give `savez` an open file. Otherwise, it appends ".npz" to
+        # the file name.
+        write_atomically(file, lambda io: np.savez(io, allow_pickle=False, **arrays))
+
+
+def load_iqs_envelope(
+    file: Path,
+    *,
+    block_sizes: Sequence[int] | None = None,
+    sidecar: Path | None = None,
+) -> IqsEnvelope:
+    """Return the envelope pyramids of the given IQS file.
+
+    Uses the sidecar file if it exists and matches the file's size and modification
+    time (and the block sizes). Otherwise, we compute the envelopes and (re)write
+    the sidecar file. We read (and verify) the memory-mapped file once and compute
+    the envelopes of all channels from the resulting aggregate. If the file has
+    a single data chunk, the samples stay in the mapped pages. Otherwise, we
+    merge them and hold the samples of all channels in memory at once (as for
+    `iqs_from_io`).
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if block_sizes is None:
+        block_sizes = DEFAULT_BLOCK_SIZES
+    if sidecar is None:
+        sidecar = file.with_name(f"{file.name}.envelope")
+
+    def load() -> tuple[IqsEnvelope, FileStamp]:
+        envelope = IqsEnvelope.from_file(sidecar)
+        if envelope.block_sizes != tuple(block_sizes):
+            raise ValueError("The sidecar file has other block sizes")
+        return envelope, FileStamp(envelope.file_size, envelope.file_mtime_ns)
+
+    def compute(stamp: FileStamp) -> IqsEnvelope:
+        with file.open("rb") as io:
+            aggregate = iqs_from_io(io, memory_map=True)
+        envelope = IqsEnvelope.from_aggregate(aggregate, block_sizes=block_sizes)
+        return replace(envelope, file_size=stamp.size, file_mtime_ns=stamp.mtime_ns)
+
+    def store(envelope: IqsEnvelope, _stamp: FileStamp) -> None:
+        envelope.to_file(sidecar)
+
+    return read_through_sidecar(file, load=load, compute=compute, store=store)
+
+
+def channel_envelope(
+    channel: IqsAggregateChannel, *, block_sizes: Sequence[int] | None = None
+) -> ChannelEnvelope:
+    """Compute the envelope pyramid of both parts of the channel.
+
+    We go through the samples once (in windows of `STREAM_WINDOW_SIZE`) to
+    compute the finest level. We derive each coarser level from the previous one.
+
+    May raise `ValueError` if the block sizes are invalid or if the byte depth is
+    unsupported.
+    """
+    # Default arguments
+    if block_sizes is None:
+        block_sizes = DEFAULT_BLOCK_SIZES
+    _raise_if_invalid_block_sizes(block_sizes)
+    re, im = (
+        _part_envelope(
+            np.frombuffer(data, dtype=sample_dtype(channel.byte_depth)),
+            block_sizes=block_sizes,
+            scale=1 / channel.max_amplitude,
+        )
+        for data in (channel.re, channel.im)
+    )
+    return ChannelEnvelope(channel.time_step_ns, re, im)
+
+
+def _part_envelope(
+    samples: NDArray[Any], *, block_sizes: Sequence[int], scale: float
+) -> tuple[EnvelopeLevel, ...]:
+    finest = block_sizes[0]
+    number_of_blocks = -(-len(samples) // finest)
+    minimum = np.empty(number_of_blocks, dtype=samples.dtype)
+    maximum = np.empty(number_of_blocks, dtype=samples.dtype)
+    sums = np.empty(number_of_blocks, dtype=np.float64)
+    # Windows of whole blocks
+    window_size = max(finest, STREAM_WINDOW_SIZE - STREAM_WINDOW_SIZE % finest)
+    for start in range(0, len(samples), window_size):
+        window = samples[start : start + window_size]
+        indices = np.arange(0, len(window), finest)
+        blocks = slice(start // finest, start // finest + len(indices))
+        np.minimum.reduceat(window, indices, out=minimum[blocks])
+        np.maximum.reduceat(window, indices, out=maximum[blocks])
+        np.add.reduceat(window, indices, dtype=np.float64, out=sums[blocks])
+    counts = np.minimum(finest, len(samples) - np.arange(number_of_blocks) * finest)
+    levels = [_level(finest, minimum, maximum, sums, counts, scale=scale)]
+    for previous, block_size in pairwise(block_sizes):
+        indices = np.arange(0, len(minimum), block_size // previous)
+        minimum = np.minimum.reduceat(minimum, indices)
+        maximum = np.maximum.reduceat(maximum, indices)
+        sums = np.add.reduceat(sums, indices)
+        counts = np.add.reduceat(counts, indices)
+        levels.append(_level(block_size, minimum, maximum, sums, counts, scale=scale))
+    return tuple(levels)
+
+
+def _level(  # noqa: PLR0913
+    block_size: int,
+    minimum: NDArray[Any],
+    maximum: NDArray[Any],
+    sums: NDArray[np.float64],
+    counts: NDArray[Any],
+    *,
+    scale: float,
+) -> EnvelopeLevel:
+    return EnvelopeLevel(
+        block_size,
+        0,
+        np.multiply(minimum, scale, dtype=np.float32),
+        np.multiply(maximum, scale, dtype=np.float32),
+        np.multiply(sums / counts, scale, dtype=np.float32),
+    )
+
+
+def _raise_if_invalid_block_sizes(block_sizes: Sequence[int]) -> None:
+    if not block_sizes or block_sizes[0] < 1:
+        raise ValueError("Need at least one positive block size")
+    for previous, block_size in pairwise(block_sizes):
+        if block_size <= previous or block_size % previous != 0:
+            raise ValueError(
+                "Each block size must be a (larger) multiple of the previous one"
+            )
@@ -9,6 +9,7 @@ from pilus.sbt import BdrAggregate
 from pilus.snipdb import SnipDb, SnipRow
 
 from ..forge import FORGE
+from ..numpy import sample_dtype
 from ..sbt import TransitionFit
 
 
@@ -52,10 +53,10 @@ def iqs_snipdb_polars_df(iqs: SnipDb) -> pl.DataFrame:
 
         # Value axis
         wave = row.content
-        assert wave.lpcm.byte_depth == 4
-        wave_values = (
-            np.frombuffer(wave.lpcm.data, dtype=np.int32) / wave.metadata.max_amplitude
+        samples = np.frombuffer(
+            wave.lpcm.data, dtype=sample_dtype(wave.lpcm.byte_depth)
         )
+        wave_values = samples / wave.metadata.max_amplitude
         data[name] = wave_values
 
     result = pl.DataFrame(data)
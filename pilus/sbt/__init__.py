@@ -1,5 +1,17 @@
+from ._format._chunk import ChunkStats as ChunkStats
+from ._format._chunk import instrument_chunks as instrument_chunks
+from ._format.bdr import BdrFollower as BdrFollower
 from ._format.bdr import from_io as bdr_from_io  # noqa: F401
+from ._format.bdr import from_stream as bdr_from_stream  # noqa: F401
+from ._format.iqs import IqsFollower as IqsFollower
+from ._format.iqs import IqsTimeBound as IqsTimeBound
+from ._format.iqs import IqsWriter as IqsWriter
+from ._format.iqs import concat_io as iqs_concat_io  # noqa: F401
+from ._format.iqs import crop_io as iqs_crop_io  # noqa: F401
 from ._format.iqs import from_io as iqs_from_io  # noqa: F401
+from ._format.iqs import from_stream as iqs_from_stream  # noqa: F401
+from ._format.iqs import split_io as iqs_split_io  # noqa: F401
+from ._format.iqs import upgrade_io as iqs_upgrade_io  # noqa: F401
 from ._model import BdrAggregate as BdrAggregate
 from ._model import BdrAggregateChannel as BdrAggregateChannel
 from ._model import BdrAggregateSite as BdrAggregateSite
@@ -7,12 +19,17 @@ from ._model import Extrema as Extrema
 from ._model import Extremum as Extremum
 from ._model import ExtremumType as ExtremumType
 from ._model import FitComplex as FitComplex
+from ._model import FitComplexColumns as FitComplexColumns
 from ._model import IqsAggregate as IqsAggregate
 from ._model import IqsAggregateChannel as IqsAggregateChannel
 from ._model import IqsAggregateSite as IqsAggregateSite
 from ._model import IqsChannelData as IqsChannelData
 from ._model import IqsChannelHeader as IqsChannelHeader
+from ._model import IqsGap as IqsGap
+from ._model import LazyRawData as LazyRawData
+from ._model import RawData as RawData
 from ._model import TransitionFit as TransitionFit
 from ._model import TransitionFitChannel as TransitionFitChannel
+from ._model import TransitionFitColumns as TransitionFitColumns
 from ._transform import bdr_to_simple_table as bdr_to_simple_table
 from ._transform import iqs_aggregate_to_snipdb as iqs_aggregate_to_snipdb
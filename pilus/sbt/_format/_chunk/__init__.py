@@ -1,7 +1,31 @@
 from ._chunk import ReadableChunk as ReadableChunk
 from ._chunk import UnidentifiedAncilliaryChunk as UnidentifiedAncilliaryChunk
 from ._chunk import WritableChunk as WritableChunk
+from ._chunk_follower import ChunkFollower as ChunkFollower
+from ._chunk_index import ChunkIndex as ChunkIndex
+from ._chunk_index import ChunkIndexEntry as ChunkIndexEntry
+from ._chunk_io import iter_chunk_entries as iter_chunk_entries
+from ._chunk_io import load_chunk_index as load_chunk_index
+from ._chunk_io import peek_chunk_data as peek_chunk_data
 from ._chunk_io import read_chunk as read_chunk
+from ._chunk_io import read_chunk_at as read_chunk_at
 from ._chunk_io import require_single_chunk as require_single_chunk
+from ._chunk_io import scan_chunks as scan_chunks
 from ._chunk_io import stream_chunks as stream_chunks
 from ._chunk_io import write_chunk as write_chunk
+from ._chunk_io_async import read_chunk_async as read_chunk_async
+from ._chunk_io_async import require_single_chunk_async as require_single_chunk_async
+from ._chunk_io_async import stream_chunks_async as stream_chunks_async
+from ._chunk_parallel import RANGES_PER_WORKER as RANGES_PER_WORKER
+from ._chunk_parallel import borrow_or_create_pool as borrow_or_create_pool
+from ._chunk_parallel import file_behind as file_behind
+from ._chunk_parallel import process_pool as process_pool
+from ._chunk_parallel import read_chunks_from_file as read_chunks_from_file
+from ._chunk_parallel import split_into_ranges as split_into_ranges
+from ._chunk_probe import ChunkEvent as ChunkEvent
+from ._chunk_probe import ChunkHook as ChunkHook
+from ._chunk_probe import ChunkStats as ChunkStats
+from ._chunk_probe import ChunkTypeStats as ChunkTypeStats
+from ._chunk_probe import instrument_chunks as instrument_chunks
+from ._crc_verifier import CrcPolicy as CrcPolicy
+from ._crc_verifier import CrcVerifier as CrcVerifier
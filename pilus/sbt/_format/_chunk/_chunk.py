@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, BinaryIO, ClassVar, Protocol, runtime_checkable
 
+from .._io import ByteCursor
+
 
 @dataclass(frozen=True)
 class UnidentifiedAncilliaryChunk:
@@ -18,6 +20,9 @@ class ReadableChunk(Protocol):
     @classmethod
     def from_io(cls, io: BinaryIO, **kwargs: Any) -> ReadableChunk: ...
 
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> ReadableChunk: ...
+
 
 class WritableChunk(Protocol):
     """Chunk that you can write to binary IO."""
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from collections.abc import Buffer
+from io import SEEK_CUR, SEEK_SET, BufferedIOBase, UnsupportedOperation
+from typing import BinaryIO
+
+from .._io import read_exactly_into, seek
+from ._chunk_probe import ChunkProbe
+from ._crc import crc32
+
+# We read the chunk data in blocks of this size. Large enough to amortize the
+# per-call overhead. Small enough to keep the (temporary) memory use in check.
+BLOCK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class ChunkDataIO(BufferedIOBase):
+    """Read-only IO stream over the data of a single chunk.
+
+    We read the data from the underlying IO stream in fixed-size blocks and feed
+    each block to `crc32` as it arrives. This way, the deserializers can consume
+    the chunk data as a stream. E.g., read channel data directly into pre-allocated
+    buffers with `readinto`. In turn, we never need to hold the entire chunk data
+    in a temporary buffer.
+
+    Give `None` as the initial `crc` to not compute the CRC at all.
+
+    You may seek forward (e.g., to skip data that you don't need). If we don't
+    compute the CRC, we seek in the underlying IO stream as well. Otherwise, we
+    still have to feed the skipped data to `crc32`, but we don't keep it around.
+
+    Give a `probe` to measure the time spent on I/O and CRC. We attribute the time
+    in between our reads to the deserializer (the "model" phase).
+    """
+
+    def __init__(
+        self,
+        io: BinaryIO,
+        data_length: int,
+        *,
+        crc: int | None,
+        probe: ChunkProbe | None = None,
+    ) -> None:
+        super().__init__()
+        self._io = io
+        self._data_length = data_length
+        # Number of bytes that we have yet to read from `io`
+        self._remaining = data_length
+        self._crc = crc
+        self._probe = probe
+        # Current block. We serve small reads from this block.
+        self._block = memoryview(b"")
+
+    @property
+    def crc(self) -> int | None:
+        """Return the CRC of all data consumed so far.
+
+        Call `skip_remaining` first if you want the CRC of the entire chunk data.
+
+        Returns `None` if we don't compute the CRC.
+        """
+        return self._crc
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._data_length - self._remaining - len(self._block)
+
+    def seek(self, offset: int, whence: int = SEEK_SET, /) -> int:
+        position = self.tell()
+        if whence == SEEK_SET:
+            offset -= position
+        elif whence != SEEK_CUR:
+            raise UnsupportedOperation(
+                "Can only seek relative to the start or the current position"
+            )
+        if offset < 0:
+            raise UnsupportedOperation("Can't seek backwards in the chunk data")
+        self._skip(min(offset, len(self._block) + self._remaining))
+        return self.tell()
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._block) + self._remaining
+        # Fast path for reads that the current block can serve (the common case)
+        if size <= len(self._block):
+            result = self._block[:size].tobytes()
+            self._block = self._block[size:]
+            return result
+        buffer = bytearray(size)
+        number_of_bytes_read = self.readinto(buffer)
+        del buffer[number_of_bytes_read:]
+        return bytes(buffer)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer: Buffer) -> int:
+        destination = memoryview(buffer).cast("B")
+        # First, drain the current block
+        size = min(len(destination), len(self._block))
+        destination[:size] = self._block[:size]
+        self._block = self._block[size:]
+        destination = destination[size:]
+        number_of_bytes_read = size
+        while destination and (self._remaining or self._block):
+            if len(destination) >= BLOCK_SIZE:
+                # Large reads go directly into `destination` (one block at a
+                # time). This avoids the intermediate copy via the current block.
+                size = min(BLOCK_SIZE, self._remaining)
+                self._read_from_io(destination[:size])
+            else:
+                # Small reads go via the current block
+                self._fill_block()
+                size = min(len(destination), len(self._block))
+                destination[:size] = self._block[:size]
+                self._block = self._block[size:]
+            destination = destination[size:]
+            number_of_bytes_read += size
+        return number_of_bytes_read
+
+    def skip_remaining(self) -> None:
+        """Consume all remaining chunk data.
+
+        We still feed the data to `crc32`. We just don't keep it around. If we
+        don't compute the CRC, we simply seek past the data.
+        """
+        self._skip(len(self._block) + self._remaining)
+
+    def _skip(self, size: int) -> None:
+        """Consume the given number of bytes without keeping them around."""
+        # First, drain the current block
+        drained = min(size, len(self._block))
+        self._block = self._block[drained:]
+        size -= drained
+        if not size:
+            return
+        if self._crc is None:
+            if self._probe is not None:
+                self._probe.lap("model")
+            seek(self._io, size, SEEK_CUR)
+            self._remaining -= size
+            if self._probe is not None:
+                self._probe.lap("io")
+            return
+        block = bytearray(min(size, BLOCK_SIZE))
+        while size:
+            block_size = min(size, BLOCK_SIZE)
+            self._read_from_io(memoryview(block)[:block_size])
+            size -= block_size
+
+    def _fill_block(self) -> None:
+        assert not self._block
+        block = bytearray(min(self._remaining, BLOCK_SIZE))
+        self._read_from_io(memoryview(block))
+        self._block = memoryview(block)
+
+    def _read_from_io(self, destination: memoryview) -> None:
+        """Fill `destination` with data from the underlying IO stream.
+
+        Feeds the data to `crc32` as it arrives.
+        """
+        size = len(destination)
+        assert size <= self._remaining
+        if self._probe is not None:
+            self._probe.lap("model")
+        read_exactly_into(self._io, destination)
+        if self._probe is not None:
+            self._probe.lap("io")
+        if self._crc is not None:
+            self._crc = crc32(destination, self._crc)
+            if self._probe is not None:
+                self._probe.lap("crc")
+        self._remaining -= size
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from collections.abc import Buffer, Iterable
+from io import BufferedIOBase
+from typing import BinaryIO
+
+from .._io import write_buffers, write_exactly
+from ._chunk_probe import ChunkProbe
+from ._crc import crc32
+
+
+class ChunkDataWriter(BufferedIOBase):
+    """Write-only IO stream for the data of a single chunk.
+
+    We pass all data straight through to the underlying IO stream and feed it to
+    `crc32` along the way. This way, the serializers can write the chunk data
+    directly to its destination. In turn, we never need to hold the entire chunk
+    data in a temporary buffer.
+
+    The counterpart of `ChunkDataIO`. Also when it comes to the `probe`.
+    """
+
+    def __init__(
+        self, io: BinaryIO, *, crc: int, probe: ChunkProbe | None = None
+    ) -> None:
+        super().__init__()
+        self._io = io
+        self._crc = crc
+        self._probe = probe
+        self._number_of_bytes_written = 0
+
+    @property
+    def crc(self) -> int:
+        """Return the CRC of all data written so far."""
+        return self._crc
+
+    @property
+    def number_of_bytes_written(self) -> int:
+        """Return the number of bytes written so far."""
+        return self._number_of_bytes_written
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, buffer: Buffer) -> int:
+        data = memoryview(buffer).cast("B")
+        if self._probe is not None:
+            self._probe.lap("model")
+        write_exactly(self._io, data)
+        if self._probe is not None:
+            self._probe.lap("io")
+        self._update(data)
+        return len(data)
+
+    def writelines(self, lines: Iterable[Buffer]) -> None:  # type: ignore[override]
+        # We forward all buffers in one go. This way, the underlying IO stream can
+        # use vectored I/O (e.g., `os.writev`).
+        views = [memoryview(line).cast("B") for line in lines]
+        if self._probe is not None:
+            self._probe.lap("model")
+        write_buffers(self._io, views)
+        if self._probe is not None:
+            self._probe.lap("io")
+        for view in views:
+            self._update(view)
+
+    def _update(self, data: memoryview) -> None:
+        self._crc = crc32(data, self._crc)
+        self._number_of_bytes_written += len(data)
+        if self._probe is not None:
+            self._probe.lap("crc")
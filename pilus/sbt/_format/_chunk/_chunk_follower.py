@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from io import SEEK_SET
+from os import fstat
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from ....errors import PilusOSError
+from .._io import read_and_validate_signature, read_int, seek
+from ._chunk import ReadableChunk, UnidentifiedAncilliaryChunk
+from ._chunk_io import read_chunk
+from ._crc_verifier import CrcPolicy, CrcVerifier
+
+
+class ChunkFollower:
+    """Follow a chunk file that is still being written.
+
+    Each call to `poll` returns the chunks that were completed since the previous
+    call. We never re-read a chunk. Instead, we remember the position right after
+    the last complete chunk and resume from there.
+    """
+
+    def __init__(
+        self,
+        file: Path,
+        *,
+        signature: bytes,
+        verify_crc: CrcPolicy | None = None,
+    ) -> None:
+        # Default arguments
+        if verify_crc is None:
+            verify_crc = "strict"
+        # We must know that a chunk is valid before we move past it. Therefore,
+        # we verify right away instead of in the background.
+        if verify_crc == "background":
+            verify_crc = "strict"
+        self._file = file
+        self._signature = signature
+        self._crc_verifier = CrcVerifier(verify_crc)
+        # Position right after the last complete chunk (or signature)
+        self.offset = 0
+
+    def poll(
+        self,
+        *,
+        chunk_models: tuple[type[ReadableChunk], ...],
+        limit: int | None = None,
+        **kwargs: Any,
+    ) -> list[ReadableChunk]:
+        """Return the chunks that were completed since the previous call.
+
+        Stops after `limit` chunks (if given). Use this to, e.g., read the header
+        chunk on its own. We pass `kwargs` on to `read_chunk`.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusOSError`
+            * `PilusDeserializeError`
+        """
+        try:
+            io = self._file.open("rb")
+        except OSError as exc:
+            raise PilusOSError(*exc.args) from exc
+        with io:
+            # We only consider the data that is in the file right now. Data that
+            # arrives while we read is for the next call.
+            file_size = _file_size(io)
+            # Signature
+            if self.offset == 0:
+                if file_size < len(self._signature):
+                    return []
+                read_and_validate_signature(io, self._signature)
+                self.offset = len(self._signature)
+            result: list[ReadableChunk] = []
+            while limit is None or len(result) < limit:
+                end_offset = self._complete_chunk_end(io, file_size)
+                if end_offset is None:
+                    break
+                chunk = read_chunk(
+                    io,
+                    chunk_models=chunk_models,
+                    crc_verifier=self._crc_verifier,
+                    **kwargs,
+                )
+                assert chunk is not None
+                self.offset = end_offset
+                # Discard all unidentified ancilliary (non-critical) chunks
+                if isinstance(chunk, UnidentifiedAncilliaryChunk):
+                    continue
+                result.append(chunk)
+        return result
+
+    def _complete_chunk_end(self, io: BinaryIO, file_size: int) -> int | None:
+        """Return the end of the next chunk if it's complete (or `None` otherwise).
+
+        Moves `io` to the start of the chunk.
+        """
+        # Length and type
+        if file_size - self.offset < 4 + 4:
+            return None
+        seek(io, self.offset, SEEK_SET)
+        chunk_length = read_int(io, 4)
+        # Length, type, data, and CRC
+        end_offset = self.offset + 4 + 4 + chunk_length + 4
+        if end_offset > file_size:
+            return None
+        seek(io, self.offset, SEEK_SET)
+        return end_offset
+
+
+def _file_size(io: BinaryIO) -> int:
+    try:
+        return fstat(io.fileno()).st_size
+    except OSError as exc:
+        raise PilusOSError(*exc.args) from exc
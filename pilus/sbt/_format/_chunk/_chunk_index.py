@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from struct import Struct
+from typing import BinaryIO
+
+from ....errors import PilusDeserializeError
+from .._io import read_exactly, write_exactly
+
+# Same layout as the IQS and BDR signatures. See `pilus._magic.signatures`.
+CHUNK_INDEX_SIGNATURE = b"\x89CIX\x0d\x0a\x1a\x0a"
+
+# File size, file modification time (in nanoseconds), and number of entries
+_HEADER = Struct("<QQQ")
+# Offset, data length, type, and CRC
+_ENTRY = Struct("<QI4sI")
+
+
+@dataclass(frozen=True)
+class ChunkIndexEntry:
+    """Location of a single chunk within a file."""
+
+    # Position of the chunk (i.e., of the "length" field) in the file
+    offset: int
+    # Length of the chunk data. Excludes the "length", "type", and "CRC" fields.
+    data_length: int
+    type_: bytes
+    # The CRC as stored in the file. We don't compute (verify) it during the scan.
+    crc: int
+
+    @property
+    def data_offset(self) -> int:
+        """Return the position of the chunk data in the file."""
+        return self.offset + 4 + 4
+
+    @property
+    def end_offset(self) -> int:
+        """Return the position right after this chunk in the file."""
+        return self.data_offset + self.data_length + 4
+
+
+@dataclass(frozen=True)
+class ChunkIndex:
+    """Table of contents of all chunks in a file (in file order)."""
+
+    entries: tuple[ChunkIndexEntry, ...]
+    # Key that identifies the indexed file. We use it to detect stale sidecar files.
+    file_size: int = 0
+    file_mtime_ns: int = 0
+    _offsets: tuple[int, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # We use `object.__setattr__` since this class is frozen
+        offsets = tuple(entry.offset for entry in self.entries)
+        object.__setattr__(self, "_offsets", offsets)
+
+    def of_type(self, type_: bytes) -> tuple[ChunkIndexEntry, ...]:
+        """Return all entries of the given chunk type."""
+        return tuple(entry for entry in self.entries if entry.type_ == type_)
+
+    def nth(self, type_: bytes, n: int) -> ChunkIndexEntry:
+        """Return the n-th entry of the given chunk type.
+
+        Like for sequences, a negative `n` counts from the end.
+
+        Raises `IndexError` if there is no such entry.
+        """
+        return self.of_type(type_)[n]
+
+    def latest_before(
+        self, entry: ChunkIndexEntry, type_: bytes
+    ) -> ChunkIndexEntry | None:
+        """Return the closest entry of the given type that comes before `entry`.
+
+        E.g., the AHDR chunk that applies to a given tRAN chunk in a BDR file.
+        """
+        position = bisect_left(self._offsets, entry.offset)
+        for candidate in reversed(self.entries[:position]):
+            if candidate.type_ == type_:
+                return candidate
+        return None
+
+    @classmethod
+    def from_io(cls, io: BinaryIO) -> ChunkIndex:
+        """Deserialize a chunk index (e.g., from a sidecar file).
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        if read_exactly(io, len(CHUNK_INDEX_SIGNATURE)) != CHUNK_INDEX_SIGNATURE:
+            raise PilusDeserializeError("Invalid chunk index signature")
+        file_size, file_mtime_ns, count = _HEADER.unpack(read_exactly(io, _HEADER.size))
+        data = read_exactly(io, count * _ENTRY.size)
+        entries = tuple(
+            ChunkIndexEntry(offset, data_length, type_, crc)
+            for offset, data_length, type_, crc in _ENTRY.iter_unpack(data)
+        )
+        return cls(entries, file_size=file_size, file_mtime_ns=file_mtime_ns)
+
+    def to_io(self, io: BinaryIO) -> None:
+        """Serialize this chunk index (e.g., to a sidecar file).
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        write_exactly(io, CHUNK_INDEX_SIGNATURE)
+        write_exactly(
+            io, _HEADER.pack(self.file_size, self.file_mtime_ns, len(self.entries))
+        )
+        data = bytearray(len(self.entries) * _ENTRY.size)
+        for i, entry in enumerate(self.entries):
+            _ENTRY.pack_into(
+                data,
+                i * _ENTRY.size,
+                entry.offset,
+                entry.data_length,
+                entry.type_,
+                entry.crc,
+            )
+        write_exactly(io, memoryview(data))
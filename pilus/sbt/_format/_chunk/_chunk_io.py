@@ -1,13 +1,41 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
-from io import SEEK_CUR, BytesIO
-from typing import Any, BinaryIO
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from io import SEEK_CUR, SEEK_SET
+from pathlib import Path
+from typing import Any, BinaryIO, cast
 
 from ....errors import PilusDeserializeError, PilusMissingDataError, PilusSerializeError
-from .._io import read_exactly, read_int, seek, write_exactly, write_int
+from .._io import (
+    BufferIO,
+    ByteCursor,
+    FileStamp,
+    read_and_validate_signature,
+    read_exactly,
+    read_int,
+    read_through_sidecar,
+    read_view,
+    seek,
+    tell,
+    write_atomically,
+    write_exactly,
+    write_int,
+)
+from . import _chunk_data_io
 from ._chunk import ReadableChunk, UnidentifiedAncilliaryChunk, WritableChunk
-from ._crc import crc32
+from ._chunk_data_io import ChunkDataIO
+from ._chunk_data_writer import ChunkDataWriter
+from ._chunk_index import ChunkIndex, ChunkIndexEntry
+from ._chunk_probe import ChunkProbe, start_probe
+from ._crc import chunk_crc
+from ._crc_verifier import CrcPolicy, CrcVerifier, raise_if_crc_mismatch
+
+# Stateless so we can share it between calls
+_STRICT_CRC_VERIFIER = CrcVerifier("strict")
+
+# Byte size of the length, type, and CRC fields of a chunk
+_CHUNK_OVERHEAD = 12
 
 # When we get variadic generics in Python 3.11, we can use `TypeVarTuple` for
 # proper mapping between the type of `chunk_models` and the return type.
@@ -24,13 +52,23 @@ from ._crc import crc32
 
 
 def require_single_chunk(
-    io: BinaryIO, *, chunk_models: tuple[type[ReadableChunk], ...], **kwargs: Any
+    io: BinaryIO,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    verify_crc: CrcPolicy | None = None,
+    **kwargs: Any,
 ) -> ReadableChunk:
     """Return the first chunk of the required type.
 
     May raise `PilusDeserializeError` or one of its derivatives.
     """
-    for chunk in stream_chunks(io, chunk_models=chunk_models, **kwargs):
+    # There is no point in background verification of a single chunk. We would
+    # have to wait for it right away anyhow.
+    if verify_crc == "background":
+        verify_crc = "strict"
+    for chunk in stream_chunks(
+        io, chunk_models=chunk_models, verify_crc=verify_crc, **kwargs
+    ):
         return chunk
     raise PilusDeserializeError(
         f"Could not find a required chunk of type: {chunk_models}"
@@ -38,30 +76,174 @@ def require_single_chunk(
 
 
 def stream_chunks(
-    io: BinaryIO, *, chunk_models: tuple[type[ReadableChunk], ...], **kwargs: Any
+    io: BinaryIO,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    verify_crc: CrcPolicy | None = None,
+    **kwargs: Any,
 ) -> Iterable[ReadableChunk]:
     """Return stream of chunks.
 
     Automatically skips unidentified ancilliary (non-critical) chunks.
 
+    See `CrcPolicy` for the options of `verify_crc`. For the "background" policy,
+    we raise any CRC mismatch at the end of the stream.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if verify_crc is None:
+        verify_crc = "strict"
+    with CrcVerifier(verify_crc) as crc_verifier:
+        while chunk := read_chunk(
+            io, chunk_models=chunk_models, crc_verifier=crc_verifier, **kwargs
+        ):
+            # Discard all unidentified ancilliary (non-critical) chunks
+            if isinstance(chunk, UnidentifiedAncilliaryChunk):
+                continue
+            yield chunk
+
+
+def scan_chunks(io: BinaryIO) -> ChunkIndex:
+    """Return the table of contents of the remaining chunks in the IO stream.
+
+    Unlike `stream_chunks`, we never read, decode, or verify the chunk data. We
+    simply skip past it. This is a lot faster for large files.
+
+    Note that the returned index doesn't know the file size or modification time.
+    Use `load_chunk_index` for that.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    return ChunkIndex(tuple(iter_chunk_entries(io)))
+
+
+def iter_chunk_entries(io: BinaryIO) -> Iterator[ChunkIndexEntry]:
+    """Yield the index entries of the remaining chunks in the IO stream.
+
+    Same as `scan_chunks` but one entry at a time. This way, you can stop early.
+    Moreover, you may move the position of the IO stream in between (e.g., to
+    peek at the chunk data with `peek_chunk_data`). We seek to the next chunk on
+    each iteration.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    offset = tell(io)
+    while True:
+        seek(io, offset, SEEK_SET)
+        chunk_length = _read_chunk_length(io)
+        if chunk_length is None:
+            return
+        chunk_type = read_exactly(io, 4)
+        # Validate the chunk type while we are at it
+        _chunk_type_to_string(chunk_type)
+        # Skip data but read the CRC
+        seek(io, chunk_length, SEEK_CUR)
+        try:
+            crc = read_int(io, 4)
+        except PilusMissingDataError as exc:
+            raise PilusDeserializeError(
+                f'Chunk at offset {offset} is truncated: "{exc}"'
+            ) from exc
+        entry = ChunkIndexEntry(offset, chunk_length, chunk_type, crc)
+        yield entry
+        offset = entry.end_offset
+
+
+def peek_chunk_data(io: BinaryIO, entry: ChunkIndexEntry, size: int) -> memoryview:
+    """Return the first `size` bytes of the data of the given chunk.
+
+    Use this to, e.g., read the timestamp of a data chunk without reading the
+    data itself. We don't verify the CRC (we would need all the data for that).
+
     May raise `PilusDeserializeError` or one of its derivatives.
     """
-    while chunk := read_chunk(io, chunk_models=chunk_models, **kwargs):
-        # Discard all unidentified ancilliary (non-critical) chunks
-        if isinstance(chunk, UnidentifiedAncilliaryChunk):
-            continue
-        yield chunk
+    if size > entry.data_length:
+        raise PilusDeserializeError(
+            f"Chunk at offset {entry.offset} has less than {size} bytes of data"
+        )
+    seek(io, entry.data_offset, SEEK_SET)
+    return read_view(io, size)
+
+
+def load_chunk_index(
+    file: Path,
+    *,
+    signature: bytes,
+    sidecar: Path | None = None,
+) -> ChunkIndex:
+    """Return the chunk index of the given file.
+
+    Uses the sidecar file if it exists and matches the file's size and modification
+    time. Otherwise, we scan the file (see `scan_chunks`) and (re)write the sidecar
+    file.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if sidecar is None:
+        sidecar = file.with_name(f"{file.name}.chunk-index")
+
+    def load() -> tuple[ChunkIndex, FileStamp]:
+        with sidecar.open("rb") as io:
+            index = ChunkIndex.from_io(io)
+        return index, FileStamp(index.file_size, index.file_mtime_ns)
+
+    def compute(stamp: FileStamp) -> ChunkIndex:
+        with file.open("rb") as io:
+            read_and_validate_signature(io, signature)
+            index = scan_chunks(io)
+        return replace(index, file_size=stamp.size, file_mtime_ns=stamp.mtime_ns)
+
+    def store(index: ChunkIndex, _stamp: FileStamp) -> None:
+        write_atomically(sidecar, index.to_io)
+
+    return read_through_sidecar(file, load=load, compute=compute, store=store)
+
+
+def read_chunk_at(
+    io: BinaryIO,
+    entry: ChunkIndexEntry,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    **kwargs: Any,
+) -> ReadableChunk | UnidentifiedAncilliaryChunk:
+    """Read the chunk that the index entry refers to.
+
+    Use this to jump directly to, e.g., the last IDAT chunk in a file.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    seek(io, entry.offset, SEEK_SET)
+    chunk = read_chunk(io, chunk_models=chunk_models, **kwargs)
+    if chunk is None:
+        raise PilusMissingDataError(
+            f"No chunk at offset {entry.offset}", number_of_bytes_read=0
+        )
+    return chunk
 
 
 def read_chunk(
-    io: BinaryIO, *, chunk_models: tuple[type[ReadableChunk], ...], **kwargs: Any
-) -> ReadableChunk | None | UnidentifiedAncilliaryChunk:
+    io: BinaryIO,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    crc_verifier: CrcVerifier | None = None,
+    **kwargs: Any,
+) -> ReadableChunk | UnidentifiedAncilliaryChunk | None:
     """Read single chunk.
 
     This is a low-level function. Prefer `stream_chunks` or similar.
 
+    We verify the CRC strictly unless you provide a `crc_verifier`.
+
+    We report measurements to the hook of `instrument_chunks` (if any).
+
     May raise `PilusDeserializeError` or one of its derivatives.
     """
+    # Default arguments
+    if crc_verifier is None:
+        crc_verifier = _STRICT_CRC_VERIFIER
+    probe = start_probe()
     # Early out if there is no more data in the IO stream
     chunk_length = _read_chunk_length(io)
     if chunk_length is None:
@@ -70,19 +252,43 @@ def read_chunk(
     chunk_type = read_exactly(io, 4)
     # Get chunk model from the chunk type
     chunk_model = _chunk_type_to_model(chunk_type, chunk_models=chunk_models)
-    # Early out if this is an unidentified ancilliary chunk
+    chunk: ReadableChunk | UnidentifiedAncilliaryChunk
     if isinstance(chunk_model, UnidentifiedAncilliaryChunk):
-        seek(io, chunk_length + 4, SEEK_CUR)  # Skip data and CRC
-        return chunk_model
-    # Read chunk data.
-    # TODO: Do not read all data into memory at once. Split it into smaller parts.
-    chunk_data = read_exactly(io, chunk_length)
-    chunk = _deserialize_chunk_data(chunk_model, chunk_data, **kwargs)
-    # CRC check
-    actual_crc = _chunk_crc(chunk_type, chunk_data)
-    expected_crc = read_int(io, 4)
-    if actual_crc != expected_crc:
-        raise PilusDeserializeError("CRC mismatch")
+        # Skip data and CRC of unidentified ancilliary chunks
+        seek(io, chunk_length + 4, SEEK_CUR)
+        chunk = chunk_model
+    elif (
+        isinstance(io, BufferIO)
+        or crc_verifier.policy == "background"
+        or chunk_length <= _chunk_data_io.BLOCK_SIZE
+    ):
+        # The data is already in memory (e.g., memory-mapped), we need to keep
+        # it in memory for the background CRC verification, or it's small enough
+        # that a temporary buffer doesn't matter. In any case, we deserialize
+        # from a view of the data.
+        chunk = _read_chunk_data(
+            io,
+            chunk_type,
+            chunk_model,
+            chunk_length,
+            crc_verifier=crc_verifier,
+            probe=probe,
+            **kwargs,
+        )
+    else:
+        # Otherwise, we stream the data to avoid a (potentially huge) temporary
+        # buffer.
+        chunk = _stream_chunk_data(
+            io,
+            chunk_type,
+            chunk_model,
+            chunk_length,
+            compute_crc=crc_verifier.policy != "skip",
+            probe=probe,
+            **kwargs,
+        )
+    if probe is not None:
+        probe.finish("read", chunk_type, _CHUNK_OVERHEAD + chunk_length)
     return chunk
 
 
@@ -133,7 +339,7 @@ def _read_chunk_length(io: BinaryIO) -> int | None:
 
 def _deserialize_chunk_data(
     chunk_model: type[ReadableChunk],
-    chunk_data: bytes,
+    chunk_data: memoryview,
     **kwargs: Any,
 ) -> ReadableChunk:
     """Read and parse chunk data of the given type and length.
@@ -142,68 +348,111 @@ def _deserialize_chunk_data(
     """
     if "data_length" not in kwargs:
         kwargs["data_length"] = len(chunk_data)
-    # It may seem a bit strange that we convert `chunk_data` back into an IO
-    # stream here. The reasoning is three-fold:
-    #   1. We already read all the data into memory to compute the CRC. It doesn't
-    #      make sense to read it again just to satisfy the `from_io` interface.
-    #   2. The various deserializers only requires a single pass over the data. In
-    #      other words, the deserializers only require a `BinaryIO` stream and not
-    #      the full `bytes` interface.
-    #   3. The deserializers require the notion of "position within the data" that
-    #      you get from `BinaryIO` but not from `bytes`. if we only got `bytes`,
-    #      we would have to keep track of this "position" anyway.
-    chunk_data_io = BytesIO(chunk_data)
-    # Parse chunk data
-    return chunk_model.from_io(chunk_data_io, **kwargs)
+    # We already got all the data in memory (e.g., to compute the CRC). The
+    # cursor decodes each field directly from `chunk_data`. There is no
+    # intermediate IO stream and no per-field `bytes` object. Moreover, the
+    # deserializers get zero-copy views into `chunk_data`. E.g., for the raw
+    # channel data of IDAT chunks.
+    return chunk_model.from_cursor(ByteCursor(chunk_data), **kwargs)
+
+
+def _read_chunk_data(  # noqa: PLR0913
+    io: BinaryIO,
+    chunk_type: bytes,
+    chunk_model: type[ReadableChunk],
+    chunk_length: int,
+    *,
+    crc_verifier: CrcVerifier,
+    probe: ChunkProbe | None = None,
+    **kwargs: Any,
+) -> ReadableChunk:
+    """Read chunk data and CRC into memory and parse it from there.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    chunk_data = read_view(io, chunk_length)
+    if probe is not None:
+        probe.lap("io")
+    chunk = _deserialize_chunk_data(chunk_model, chunk_data, **kwargs)
+    if probe is not None:
+        probe.lap("model")
+    expected_crc = read_int(io, 4)
+    if probe is not None:
+        probe.lap("io")
+    crc_verifier.verify(chunk_type, chunk_data, expected_crc)
+    if probe is not None:
+        probe.lap("crc")
+    return chunk
+
+
+def _stream_chunk_data(  # noqa: PLR0913
+    io: BinaryIO,
+    chunk_type: bytes,
+    chunk_model: type[ReadableChunk],
+    chunk_length: int,
+    *,
+    compute_crc: bool,
+    probe: ChunkProbe | None = None,
+    **kwargs: Any,
+) -> ReadableChunk:
+    """Parse chunk data directly from the IO stream and then read the CRC.
+
+    We verify the CRC if `compute_crc` is true.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    if "data_length" not in kwargs:
+        kwargs["data_length"] = chunk_length
+    if probe is not None:
+        probe.lap("io")
+    # We compute the CRC incrementally as the deserializer consumes the data
+    initial_crc = chunk_crc(chunk_type, b"") if compute_crc else None
+    chunk_data_io = ChunkDataIO(io, chunk_length, crc=initial_crc, probe=probe)
+    chunk = chunk_model.from_io(cast(BinaryIO, chunk_data_io), **kwargs)
+    # The deserializer may leave some data unread. We consume it anyway. Both to
+    # compute the CRC (if any) and to move `io` to the start of the CRC field.
+    chunk_data_io.skip_remaining()
+    expected_crc = read_int(io, 4)
+    if chunk_data_io.crc is not None:
+        raise_if_crc_mismatch(chunk_type, chunk_data_io.crc, expected_crc)
+    return chunk
 
 
 def write_chunk(io: BinaryIO, chunk: WritableChunk) -> None:
     """Serialize chunk into the IO stream.
 
+    We stream the chunk data directly into `io` and compute the CRC along the
+    way. There is no intermediate buffer for the chunk data.
+
+    We report measurements to the hook of `instrument_chunks` (if any).
+
     May raise `PilusSerializeError` or one of its derivatives.
     """
-    # Serialize the chunk data itself
-    chunk_data_io = BytesIO()
-    # We know the data length up front so we can reserve (pre-allocate)
-    # memory for it.
+    probe = start_probe()
+    # We know the data length up front so we can write the chunk length and type
+    # before the data itself.
     chunk_data_length = chunk.data_length()
-    _reserve(chunk_data_io, chunk_data_length)  # [1]
-    chunk.to_io(chunk_data_io)
-    # Our `chunk.data_length` function is exact. We neither reserve too much
-    # or too little data at [1].
-    assert chunk_data_length == len(chunk_data_io.getbuffer())
-    # Write chunk length and type
-    write_int(io, len(chunk_data_io.getbuffer()), 4)
+    if probe is not None:
+        probe.lap("model")
+    write_int(io, chunk_data_length, 4)
     write_exactly(io, chunk.type_)
+    if probe is not None:
+        probe.lap("io")
     # Then the data itself
-    write_exactly(io, chunk_data_io.getbuffer())
+    chunk_data_writer = ChunkDataWriter(
+        io, crc=chunk_crc(chunk.type_, b""), probe=probe
+    )
+    chunk.to_io(cast(BinaryIO, chunk_data_writer))
+    if probe is not None:
+        probe.lap("model")
+    # Our `chunk.data_length` function must be exact. Otherwise, the chunk
+    # length that we wrote above is wrong.
+    if chunk_data_writer.number_of_bytes_written != chunk_data_length:
+        raise PilusSerializeError(
+            f"Expected {chunk_data_length} bytes of chunk data but got "
+            f"{chunk_data_writer.number_of_bytes_written} bytes"
+        )
     # Finally, write the CRC checksum of the data and type
-    crc = _chunk_crc(chunk.type_, chunk_data_io.getbuffer())
-    write_int(io, crc, 4)
-
-
-def _reserve(io: BinaryIO, size: int) -> None:
-    """Pre-allocate data in the IO stream."""
-    if size < 0:
-        raise PilusSerializeError("Can't reserve a negative number of bytes")
-    if size == 0:
-        return
-    # Theory of operation:
-    #
-    #   1. Seek ahead
-    #   2. Write a single byte
-    #   3. Seek back to where we start
-    #
-    # If we only do (1) and (3) alone, we only move a position but we won't
-    # cause any data allocation. Because we also do (2), we force the
-    # stream to allocate the data.
-    if size != 1:
-        seek(io, size - 1, SEEK_CUR)
-    write_exactly(io, bytes(1))
-    seek(io, -size, SEEK_CUR)
-
-
-def _chunk_crc(chunk_type: bytes, chunk_data: bytes | memoryview) -> int:
-    crc = 0xFFFFFFFF
-    crc = crc32(chunk_type, crc)
-    return crc32(chunk_data, crc)
+    write_int(io, chunk_data_writer.crc, 4)
+    if probe is not None:
+        probe.finish("write", chunk.type_, _CHUNK_OVERHEAD + chunk_data_length)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from ....errors import PilusDeserializeError, PilusMissingDataError
+from .._io import AsyncByteSource, read_exactly_async, read_int_async
+from ._chunk import ReadableChunk, UnidentifiedAncilliaryChunk
+from ._chunk_io import (
+    _STRICT_CRC_VERIFIER,
+    _chunk_type_to_model,
+    _deserialize_chunk_data,
+)
+from ._crc_verifier import CrcPolicy, CrcVerifier
+
+
+async def require_single_chunk_async(
+    source: AsyncByteSource,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    verify_crc: CrcPolicy | None = None,
+    **kwargs: Any,
+) -> ReadableChunk:
+    """Return the first chunk of the required type.
+
+    This is the asynchronous version of `require_single_chunk`.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # There is no point in background verification of a single chunk. We would
+    # have to wait for it right away anyhow.
+    if verify_crc == "background":
+        verify_crc = "strict"
+    chunk_stream = stream_chunks_async(
+        source, chunk_models=chunk_models, verify_crc=verify_crc, **kwargs
+    )
+    try:
+        async for chunk in chunk_stream:
+            return chunk
+    finally:
+        # Unlike its synchronous counterpart, we must close the asynchronous
+        # generator explicitly.
+        await chunk_stream.aclose()
+    raise PilusDeserializeError(
+        f"Could not find a required chunk of type: {chunk_models}"
+    )
+
+
+async def stream_chunks_async(
+    source: AsyncByteSource,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    verify_crc: CrcPolicy | None = None,
+    **kwargs: Any,
+) -> AsyncGenerator[ReadableChunk, None]:
+    """Return asynchronous stream of chunks.
+
+    This is the asynchronous version of `stream_chunks`. We yield each chunk as
+    soon as we received all of it.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if verify_crc is None:
+        verify_crc = "strict"
+    with CrcVerifier(verify_crc) as crc_verifier:
+        while chunk := await read_chunk_async(
+            source, chunk_models=chunk_models, crc_verifier=crc_verifier, **kwargs
+        ):
+            # Discard all unidentified ancilliary (non-critical) chunks
+            if isinstance(chunk, UnidentifiedAncilliaryChunk):
+                continue
+            yield chunk
+
+
+async def read_chunk_async(
+    source: AsyncByteSource,
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    crc_verifier: CrcVerifier | None = None,
+    **kwargs: Any,
+) -> ReadableChunk | UnidentifiedAncilliaryChunk | None:
+    """Read single chunk.
+
+    This is the asynchronous version of `read_chunk`. Prefer
+    `stream_chunks_async` or similar.
+
+    We verify the CRC strictly unless you provide a `crc_verifier`.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if crc_verifier is None:
+        crc_verifier = _STRICT_CRC_VERIFIER
+    # Early out if there is no more data in the source
+    chunk_length = await _read_chunk_length_async(source)
+    if chunk_length is None:
+        return None
+    # Read chunk type
+    chunk_type = await read_exactly_async(source, 4)
+    # Get chunk model from the chunk type
+    chunk_model = _chunk_type_to_model(chunk_type, chunk_models=chunk_models)
+    # Read chunk data and CRC. Unlike a `BinaryIO` stream, we can't seek
+    # past the data. Hence, we read the data even if we discard it afterwards.
+    chunk_data = memoryview(await read_exactly_async(source, chunk_length))
+    expected_crc = await read_int_async(source, 4)
+    # Early out if this is an unidentified ancilliary chunk
+    if isinstance(chunk_model, UnidentifiedAncilliaryChunk):
+        return chunk_model
+    chunk = _deserialize_chunk_data(chunk_model, chunk_data, **kwargs)
+    crc_verifier.verify(chunk_type, chunk_data, expected_crc)
+    return chunk
+
+
+async def _read_chunk_length_async(source: AsyncByteSource) -> int | None:
+    """Read chunk length.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    try:
+        return await read_int_async(source, 4)
+    except PilusMissingDataError as exc:
+        # There is no more data so return `None`
+        if exc.number_of_bytes_read == 0:
+            return None
+        # There is some data but not enough to become a chunk length
+        raise PilusDeserializeError(f'Could not read chunk length: "{exc}"') from exc
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from multiprocessing import get_all_start_methods, get_context
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+from ....errors import PilusOSError
+from .._io import map_io
+from ._chunk import ReadableChunk, UnidentifiedAncilliaryChunk
+from ._chunk_index import ChunkIndexEntry
+from ._chunk_io import read_chunk_at
+from ._crc_verifier import CrcPolicy, CrcVerifier
+
+# We split the chunks into this many ranges per worker. More ranges than workers
+# evens out the load (e.g., if some chunks are larger than others).
+RANGES_PER_WORKER = 4
+
+
+def file_behind(io: BinaryIO) -> Path:
+    """Return the path of the file behind the IO stream.
+
+    We use this to let other processes open the same file.
+
+    May raise `ValueError` if there is no file behind the IO stream.
+    """
+    name = getattr(io, "name", None)
+    if isinstance(name, str):
+        return Path(name)
+    raise ValueError("Parallel decoding requires an IO stream backed by a file")
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return process pool with the given number of workers.
+
+    We don't fork the workers directly from the parent process. The parent may
+    run other threads (e.g., for background CRC verification) and forking such a
+    process may deadlock the child. Instead, we use "forkserver" (or "spawn" on
+    platforms without it).
+
+    Either way, the workers import the `__main__` module of the parent process.
+    Therefore, a script that uses the pool must guard its entry point with
+    `if __name__ == "__main__":`. Otherwise, the workers die on startup and
+    we raise `BrokenProcessPool`.
+    """
+    start_method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=get_context(start_method)
+    )
+
+
+def borrow_or_create_pool(
+    executor: Executor | None, workers: int
+) -> AbstractContextManager[Executor]:
+    """Return context that provides the given executor or a new process pool.
+
+    The caller owns the given executor (e.g., to reuse it across files). We never
+    shut it down. Otherwise, we create a pool of `workers` processes (see
+    `process_pool`) and shut it down on exit.
+    """
+    if executor is not None:
+        return nullcontext(executor)
+    return process_pool(workers)
+
+
+def split_into_ranges[T](items: Sequence[T], count: int) -> list[Sequence[T]]:
+    """Split the items into (at most) `count` contiguous ranges of similar size."""
+    count = max(1, min(count, len(items)))
+    size, remainder = divmod(len(items), count)
+    result: list[Sequence[T]] = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < remainder else 0)
+        result.append(items[start:end])
+        start = end
+    return result
+
+
+def read_chunks_from_file(
+    file: Path,
+    entries: Sequence[ChunkIndexEntry],
+    *,
+    chunk_models: tuple[type[ReadableChunk], ...],
+    verify_crc: CrcPolicy | None = None,
+    **kwargs: Any,
+) -> list[ReadableChunk]:
+    """Read the chunks that the index entries refer to.
+
+    We memory-map the file. Use this in, e.g., a worker process.
+
+    Note that the returned chunks may refer directly to the memory-mapped file.
+    Copy the data (e.g., into `bytes`) before you send it to another process.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+    """
+    # Default arguments
+    if verify_crc is None:
+        verify_crc = "strict"
+    # There are no subsequent chunks to overlap the verification with
+    if verify_crc == "background":
+        verify_crc = "strict"
+    crc_verifier = CrcVerifier(verify_crc)
+    try:
+        file_io = file.open("rb")
+    except OSError as exc:
+        raise PilusOSError(*exc.args) from exc
+    with file_io:
+        io = cast(BinaryIO, map_io(file_io))
+        chunks = (
+            read_chunk_at(
+                io,
+                entry,
+                chunk_models=chunk_models,
+                crc_verifier=crc_verifier,
+                **kwargs,
+            )
+            for entry in entries
+        )
+        return [
+            chunk
+            for chunk in chunks
+            if not isinstance(chunk, UnidentifiedAncilliaryChunk)
+        ]
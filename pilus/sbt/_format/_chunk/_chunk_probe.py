@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Literal
+
+# What we did with the chunk
+ChunkOperation = Literal["read", "write"]
+# Where we spent the time:
+#
+#  * "io": Reading from (or writing to) the underlying IO stream.
+#  * "crc": Computing the CRC. For the "background" CRC policy, this is only the
+#    time it takes to hand the data over to the thread pool.
+#  * "model": Deserializing (or serializing) the chunk model itself.
+ChunkPhase = Literal["io", "crc", "model"]
+
+
+@dataclass(frozen=True)
+class ChunkEvent:
+    """Measurements for a single chunk."""
+
+    operation: ChunkOperation
+    chunk_type: bytes
+    # Byte size of the entire chunk (length, type, data, and CRC)
+    number_of_bytes: int
+    io_ns: int
+    crc_ns: int
+    model_ns: int
+
+
+ChunkHook = Callable[[ChunkEvent], None]
+
+
+@dataclass
+class ChunkTypeStats:
+    """Accumulated measurements for a single chunk type."""
+
+    count: int = 0
+    number_of_bytes: int = 0
+    io_ns: int = 0
+    crc_ns: int = 0
+    model_ns: int = 0
+
+
+@dataclass
+class ChunkStats:
+    """Accumulated measurements per chunk type.
+
+    Use `instrument_chunks` to get one of these.
+    """
+
+    reads: dict[bytes, ChunkTypeStats] = field(default_factory=dict)
+    writes: dict[bytes, ChunkTypeStats] = field(default_factory=dict)
+
+    def record(self, event: ChunkEvent) -> None:
+        """Add the event to the accumulated measurements."""
+        per_type = self.reads if event.operation == "read" else self.writes
+        stats = per_type.setdefault(event.chunk_type, ChunkTypeStats())
+        stats.count += 1
+        stats.number_of_bytes += event.number_of_bytes
+        stats.io_ns += event.io_ns
+        stats.crc_ns += event.crc_ns
+        stats.model_ns += event.model_ns
+
+
+# The hook of the innermost `instrument_chunks` context (if any). We use a
+# context variable so that concurrent tasks (threads or asyncio) don't see each
+# other's hooks.
+_HOOK: ContextVar[ChunkHook | None] = ContextVar("pilus_chunk_hook", default=None)
+
+
+@contextmanager
+def instrument_chunks(hook: ChunkHook | None = None) -> Iterator[ChunkStats]:
+    """Measure all chunk reads and writes within this context.
+
+    Yields the accumulated measurements. In addition, we call `hook` (if given)
+    with the measurements of each chunk as soon as we are done with it.
+
+    Outside this context, the chunk layer doesn't measure anything. The only
+    cost is a single context variable lookup per chunk.
+
+    Note that worker processes (e.g., `from_io(..., workers=N)`) don't report
+    their measurements back to the parent process.
+    """
+    stats = ChunkStats()
+
+    def record(event: ChunkEvent) -> None:
+        stats.record(event)
+        if hook is not None:
+            hook(event)
+
+    token = _HOOK.set(record)
+    try:
+        yield stats
+    finally:
+        _HOOK.reset(token)
+
+
+class ChunkProbe:
+    """Stopwatch for the phases of a single chunk.
+
+    Call `lap` at the end of each phase. We attribute the time since the previous
+    lap to that phase.
+    """
+
+    def __init__(self, hook: ChunkHook) -> None:
+        self._hook = hook
+        self._previous = perf_counter_ns()
+        self._elapsed_ns: dict[ChunkPhase, int] = {"io": 0, "crc": 0, "model": 0}
+
+    def lap(self, phase: ChunkPhase) -> None:
+        """Attribute the time since the previous lap to the given phase."""
+        now = perf_counter_ns()
+        self._elapsed_ns[phase] += now - self._previous
+        self._previous = now
+
+    def finish(
+        self, operation: ChunkOperation, chunk_type: bytes, number_of_bytes: int
+    ) -> None:
+        """Report the measurements to the hook.
+
+        We attribute the time since the previous lap to I/O. In practice, this is
+        the time it took to read (or write) the CRC field at the very end.
+        """
+        self.lap("io")
+        self._hook(
+            ChunkEvent(
+                operation,
+                chunk_type,
+                number_of_bytes,
+                io_ns=self._elapsed_ns["io"],
+                crc_ns=self._elapsed_ns["crc"],
+                model_ns=self._elapsed_ns["model"],
+            )
+        )
+
+
+def start_probe() -> ChunkProbe | None:
+    """Return a new probe if we are within `instrument_chunks`.
+
+    Returns `None` otherwise.
+    """
+    hook = _HOOK.get()
+    if hook is None:
+        return None
+    return ChunkProbe(hook)
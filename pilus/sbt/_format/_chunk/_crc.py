@@ -14,3 +14,10 @@ except ImportError:
     from binascii import crc32 as _crc32
 
 crc32 = _crc32
+
+
+def chunk_crc(chunk_type: bytes, chunk_data: bytes | memoryview) -> int:
+    """Return the CRC of the given chunk type and data."""
+    crc = 0xFFFFFFFF
+    crc = crc32(chunk_type, crc)
+    return crc32(chunk_data, crc)
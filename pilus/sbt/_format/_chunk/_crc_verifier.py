@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Literal, Self
+
+from ....errors import PilusDeserializeError
+from ._crc import chunk_crc
+
+# How to verify the CRC of each chunk:
+#
+#  * "strict": Compute and compare the CRC right away (on the calling thread).
+#  * "skip": Don't compute the CRC at all. Use this for trusted re-reads of files
+#    that you already verified.
+#  * "background": Compute the CRC on a thread pool while we continue to
+#    deserialize the subsequent chunks. We raise any mismatch at the very end.
+#    Note that we must keep the chunk data in memory until we verified it.
+CrcPolicy = Literal["strict", "skip", "background"]
+
+
+class CrcVerifier:
+    """Verify chunk CRCs according to the given policy.
+
+    Use this as a context manager. On exit, we wait for all pending (background)
+    verifications and raise the first mismatch (if any).
+    """
+
+    def __init__(self, policy: CrcPolicy = "strict") -> None:
+        if policy not in ("strict", "skip", "background"):
+            raise ValueError(f"Unknown CRC policy '{policy}'")
+        self.policy: CrcPolicy = policy
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[Future[None]] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        # Don't bother with the pending verifications if we are already on our
+        # way out due to an exception. E.g., a `GeneratorExit` because the
+        # caller stopped the iteration early.
+        if exc_type is not None:
+            self._shutdown()
+            return
+        self.finish()
+
+    def verify(
+        self, chunk_type: bytes, chunk_data: memoryview, expected_crc: int
+    ) -> None:
+        """Verify the chunk data against the expected CRC.
+
+        We hold on to `chunk_data` until we verified it. Do not modify it.
+
+        May raise `PilusDeserializeError` (for the "strict" policy).
+        """
+        match self.policy:
+            case "strict":
+                _raise_if_mismatch(chunk_type, chunk_data, expected_crc)
+            case "skip":
+                pass
+            case "background":
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix="pilus-crc")
+                # Note that `zlib.crc32` releases the GIL for large inputs. This is
+                # what allows us to actually run the computation in parallel.
+                future = self._executor.submit(
+                    _raise_if_mismatch, chunk_type, chunk_data, expected_crc
+                )
+                self._pending.append(future)
+
+    def finish(self) -> None:
+        """Wait for all pending verifications.
+
+        May raise `PilusDeserializeError` if there was a mismatch.
+        """
+        try:
+            for future in self._pending:
+                future.result()
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._pending.clear()
+
+
+def raise_if_crc_mismatch(
+    chunk_type: bytes, actual_crc: int, expected_crc: int
+) -> None:
+    """Raise `PilusDeserializeError` if the two CRCs differ."""
+    if actual_crc != expected_crc:
+        raise PilusDeserializeError(
+            f'CRC mismatch in "{chunk_type.decode("ascii", "replace")}" chunk'
+        )
+
+
+def _raise_if_mismatch(
+    chunk_type: bytes, chunk_data: memoryview, expected_crc: int
+) -> None:
+    actual_crc = chunk_crc(chunk_type, chunk_data)
+    raise_if_crc_mismatch(chunk_type, actual_crc, expected_crc)
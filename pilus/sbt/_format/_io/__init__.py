@@ -1,12 +1,32 @@
+from ._async_io import AsyncByteSource as AsyncByteSource
+from ._async_io import (
+    read_and_validate_signature_async as read_and_validate_signature_async,
+)
+from ._async_io import read_exactly_async as read_exactly_async
+from ._async_io import read_int_async as read_int_async
+from ._buffer_io import BufferIO as BufferIO
+from ._buffer_io import map_io as map_io
+from ._byte_cursor import ByteCursor as ByteCursor
+from ._io_utilities import copy_exactly as copy_exactly
 from ._io_utilities import read_double as read_double
 from ._io_utilities import read_exactly as read_exactly
+from ._io_utilities import read_exactly_into as read_exactly_into
 from ._io_utilities import read_int as read_int
 from ._io_utilities import read_string as read_string
 from ._io_utilities import read_terminated_string as read_terminated_string
+from ._io_utilities import read_view as read_view
 from ._io_utilities import seek as seek
 from ._io_utilities import tell as tell
+from ._io_utilities import write_buffers as write_buffers
 from ._io_utilities import write_exactly as write_exactly
 from ._io_utilities import write_int as write_int
 from ._io_utilities import write_terminated_string as write_terminated_string
+from ._sidecar import FileStamp as FileStamp
+from ._sidecar import read_through_sidecar as read_through_sidecar
+from ._sidecar import write_atomically as write_atomically
 from ._signature import read_and_validate_signature as read_and_validate_signature
 from ._signature import write_signature as write_signature
+from ._struct_layout import LayoutField as LayoutField
+from ._struct_layout import StructLayout as StructLayout
+from ._struct_layout import long_int_field as long_int_field
+from ._struct_layout import terminated_string_field as terminated_string_field
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from asyncio import IncompleteReadError
+from typing import Protocol
+
+from ....errors import PilusDeserializeError, PilusMissingDataError, PilusOSError
+from ._io_utilities import IQS_BYTE_ORDER
+
+
+class AsyncByteSource(Protocol):
+    """Asynchronous source of binary data.
+
+    E.g., an `asyncio.StreamReader` for a socket or pipe.
+    """
+
+    async def readexactly(self, n: int) -> bytes:
+        """Read exactly `n` bytes.
+
+        Raise `asyncio.IncompleteReadError` if the source ends before that.
+        """
+        ...
+
+
+async def read_exactly_async(source: AsyncByteSource, size: int) -> bytes:
+    """Read `size` bytes from the asynchronous source.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+          * `PilusMissingDataError` (if we didn't read exactly `size` bytes)
+    """
+    try:
+        return await source.readexactly(size)
+    except IncompleteReadError as exc:
+        number_of_bytes_read = len(exc.partial)
+        raise PilusMissingDataError(
+            f"Expected {size} bytes but could only read {number_of_bytes_read} bytes",
+            number_of_bytes_read=number_of_bytes_read,
+        ) from exc
+    except OSError as exc:
+        raise PilusOSError(*exc.args) from exc
+
+
+async def read_int_async(
+    source: AsyncByteSource, size: int, *, signed: bool = False
+) -> int:
+    """Read integer of the given byte size from the asynchronous source.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+          * `PilusMissingDataError`
+    """
+    data = await read_exactly_async(source, size)
+    return int.from_bytes(data, byteorder=IQS_BYTE_ORDER, signed=signed)
+
+
+async def read_and_validate_signature_async(
+    source: AsyncByteSource, reference_signature: bytes
+) -> None:
+    """Read and validate the given signature from the asynchronous source.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    try:
+        signature = await read_exactly_async(source, len(reference_signature))
+    except PilusDeserializeError as exc:
+        # Wrap the `PilusDeserializeError` with some additional context
+        raise PilusDeserializeError(f'Could not read signature: "{exc}"') from exc
+    if signature != reference_signature:
+        raise PilusDeserializeError("Invalid signature")
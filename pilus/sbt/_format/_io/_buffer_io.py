@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Buffer
+from io import (
+    SEEK_CUR,
+    SEEK_END,
+    SEEK_SET,
+    BufferedIOBase,
+    BytesIO,
+    UnsupportedOperation,
+)
+from mmap import ACCESS_READ, mmap
+from typing import BinaryIO
+
+from ....errors import PilusOSError
+
+
+class BufferIO(BufferedIOBase):
+    """Read-only, seekable IO stream on top of an in-memory buffer.
+
+    Unlike `BytesIO`, we never copy the underlying buffer. Use `read_view` to get
+    zero-copy slices of said buffer.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        return self.read_view(size).tobytes()
+
+    def read1(self, size: int = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer: Buffer) -> int:
+        destination = memoryview(buffer).cast("B")
+        data = self.read_view(len(destination))
+        destination[: len(data)] = data
+        return len(data)
+
+    def read_view(self, size: int | None = -1) -> memoryview:
+        """Return (up to) the next `size` bytes as a zero-copy view."""
+        if self.closed:
+            raise ValueError("I/O operation on closed stream")
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else start + size
+        result = self._view[start:end]
+        self._position += len(result)
+        return result
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_SET:
+            position = offset
+        elif whence == SEEK_CUR:
+            position = self._position + offset
+        elif whence == SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+
+def map_io(io: BinaryIO) -> BufferIO:
+    """Memory-map the file behind the IO stream.
+
+    The returned stream starts at the current position of `io`. All reads from the
+    returned stream refer directly to the pages of the file. Use `read_view` to avoid
+    copies altogether.
+
+    We keep the memory map open for as long as there are views into it. Therefore,
+    it's perfectly fine to close `io` (the original stream) afterwards.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError` (e.g., if there is no file behind the IO stream)
+    """
+    buffer: Buffer
+    try:
+        position = io.tell()
+        # Special case for in-memory streams: They already got a buffer that we can
+        # use directly. Note that we use `getvalue` and not `getbuffer`. The
+        # former doesn't copy the data (as long as `io` shares its initial bytes)
+        # and doesn't lock `io` while there are views into it.
+        if isinstance(io, BytesIO):
+            buffer = io.getvalue()
+        else:
+            buffer = mmap(io.fileno(), 0, access=ACCESS_READ)
+    # Note that `UnsupportedOperation` derives from both `OSError` and `ValueError`.
+    # Hence why we check for it first.
+    except UnsupportedOperation as exc:
+        raise PilusOSError(f'Could not memory-map IO stream: "{exc}"') from exc
+    except ValueError:
+        # You can't memory-map an empty file. We simply use an empty buffer instead.
+        buffer = b""
+    except OSError as exc:
+        raise PilusOSError(*exc.args) from exc
+    result = BufferIO(buffer)
+    result.seek(position)
+    return result
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections.abc import Buffer
+from struct import Struct
+from typing import Any
+
+from ....errors import (
+    PilusDeserializeError,
+    PilusMissingDataError,
+    PilusUnicodeDecodeError,
+)
+from ._io_utilities import IQS_BYTE_ORDER
+from ._struct_layout import StructLayout
+
+# Integer sizes that `struct` supports natively. We fall back to `int.from_bytes`
+# for the rest (e.g., the 64-byte integers in the IHDR chunk). Same byte order as
+# `IQS_BYTE_ORDER`.
+_INT_STRUCTS = {
+    (1, False): Struct("<B"),
+    (1, True): Struct("<b"),
+    (2, False): Struct("<H"),
+    (2, True): Struct("<h"),
+    (4, False): Struct("<I"),
+    (4, True): Struct("<i"),
+    (8, False): Struct("<Q"),
+    (8, True): Struct("<q"),
+}
+_DOUBLE_STRUCT = Struct("<d")
+
+
+class ByteCursor:
+    """Position within an in-memory buffer.
+
+    Use this to deserialize data that is already in memory (e.g., memory-mapped).
+    Unlike `BinaryIO`, all reads decode directly from the buffer. There is no
+    intermediate `bytes` object for each field.
+
+    Mirrors the `read_*` functions in `_io_utilities`.
+    """
+
+    def __init__(self, buffer: Buffer, offset: int = 0) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self.offset = offset
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of bytes after the current offset."""
+        return len(self._view) - self.offset
+
+    def read_int(self, size: int, *, signed: bool = False) -> int:
+        """Read integer of the given byte size.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+        """
+        struct = _INT_STRUCTS.get((size, signed))
+        if struct is None:
+            data = self.read_view(size)
+            return int.from_bytes(data, byteorder=IQS_BYTE_ORDER, signed=signed)
+        (value,) = self._unpack(struct)
+        assert isinstance(value, int)
+        return value
+
+    def read_double(self) -> float:
+        """Read 8-byte floating-point number.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+        """
+        (value,) = self._unpack(_DOUBLE_STRUCT)
+        assert isinstance(value, float)
+        return value
+
+    def read_terminated_string(self, max_size: int, *, terminator: str = "\x00") -> str:
+        """Read a terminated string.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+              * `PilusUnicodeDecodeError`
+        """
+        data = self.read_view(max_size)
+        try:
+            full_str = str(data, "utf-8")
+        except UnicodeDecodeError as exc:
+            raise PilusUnicodeDecodeError(*exc.args) from exc
+        try:
+            terminator_pos = full_str.index(terminator)
+        except ValueError as exc:
+            raise PilusDeserializeError(
+                "Could not find terminator in fixed-length string"
+            ) from exc
+        return full_str[:terminator_pos]
+
+    def read_layout(self, layout: StructLayout) -> tuple[Any, ...]:
+        """Read and decode a single record of the given layout.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        self._raise_if_missing(layout.size)
+        values = layout.unpack_from(self._view, self.offset)
+        self.offset += layout.size
+        return values
+
+    def read_view(self, size: int) -> memoryview:
+        """Read `size` bytes as a (zero-copy) memory view.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+        """
+        self._raise_if_missing(size)
+        result = self._view[self.offset : self.offset + size]
+        self.offset += size
+        return result
+
+    def skip(self, size: int) -> None:
+        """Move past `size` bytes without reading them.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+        """
+        self._raise_if_missing(size)
+        self.offset += size
+
+    def read_array(self, format_: str, count: int) -> memoryview[Any]:
+        """Read `count` items of the given format as a (zero-copy) memory view.
+
+        Use the single-character formats of the `struct` module. E.g., "i" for
+        4-byte signed integers. Note that the items are in native byte order.
+
+        May raise:
+          * `PilusBaseError`
+            * `PilusDeserializeError`
+              * `PilusMissingDataError`
+        """
+        itemsize = Struct(format_).size
+        # The `memoryview.cast` stubs only accept literal formats
+        return self.read_view(count * itemsize).cast(format_)  # type: ignore[call-overload,no-any-return]
+
+    def _unpack(self, struct: Struct) -> tuple[Any, ...]:
+        self._raise_if_missing(struct.size)
+        values = struct.unpack_from(self._view, self.offset)
+        self.offset += struct.size
+        return values
+
+    def _raise_if_missing(self, size: int) -> None:
+        remaining = self.remaining
+        if size > remaining:
+            number_of_bytes_read = max(remaining, 0)
+            raise PilusMissingDataError(
+                f"Expected {size} bytes but could only read {number_of_bytes_read} "
+                "bytes",
+                number_of_bytes_read=number_of_bytes_read,
+            )
@@ -1,4 +1,6 @@
-from io import SEEK_CUR
+import os
+from collections.abc import Buffer, Sequence
+from io import FileIO
 from struct import unpack
 from typing import BinaryIO, Literal
 
@@ -10,9 +12,17 @@ from ....errors import (
     PilusUnicodeDecodeError,
     PilusUnicodeEncodeError,
 )
+from ._buffer_io import BufferIO
 
 IQS_BYTE_ORDER: Literal["little"] = "little"
 
+# Maximum number of buffers for a single `os.writev` call. This is the `IOV_MAX`
+# of both Linux and macOS.
+_IOV_MAX = 1024
+
+# Block size for copies that don't go through the kernel. See `copy_exactly`.
+_COPY_BLOCK_SIZE = 1024 * 1024
+
 
 def read_int(io: BinaryIO, size: int, *, signed: bool = False) -> int:
     """Read integer of the given byte size.
@@ -112,6 +122,59 @@ def read_exactly(io: BinaryIO, size: int) -> bytes:
     return data
 
 
+def read_exactly_into(io: BinaryIO, buffer: memoryview) -> None:
+    """Fill the buffer with data from the binary IO stream.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+          * `PilusMissingDataError` (if we couldn't fill the entire buffer)
+    """
+    size = len(buffer)
+    number_of_bytes_read = 0
+    while number_of_bytes_read < size:
+        try:
+            # Not all `BinaryIO` implementations got `readinto`. E.g., the
+            # `typing.BinaryIO` protocol itself doesn't mention it.
+            count = io.readinto(buffer[number_of_bytes_read:])  # type: ignore[attr-defined]
+        except OSError as exc:
+            raise PilusOSError(*exc.args) from exc
+        if not count:
+            raise PilusMissingDataError(
+                f"Expected {size} bytes but could only read {number_of_bytes_read} "
+                "bytes",
+                number_of_bytes_read=number_of_bytes_read,
+            )
+        number_of_bytes_read += count
+
+
+def read_view(io: BinaryIO, size: int) -> memoryview:
+    """Read `size` bytes from the binary IO stream as a memory view.
+
+    This is zero-copy if `io` is a `BufferIO` (e.g., a memory-mapped file).
+    Otherwise, we read the data directly into a new buffer.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+          * `PilusMissingDataError` (if we didn't read exactly `size` bytes)
+    """
+    if not isinstance(io, BufferIO):
+        buffer = bytearray(size)
+        read_exactly_into(io, memoryview(buffer))
+        return memoryview(buffer).toreadonly()
+    data = io.read_view(size)
+    number_of_bytes_read = len(data)
+    if number_of_bytes_read != size:
+        raise PilusMissingDataError(
+            f"Expected {size} bytes but could only read {number_of_bytes_read} bytes",
+            number_of_bytes_read=number_of_bytes_read,
+        )
+    return data
+
+
 def seek(io: BinaryIO, size: int, whence: int) -> None:
     """Skip `size` bytes of data in the IO stream.
 
@@ -175,9 +238,48 @@ def write_terminated_string(
     data = string_data + terminator
     if len(data) > max_size:
         raise PilusSerializeError("Could not fit string into the given size.")
-    write_exactly(io, data)
-    remainder = max_size - len(data)
-    seek(io, remainder, SEEK_CUR)
+    # Pad with zeros. We write the zeros explicitly (instead of seeking past them)
+    # so that this works for non-seekable streams as well.
+    write_exactly(io, data.ljust(max_size, b"\x00"))
+
+
+def write_buffers(io: BinaryIO, buffers: Sequence[Buffer]) -> None:
+    """Write all the buffers to the IO stream.
+
+    We never concatenate the buffers. Instead, we use vectored I/O (`os.writev`)
+    for unbuffered files (if the platform supports it) and `writelines` for
+    everything else.
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusSerializeError` (if we can't write all of the given data)
+    """
+    if isinstance(io, FileIO) and hasattr(os, "writev"):
+        _writev(io, [memoryview(buffer).cast("B") for buffer in buffers])
+        return
+    try:
+        io.writelines(buffers)  # type: ignore[arg-type]
+    except OSError as exc:
+        raise PilusOSError(*exc.args) from exc
+
+
+def _writev(io: FileIO, views: list[memoryview]) -> None:
+    # The OS may write less than we ask for. E.g., due to the `IOV_MAX` limit on
+    # the number of buffers. Therefore, we loop until we wrote everything.
+    views = [view for view in views if view]
+    while views:
+        try:
+            number_of_bytes_written = os.writev(io.fileno(), views[:_IOV_MAX])
+        except OSError as exc:
+            raise PilusOSError(*exc.args) from exc
+        if number_of_bytes_written == 0:
+            raise PilusSerializeError("Could not write any data")
+        # Skip the data that we already wrote
+        while views and number_of_bytes_written >= len(views[0]):
+            number_of_bytes_written -= len(views.pop(0))
+        if views:
+            views[0] = views[0][number_of_bytes_written:]
 
 
 def write_exactly(io: BinaryIO, data: bytes | memoryview) -> None:
@@ -198,3 +300,97 @@ def write_exactly(io: BinaryIO, data: bytes | memoryview) -> None:
             f"Could only write {number_of_bytes_written} bytes "
             f"of the total {size} bytes"
         )
+
+
+def copy_exactly(
+    source: BinaryIO, destination: BinaryIO, *, offset: int, size: int
+) -> None:
+    """Copy `size` bytes (starting at `offset`) of the source to the destination.
+
+    We write at the current position of the destination. If both are files, the
+    kernel copies the data (`os.copy_file_range` or `os.sendfile`). This way, the
+    data never passes through user space. Otherwise, we fall back on plain reads
+    and writes (a block at a time).
+
+    May raise:
+      * `PilusBaseError`
+        * `PilusOSError`
+        * `PilusDeserializeError`
+          * `PilusMissingDataError` (if the source has less than `size` bytes)
+        * `PilusSerializeError`
+    """
+    number_of_bytes_copied = 0
+    file_descriptors = _file_descriptors(source, destination)
+    if file_descriptors is not None:
+        try:
+            destination.flush()
+        except OSError as exc:
+            raise PilusOSError(*exc.args) from exc
+        source_fd, destination_fd = file_descriptors
+        number_of_bytes_copied = _copy_in_kernel(
+            source_fd, destination_fd, offset=offset, size=size
+        )
+        # The kernel moved the file position behind the back of `destination`.
+        # Make sure that buffered streams know about it.
+        if destination.seekable():
+            seek(destination, os.lseek(destination_fd, 0, os.SEEK_CUR), os.SEEK_SET)
+    # Copy the rest (if any) in user space
+    seek(source, offset + number_of_bytes_copied, os.SEEK_SET)
+    while number_of_bytes_copied < size:
+        block_size = min(_COPY_BLOCK_SIZE, size - number_of_bytes_copied)
+        try:
+            data = read_exactly(source, block_size)
+        except PilusMissingDataError as exc:
+            raise PilusMissingDataError(
+                *exc.args,
+                number_of_bytes_read=number_of_bytes_copied + exc.number_of_bytes_read,
+            ) from exc
+        write_exactly(destination, data)
+        number_of_bytes_copied += block_size
+
+
+def _file_descriptors(
+    source: BinaryIO, destination: BinaryIO
+) -> tuple[int, int] | None:
+    """Return the file descriptors behind the IO streams (if any)."""
+    try:
+        return source.fileno(), destination.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def _copy_in_kernel(
+    source_fd: int, destination_fd: int, *, offset: int, size: int
+) -> int:
+    """Return the number of bytes that the kernel copied.
+
+    This may be less than `size` if the platform (or file system) doesn't support
+    kernel copies or if the source ends early.
+    """
+    number_of_bytes_copied = 0
+    for copy_func in (_copy_file_range, os.sendfile):
+        while number_of_bytes_copied < size:
+            try:
+                count = copy_func(
+                    destination_fd,
+                    source_fd,
+                    offset + number_of_bytes_copied,
+                    size - number_of_bytes_copied,
+                )
+            except (AttributeError, OSError):
+                # Not supported by the platform (`AttributeError`) or by the file
+                # system (`OSError`). Try the next function (if any).
+                break
+            # End of source data
+            if count == 0:
+                return number_of_bytes_copied
+            number_of_bytes_copied += count
+    return number_of_bytes_copied
+
+
+def _copy_file_range(
+    destination_fd: int, source_fd: int, offset: int, count: int
+) -> int:
+    # Same argument order as `os.sendfile`. Note that we copy to the current file
+    # position of the destination.
+    return os.copy_file_range(source_fd, destination_fd, count, offset)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import mkstemp
+from typing import BinaryIO
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    """Size and modification time of a file.
+
+    We store it alongside derived data (e.g., in a sidecar file) to detect when
+    said data is stale.
+    """
+
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, file: Path) -> FileStamp:
+        """Return the current stamp of the file.
+
+        May raise `OSError` if we can't stat the file.
+        """
+        stat = file.stat()
+        return cls(stat.st_size, stat.st_mtime_ns)
+
+
+def read_through_sidecar[T](
+    file: Path,
+    *,
+    load: Callable[[], tuple[T, FileStamp]],
+    compute: Callable[[FileStamp], T],
+    store: Callable[[T, FileStamp], None],
+) -> T:
+    """Return the data derived from `file` via its sidecar (cache).
+
+    `load` returns the data and the stamp of the file that it was derived from.
+    If said stamp matches the current stamp of `file`, we return the data as-is.
+    Otherwise (or if `load` fails in any way), we `compute` the data from `file`
+    itself and `store` it for next time.
+
+    The sidecar is merely a cache:
+      * A missing, truncated, corrupt, or otherwise unreadable sidecar is a cache
+        miss. There is no telling what exception a damaged file provokes in the
+        deserializer (e.g., `EOFError` or `zipfile.BadZipFile` from NumPy).
+      * It's not an error if `store` can't write the sidecar (e.g., due to a full
+        or read-only file system). Use `write_atomically` within `store`. This
+        way, a failed write never leaves a damaged sidecar behind.
+
+    May raise:
+      * `OSError` if we can't stat `file`.
+      * Any exception that `compute` raises.
+    """
+    stamp = FileStamp.of(file)
+    # Early out if we got up-to-date data. Any failure is a cache miss (see above).
+    with suppress(Exception):
+        data, data_stamp = load()
+        if data_stamp == stamp:
+            return data
+    data = compute(stamp)
+    with suppress(OSError):
+        store(data, stamp)
+    return data
+
+
+def write_atomically(file: Path, write: Callable[[BinaryIO], None]) -> None:
+    """Write the file via a temporary file in the same directory.
+
+    We replace `file` only once `write` completes. This way, concurrent readers
+    never see a partial file, and a failed write (e.g., due to a full disk) never
+    leaves a damaged file behind.
+
+    May raise `OSError` if we can't write the file.
+    """
+    # Hidden file in the same directory so that the rename is atomic
+    descriptor, name = mkstemp(prefix=f".{file.name}.", dir=file.parent)
+    os.close(descriptor)
+    temporary = Path(name)
+    try:
+        with temporary.open("wb") as io:
+            write(io)
+        temporary.replace(file)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
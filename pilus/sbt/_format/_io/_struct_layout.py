@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Buffer, Callable, Iterator
+from dataclasses import dataclass
+from struct import Struct, error
+from typing import Any, BinaryIO
+
+from ....errors import (
+    PilusDeserializeError,
+    PilusSerializeError,
+    PilusUnicodeDecodeError,
+    PilusUnicodeEncodeError,
+)
+from ._io_utilities import IQS_BYTE_ORDER, read_exactly, write_exactly
+
+# The `struct` equivalent of `IQS_BYTE_ORDER`. Also disables alignment (padding).
+_BYTE_ORDER_PREFIX = {"little": "<", "big": ">"}[IQS_BYTE_ORDER]
+
+
+@dataclass(frozen=True)
+class LayoutField:
+    """Single field of a `StructLayout`."""
+
+    name: str
+    # Format as understood by the `struct` module. E.g., "I" for a 4-byte unsigned
+    # integer or "256s" for a fixed 256-byte string.
+    format: str
+    # Conversion between the raw `struct` value and the actual field value. Only
+    # needed for fields that `struct` doesn't support natively.
+    decode: Callable[[Any], Any] | None = None
+    encode: Callable[[Any], Any] | None = None
+
+
+class StructLayout:
+    """Binary layout of a fixed-size record.
+
+    We compile all fields into a single `Struct` up front. This way, we decode
+    (or encode) an entire record in a single call instead of a call per field.
+    """
+
+    def __init__(self, *fields: LayoutField) -> None:
+        self.fields = fields
+        self.names = tuple(field.name for field in fields)
+        self._struct = Struct(
+            _BYTE_ORDER_PREFIX + "".join(field.format for field in fields)
+        )
+        # We only apply the conversions for the few fields that need it. Most
+        # records (e.g., tRAN) don't have any such fields.
+        self._decoders = tuple(
+            (i, field.decode) for i, field in enumerate(fields) if field.decode
+        )
+        self._encoders = tuple(
+            (i, field.encode) for i, field in enumerate(fields) if field.encode
+        )
+
+    @property
+    def size(self) -> int:
+        """Return the byte size of a single record."""
+        return self._struct.size
+
+    def unpack_from(self, buffer: Buffer, offset: int = 0) -> tuple[Any, ...]:
+        """Decode a single record from the buffer.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        try:
+            values = self._struct.unpack_from(buffer, offset)
+        except error as exc:
+            raise PilusDeserializeError(f'Could not decode record: "{exc}"') from exc
+        return self._decode(values)
+
+    def iter_unpack(self, buffer: Buffer) -> Iterator[tuple[Any, ...]]:
+        """Decode consecutive records from the buffer.
+
+        The byte size of `buffer` must be a multiple of `size`.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        try:
+            records = self._struct.iter_unpack(buffer)
+        except error as exc:
+            raise PilusDeserializeError(f'Could not decode records: "{exc}"') from exc
+        if not self._decoders:
+            return records
+        return (self._decode(values) for values in records)
+
+    def read(self, io: BinaryIO) -> tuple[Any, ...]:
+        """Read and decode a single record from the IO stream.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        return self.unpack_from(read_exactly(io, self.size))
+
+    def pack(self, *values: Any) -> bytes:
+        """Encode a single record.
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        try:
+            return self._struct.pack(*self._encode(values))
+        except error as exc:
+            raise PilusSerializeError(f'Could not encode record: "{exc}"') from exc
+
+    def pack_into(self, buffer: Buffer, offset: int, *values: Any) -> None:
+        """Encode a single record into the buffer at the given offset.
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        try:
+            self._struct.pack_into(buffer, offset, *self._encode(values))
+        except error as exc:
+            raise PilusSerializeError(f'Could not encode record: "{exc}"') from exc
+
+    def write(self, io: BinaryIO, *values: Any) -> None:
+        """Encode a single record and write it to the IO stream.
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        write_exactly(io, self.pack(*values))
+
+    def _decode(self, values: tuple[Any, ...]) -> tuple[Any, ...]:
+        if not self._decoders:
+            return values
+        result = list(values)
+        for i, decode in self._decoders:
+            result[i] = decode(result[i])
+        return tuple(result)
+
+    def _encode(self, values: tuple[Any, ...]) -> tuple[Any, ...]:
+        if len(values) != len(self.fields):
+            raise PilusSerializeError(
+                f"Expected {len(self.fields)} values but got {len(values)}"
+            )
+        if not self._encoders:
+            return values
+        result = list(values)
+        for i, encode in self._encoders:
+            result[i] = encode(result[i])
+        return tuple(result)
+
+
+def terminated_string_field(
+    name: str, max_size: int, *, terminator: bytes = b"\x00"
+) -> LayoutField:
+    """Return field for a terminated string of fixed size.
+
+    Same encoding as `read_terminated_string` and `write_terminated_string`.
+    """
+
+    def decode(data: bytes) -> str:
+        terminator_pos = data.find(terminator)
+        if terminator_pos == -1:
+            raise PilusDeserializeError(
+                "Could not find terminator in fixed-length string"
+            )
+        try:
+            return data[:terminator_pos].decode()
+        except UnicodeDecodeError as exc:
+            raise PilusUnicodeDecodeError(*exc.args) from exc
+
+    def encode(value: str) -> bytes:
+        try:
+            data = value.encode() + terminator
+        except UnicodeEncodeError as exc:
+            raise PilusUnicodeEncodeError(*exc.args) from exc
+        if len(data) > max_size:
+            raise PilusSerializeError("Could not fit string into the given size.")
+        # Note that `struct` pads the rest of the field with zeros
+        return data
+
+    return LayoutField(name, f"{max_size}s", decode, encode)
+
+
+def long_int_field(name: str, size: int, *, signed: bool = False) -> LayoutField:
+    """Return field for an integer of arbitrary byte size.
+
+    Use this for integers that `struct` doesn't support natively. E.g., the 64-byte
+    integers in the IHDR chunk.
+    """
+
+    def decode(data: bytes) -> int:
+        return int.from_bytes(data, byteorder=IQS_BYTE_ORDER, signed=signed)
+
+    def encode(value: int) -> bytes:
+        try:
+            return value.to_bytes(size, byteorder=IQS_BYTE_ORDER, signed=signed)
+        except OverflowError as exc:
+            raise PilusSerializeError(f'Could not encode integer: "{exc}"') from exc
+
+    return LayoutField(name, f"{size}s", decode, encode)
@@ -1 +1,3 @@
+from ._bdr_follower import BdrFollower as BdrFollower
 from ._bdr_from_io import from_io as from_io
+from ._bdr_from_io import from_stream as from_stream
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import cast
+
+from ...._magic.signatures import BDR_SIGNATURE
+from ..._model import BdrAggregate
+from .._chunk import ChunkFollower, CrcPolicy
+from ._bdr_from_io import _chunks_to_aggregate
+from ._chunks import AhdrChunk, TranChunk
+
+
+class BdrFollower:
+    """Follow a BDR file that is still being written.
+
+    Use this for, e.g., live dashboards. Each call to `poll` only parses the data
+    that arrived since the previous call.
+    """
+
+    def __init__(self, file: Path, *, verify_crc: CrcPolicy | None = None) -> None:
+        self._follower = ChunkFollower(
+            file, signature=BDR_SIGNATURE, verify_crc=verify_crc
+        )
+        # The most recent header. We use it to parse the subsequent data chunks.
+        self._header: AhdrChunk | None = None
+
+    @property
+    def offset(self) -> int:
+        """Return the position right after the last complete chunk."""
+        return self._follower.offset
+
+    def poll(self) -> BdrAggregate | None:
+        """Return the data that arrived since the previous call.
+
+        Returns `None` if there is no new data.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        # Read header (it must come first)
+        if self._header is None:
+            headers = self._follower.poll(chunk_models=(AhdrChunk,), limit=1)
+            if not headers:
+                return None
+            self._header = cast(AhdrChunk, headers[0])
+        # Read data (and interleaved headers, if any)
+        chunks = self._follower.poll(
+            chunk_models=(AhdrChunk, TranChunk),
+            channel_names=self._header.channel_names,
+        )
+        header = self._header
+        # Remember the latest header for the next call
+        self._header = next(
+            (chunk for chunk in reversed(chunks) if isinstance(chunk, AhdrChunk)),
+            self._header,
+        )
+        if not any(isinstance(chunk, TranChunk) for chunk in chunks):
+            return None
+        return _chunks_to_aggregate(header, chunks)
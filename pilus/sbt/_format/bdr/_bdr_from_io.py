@@ -1,24 +1,84 @@
 from __future__ import annotations
 
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from typing import Annotated, BinaryIO, cast
 
 from ...._magic.signatures import BDR_SIGNATURE
 from ....errors import PilusDeserializeError
 from ....forge import FORGE
-from ..._model import BdrAggregate, BdrAggregateChannel, BdrAggregateSite, FitComplex
-from .._chunk import require_single_chunk, stream_chunks
-from .._io import read_and_validate_signature
+from ..._model import (
+    BdrAggregate,
+    BdrAggregateChannel,
+    BdrAggregateSite,
+    FitComplexColumns,
+    TransitionFitChannel,
+)
+from .._chunk import (
+    RANGES_PER_WORKER,
+    CrcPolicy,
+    ReadableChunk,
+    borrow_or_create_pool,
+    file_behind,
+    read_chunks_from_file,
+    require_single_chunk,
+    require_single_chunk_async,
+    scan_chunks,
+    split_into_ranges,
+    stream_chunks,
+    stream_chunks_async,
+)
+from .._io import (
+    AsyncByteSource,
+    map_io,
+    read_and_validate_signature,
+    read_and_validate_signature_async,
+)
 from ._chunks import AhdrChunk, TranChunk
 
 
 @FORGE.register_deserializer
-def from_io(io: Annotated[BinaryIO, "application/vnd.sbt.bdr"]) -> BdrAggregate:
-    """Deserialize IO stream into a BDR aggregate."""
+def from_io(
+    io: Annotated[BinaryIO, "application/vnd.sbt.bdr"],
+    *,
+    memory_map: bool = False,
+    verify_crc: CrcPolicy | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
+) -> BdrAggregate:
+    """Deserialize IO stream into a BDR aggregate.
+
+    If `memory_map` is true, we memory-map the file behind `io` and deserialize
+    directly from the mapped pages.
+
+    See `CrcPolicy` for the options of `verify_crc`. Defaults to "strict".
+
+    If `workers` is more than one, we decode the chunks on a pool of that many
+    processes. This requires a file behind `io`. The workers import the
+    `__main__` module. Therefore, guard the entry point of your script with
+    `if __name__ == "__main__":` (see `process_pool`).
+
+    Give `executor` to decode the chunks on said executor instead (e.g., to reuse
+    a single process pool across many files). You own the executor. We don't
+    shut it down. In this case, `workers` is the number of pieces (times
+    `RANGES_PER_WORKER`) that we split the work into. Defaults to the number of
+    CPUs.
+    """
+    # Default arguments
+    if workers is None:
+        workers = 1 if executor is None else os.cpu_count() or 1
+    parallel = workers > 1 or executor is not None
+    if memory_map and not parallel:
+        io = cast(BinaryIO, map_io(io))
     # Signature
     read_and_validate_signature(io, BDR_SIGNATURE)
     # Read header (it must come first)
-    header = cast(AhdrChunk, require_single_chunk(io, chunk_models=(AhdrChunk,)))
+    header = cast(
+        AhdrChunk,
+        require_single_chunk(io, chunk_models=(AhdrChunk,), verify_crc=verify_crc),
+    )
     # Read data (and interleaved headers, if any)
     #
     # In the IQS specification, there is only a single header in the beginning
@@ -26,9 +86,101 @@ def from_io(io: Annotated[BinaryIO, "application/vnd.sbt.bdr"]) -> BdrAggregate:
     # with the data chunks. We use the most recent header to parse the
     # subsequent data chunks. E.g., to determine which measurement site, that
     # the data belongs to.
-    chunk_stream = stream_chunks(  # [1]
-        io, chunk_models=(AhdrChunk, TranChunk), channel_names=header.channel_names
+    chunk_stream: Iterable[ReadableChunk]
+    if parallel:
+        chunk_stream = _read_chunks_in_parallel(
+            io,
+            header=header,
+            workers=workers,
+            executor=executor,
+            verify_crc=verify_crc,
+        )
+    else:
+        chunk_stream = stream_chunks(
+            io,
+            chunk_models=(AhdrChunk, TranChunk),
+            verify_crc=verify_crc,
+            channel_names=header.channel_names,
+        )
+    return _chunks_to_aggregate(header, chunk_stream)
+
+
+async def from_stream(
+    source: AsyncByteSource,
+    *,
+    verify_crc: CrcPolicy | None = None,
+) -> BdrAggregate:
+    """Deserialize asynchronous byte source into a BDR aggregate.
+
+    Use this for, e.g., data that streams in over a socket or pipe. We parse each
+    chunk as soon as we received all of it.
+
+    See `CrcPolicy` for the options of `verify_crc`. Defaults to "strict".
+    """
+    # Signature
+    await read_and_validate_signature_async(source, BDR_SIGNATURE)
+    # Read header (it must come first)
+    header = cast(
+        AhdrChunk,
+        await require_single_chunk_async(
+            source, chunk_models=(AhdrChunk,), verify_crc=verify_crc
+        ),
     )
+    # Read data (and interleaved headers, if any). See `from_io` for details.
+    chunks = [
+        chunk
+        async for chunk in stream_chunks_async(
+            source,
+            chunk_models=(AhdrChunk, TranChunk),
+            verify_crc=verify_crc,
+            channel_names=header.channel_names,
+        )
+    ]
+    return _chunks_to_aggregate(header, chunks)
+
+
+def _read_chunks_in_parallel(
+    io: BinaryIO,
+    *,
+    header: AhdrChunk,
+    workers: int,
+    executor: Executor | None,
+    verify_crc: CrcPolicy | None,
+) -> Iterator[ReadableChunk]:
+    """Decode the remaining chunks on a process pool.
+
+    Uses `executor` if given. Otherwise, we create a pool of `workers` processes.
+
+    Each worker decodes (and verifies) a contiguous range of chunks. We yield the
+    resulting chunks in file order.
+
+    May raise:
+      * `ValueError` if there is no file behind `io`
+      * `PilusDeserializeError` or one of its derivatives
+    """
+    file = file_behind(io)
+    # Find the remaining chunks without decoding them
+    index = scan_chunks(io)
+    ranges = split_into_ranges(index.entries, workers * RANGES_PER_WORKER)
+    with borrow_or_create_pool(executor, workers) as pool:
+        futures = [
+            pool.submit(
+                read_chunks_from_file,
+                file,
+                entries,
+                chunk_models=(AhdrChunk, TranChunk),
+                verify_crc=verify_crc,
+                channel_names=header.channel_names,
+            )
+            for entries in ranges
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def _chunks_to_aggregate(
+    header: AhdrChunk, chunk_stream: Iterable[ReadableChunk]
+) -> BdrAggregate:
     mutable_sites: dict[str, MutableSite] = {}
     for chunk in chunk_stream:
         match chunk:
@@ -56,7 +208,7 @@ def from_io(io: Annotated[BinaryIO, "application/vnd.sbt.bdr"]) -> BdrAggregate:
 class _MutableChannel:
     time_start: int
     time_end: int
-    transition_fits: list[tuple[FitComplex, ...]]
+    transition_fits: list[TransitionFitChannel]
 
 
 MutableSite = dict[str, _MutableChannel]
@@ -103,10 +255,10 @@ def _freeze_sites(mutable_sites: dict[str, MutableSite]) -> dict[str, BdrAggrega
             channel_name: BdrAggregateChannel(
                 time_start=channel.time_start,
                 time_end=channel.time_end,
-                # Flatten list of tuples and sort them
-                transition_fits=tuple(
-                    sorted(fit for fits in channel.transition_fits for fit in fits)
-                ),
+                # Concatenate the columns of each chunk and sort them
+                transition_fits=FitComplexColumns.concat(
+                    channel.transition_fits
+                ).sorted(),
             )
             for channel_name, channel in site.items()
         }
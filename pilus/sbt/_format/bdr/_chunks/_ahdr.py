@@ -1,9 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, BinaryIO, ClassVar
 
-from ..._io import read_int, read_terminated_string
+from .....errors import PilusDeserializeError
+from ..._io import ByteCursor, LayoutField, StructLayout, terminated_string_field
+
+# Byte size of each (fixed-size) channel name
+_CHANNEL_NAME_SIZE = 256
+# Byte size of the `time_start` and `time_end` fields
+_TIMES_SIZE = 2 * 8
+
+_PREFIX = StructLayout(
+    # site_name[*chr[256]] - fixed 256 bytes length with trailing zeros
+    terminated_string_field("site_name", 256),
+    # channels[uint32]
+    LayoutField("channels", "I"),
+)
 
 
 @dataclass(frozen=True)
@@ -18,22 +32,85 @@ class AhdrChunk:
     time_end: int
 
     @classmethod
-    def from_io(cls, io: BinaryIO, **_kwargs: Any) -> AhdrChunk:
+    def from_io(cls, io: BinaryIO, **kwargs: Any) -> AhdrChunk:
         """Deserialize the IO stream into an AHDR chunk.
 
         May raise `BdrError` or one of its derivatives.
         """
-        # Read site_name[*chr[256]] - fixed 256 bytes length with trailing zeros
-        site_name = read_terminated_string(io, 256)
-        # Read channels[uint32]
-        channels = read_int(io, 4)
-        channel_names = tuple(read_terminated_string(io, 256) for _ in range(channels))
-        # times[uint64] - times given in uSeconds
-        time_start = read_int(io, 8)
-        time_end = read_int(io, 8)
+        site_name, channels = _PREFIX.read(io)
+        suffix_layout = _checked_suffix_layout(channels, **kwargs)
+        *channel_names, time_start, time_end = suffix_layout.read(io)
+        return AhdrChunk(
+            site_name=site_name,
+            channel_names=tuple(channel_names),
+            time_start=time_start,
+            time_end=time_end,
+        )
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> AhdrChunk:
+        """Deserialize the in-memory data into an AHDR chunk.
+
+        May raise `BdrError` or one of its derivatives.
+        """
+        site_name, channels = cursor.read_layout(_PREFIX)
+        suffix_layout = _checked_suffix_layout(channels, **kwargs)
+        *channel_names, time_start, time_end = cursor.read_layout(suffix_layout)
         return AhdrChunk(
             site_name=site_name,
-            channel_names=channel_names,
+            channel_names=tuple(channel_names),
             time_start=time_start,
             time_end=time_end,
         )
+
+    def to_io(self, io: BinaryIO) -> None:
+        """Serialize this chunk to the IO stream.
+
+        This only returns the "data" and not the "length", "type", or "CRC".
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        channels = len(self.channel_names)
+        _PREFIX.write(io, self.site_name, channels)
+        _suffix_layout(channels).write(
+            io, *self.channel_names, self.time_start, self.time_end
+        )
+
+    def data_length(self) -> int:
+        """Return the byte size of this chunk in serialized form."""
+        return _PREFIX.size + _suffix_layout(len(self.channel_names)).size
+
+
+def _checked_suffix_layout(channels: int, **kwargs: Any) -> StructLayout:
+    """Return the suffix layout if the channel count matches the chunk length.
+
+    The channel count comes straight from the file. We check it before we build
+    the layout. Otherwise, a corrupt count (up to 2^32) makes us build a huge
+    layout.
+
+    May raise `PilusDeserializeError` if the count doesn't match.
+    """
+    data_length = kwargs["data_length"]
+    assert isinstance(data_length, int)
+    suffix_length = data_length - _PREFIX.size - _TIMES_SIZE
+    if suffix_length != channels * _CHANNEL_NAME_SIZE:
+        raise PilusDeserializeError(
+            f"The AHDR chunk claims {channels} channels but its length "
+            f"({data_length} bytes) doesn't match"
+        )
+    return _suffix_layout(channels)
+
+
+# The file decides the channel count. We only cache the few common counts.
+@lru_cache(maxsize=16)
+def _suffix_layout(channels: int) -> StructLayout:
+    """Return the layout that comes after the channel count."""
+    return StructLayout(
+        *(
+            terminated_string_field(f"channel_name_{i}", _CHANNEL_NAME_SIZE)
+            for i in range(channels)
+        ),
+        # times[uint64] - times given in uSeconds
+        LayoutField("time_start", "Q"),
+        LayoutField("time_end", "Q"),
+    )
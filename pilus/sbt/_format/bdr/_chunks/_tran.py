@@ -1,15 +1,39 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+from functools import cache
+from itertools import chain
+from operator import attrgetter
 from typing import Any, BinaryIO, ClassVar
 
 from .....errors import PilusDeserializeError
-from ...._model import FitComplex, TransitionFit, TransitionFitChannel
-from ..._io import read_double, read_int
+from ...._model import FitComplexColumns, TransitionFitChannel, TransitionFitColumns
+from ..._io import ByteCursor, LayoutField, StructLayout, read_view, write_exactly
 
 SiteData = dict[str, TransitionFitChannel]
 
-FIT_SIZE_IN_BYTES = 400
+# Same order as the fields of `TransitionFit`
+_TRANSITION_FIT_FIELDS = (
+    LayoutField("scale", "d"),
+    LayoutField("center", "d"),
+    LayoutField("width", "d"),
+    LayoutField("baseline", "d"),
+    LayoutField("offset", "d"),
+    LayoutField("peak_height", "d"),
+    LayoutField("transition_time", "d"),
+    LayoutField("mse", "d"),
+    LayoutField("noise", "d"),
+    LayoutField("snr", "d"),
+    LayoutField("ascend", "d"),
+    LayoutField("iterations", "I"),
+    LayoutField("origin", "I"),
+)
+_TRANSITION_FIT_VALUES = attrgetter(*(field.name for field in _TRANSITION_FIT_FIELDS))
+# Number of values for each `TransitionFit`
+_FIT = len(_TRANSITION_FIT_FIELDS)
+# Number of records that we decode at once
+_BATCH_RECORDS = 4096
 
 
 @dataclass(frozen=True)
@@ -28,57 +52,94 @@ class TranChunk:
         """
         data_length = kwargs["data_length"]
         assert isinstance(data_length, int)
+        return cls._from_data(read_view(io, data_length), **kwargs)
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> TranChunk:
+        """Deserialize the in-memory data into a tRAN chunk.
+
+        May raise `IqsError` or one of its derivatives.
+        """
+        data_length = kwargs["data_length"]
+        assert isinstance(data_length, int)
+        return cls._from_data(cursor.read_view(data_length), **kwargs)
+
+    @classmethod
+    def _from_data(cls, data: memoryview, **kwargs: Any) -> TranChunk:
         channel_names: tuple[str] = kwargs["channel_names"]
         assert isinstance(channel_names, tuple)
 
-        if data_length % FIT_SIZE_IN_BYTES != 0:
+        layout = _record_layout(len(channel_names))
+        if len(data) % layout.size != 0:
             raise PilusDeserializeError("Invalid chunk tRAN chunk length.")
-        transition_count = data_length // FIT_SIZE_IN_BYTES
 
-        # Make data structure
-        mutable_site_data: dict[str, list[FitComplex]] = {}
+        # Decode the records in batches and then slice out each column. That is,
+        # we extend each column with a single (C-level) slice per batch. There
+        # are no Python objects per transition. The batches bound the size of the
+        # intermediate tuple of values.
+        stride = len(layout.fields)
+        columns: list[array[Any]] = [array(field.format) for field in layout.fields]
+        batch_size = _BATCH_RECORDS * layout.size
+        for batch_start in range(0, len(data), batch_size):
+            batch = data[batch_start : batch_start + batch_size]
+            values = tuple(chain.from_iterable(layout.iter_unpack(batch)))
+            for index, column in enumerate(columns):
+                column.extend(values[index::stride])
+
+        # Assemble the columns of each channel. All channels share the time span.
+        time_start, time_end = columns[0], columns[1]
+        site_data: SiteData = {}
+        offset = 2
         for channel_name in channel_names:
-            mutable_site_data[channel_name] = []
-
-        # Fill in data structure
-        for _ in range(transition_count):
-            time_start = read_double(io)
-            time_end = read_double(io)
-            for channel_name in channel_names:
-                fit_complex = _fit_complex_from_io(
-                    io, time_start=time_start, time_end=time_end
+            re = TransitionFitColumns(*columns[offset : offset + _FIT])
+            im = TransitionFitColumns(*columns[offset + _FIT : offset + 2 * _FIT])
+            offset += 2 * _FIT
+            try:
+                site_data[channel_name] = FitComplexColumns(
+                    time_start=time_start, time_end=time_end, re=re, im=im
                 )
-                mutable_site_data[channel_name].append(fit_complex)
-
-        # Freeze data structure
-        site_data: SiteData = {
-            channel_name: tuple(fits)
-            for channel_name, fits in mutable_site_data.items()
-        }
+            except ValueError as exc:
+                raise PilusDeserializeError(
+                    f'Invalid transition fits in channel "{channel_name}": {exc}'
+                ) from exc
         return cls(site_data=site_data)
 
+    def to_io(self, io: BinaryIO) -> None:
+        """Serialize this chunk to the IO stream.
 
-def _fit_complex_from_io(
-    io: BinaryIO, *, time_start: float, time_end: float
-) -> FitComplex:
-    re = _transition_fit_from_io(io)
-    im = _transition_fit_from_io(io)
-    return FitComplex(re=re, im=im, time_start=time_start, time_end=time_end)
-
-
-def _transition_fit_from_io(io: BinaryIO) -> TransitionFit:
-    return TransitionFit(
-        scale=read_double(io),
-        center=read_double(io),
-        width=read_double(io),
-        baseline=read_double(io),
-        offset=read_double(io),
-        peak_height=read_double(io),
-        transition_time=read_double(io),
-        mse=read_double(io),
-        noise=read_double(io),
-        snr=read_double(io),
-        ascend=read_double(io),
-        iterations=read_int(io, 4),
-        origin=read_int(io, 4),
+        This only returns the "data" and not the "length", "type", or "CRC".
+
+        We take the time span of each transition from the first channel.
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        channels = tuple(self.site_data.values())
+        layout = _record_layout(len(channels))
+        data = bytearray(self.data_length())
+        for i, fits in enumerate(zip(*channels, strict=True)):
+            values: list[Any] = [fits[0].time_start, fits[0].time_end]
+            for fit in fits:
+                values += _TRANSITION_FIT_VALUES(fit.re)
+                values += _TRANSITION_FIT_VALUES(fit.im)
+            layout.pack_into(data, i * layout.size, *values)
+        write_exactly(io, memoryview(data))
+
+    def data_length(self) -> int:
+        """Return the byte size of this chunk in serialized form."""
+        channels = tuple(self.site_data.values())
+        transition_count = len(channels[0]) if channels else 0
+        return transition_count * _record_layout(len(channels)).size
+
+
+@cache
+def _record_layout(channels: int) -> StructLayout:
+    """Return the layout of a single transition record.
+
+    E.g., 400 bytes for two channels.
+    """
+    return StructLayout(
+        LayoutField("time_start", "d"),
+        LayoutField("time_end", "d"),
+        # The real and imaginary fit of each channel
+        *(_TRANSITION_FIT_FIELDS * 2 * channels),
     )
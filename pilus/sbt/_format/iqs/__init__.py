@@ -1,3 +1,13 @@
+from ._chunks import IqsCompression as IqsCompression
+from ._iqs_edit import concat_io as concat_io
+from ._iqs_edit import crop_io as crop_io
+from ._iqs_edit import split_io as split_io
+from ._iqs_follower import IqsFollower as IqsFollower
 from ._iqs_from_io import from_io as from_io
+from ._iqs_from_io import from_stream as from_stream
 from ._iqs_globals import IqsVersion as IqsVersion
 from ._iqs_to_io import to_io as to_io
+from ._iqs_upgrade import upgrade_file as upgrade_file
+from ._iqs_upgrade import upgrade_io as upgrade_io
+from ._iqs_window import IqsTimeBound as IqsTimeBound
+from ._iqs_writer import IqsWriter as IqsWriter
@@ -7,3 +7,7 @@ from ._ihdr import MaxAmplitudeMode as MaxAmplitudeMode
 from ._ihdr import SiteHeader as SiteHeader
 from ._sdat import SdatChunk as SdatChunk
 from ._shdr import ShdrChunk as ShdrChunk
+from ._zdat import CompressedChannelData as CompressedChannelData
+from ._zdat import CompressedPart as CompressedPart
+from ._zdat import IqsCompression as IqsCompression
+from ._zdat import ZdatChunk as ZdatChunk
@@ -2,6 +2,7 @@ from ._idat import IdatChunk
 from ._ihdr import IhdrChunk
 from ._sdat import SdatChunk
 from ._shdr import ShdrChunk
+from ._zdat import ZdatChunk
 
 HeaderChunk = IhdrChunk | ShdrChunk
-DataChunk = IdatChunk | SdatChunk
+DataChunk = IdatChunk | SdatChunk | ZdatChunk
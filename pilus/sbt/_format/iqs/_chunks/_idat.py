@@ -1,20 +1,38 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Collection
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from io import SEEK_CUR
+from itertools import pairwise
+from math import lcm
 from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, Literal
 
 from .....errors import PilusDeserializeError
-from ...._model import IqsChannelData
-from ..._io import read_exactly, read_int, write_exactly, write_int
+from ...._model import IqsChannelData, IqsGap, RawData
+from ..._io import (
+    ByteCursor,
+    LayoutField,
+    StructLayout,
+    read_view,
+    seek,
+    write_buffers,
+)
 from ._ihdr import IhdrChunk
 
 if TYPE_CHECKING:
     from ._sdat import SdatChunk
+    from ._zdat import ZdatChunk
 
 
 SiteData = dict[str, IqsChannelData]
 
+# Comes before the channel data
+_PREFIX = StructLayout(
+    LayoutField("timestamp_us", "Q"),
+    LayoutField("duration_ns", "Q"),
+)
+
 
 @dataclass(frozen=True)
 class IdatChunk:
@@ -25,6 +43,11 @@ class IdatChunk:
     start_time: datetime
     duration_ns: int
     sites: dict[str, SiteData]
+    # Time spans without data. Only merged chunks have gaps (see `merge_all`).
+    gaps: tuple[IqsGap, ...] = ()
+
+    # Byte size of the start of the chunk data that `read_time_span` needs
+    time_span_size: ClassVar[int] = _PREFIX.size
 
     @property
     def end_time(self) -> datetime:
@@ -32,18 +55,92 @@ class IdatChunk:
         duration = timedelta(microseconds=self.duration_ns * 1e-3)
         return self.start_time + duration
 
+    @classmethod
+    def read_time_span(cls, cursor: ByteCursor, **_: Any) -> tuple[datetime, int]:
+        """Return the start time and duration (in nanoseconds) of the chunk.
+
+        Only needs the start of the chunk data (see `time_span_size`). Use this to
+        decide whether you need the chunk at all before you read all of it.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        timestamp_us, duration_ns = cursor.read_layout(_PREFIX)
+        start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
+        return start_time, duration_ns
+
+    def crop(
+        self,
+        *,
+        ihdr: IhdrChunk,
+        start_time: datetime | None = None,
+        end_time: datetime | None = None,
+    ) -> IdatChunk:
+        """Return the part of this chunk between `start_time` and `end_time`.
+
+        We round outwards to the nearest sample boundaries that all channels
+        share. Hence, the result covers the given time span as far as this chunk
+        does.
+
+        The channel data refers directly to that of this chunk (zero-copy).
+        """
+        step_ns = lcm(
+            *(
+                ihdr[site_name][channel_name].time_step_ns
+                for site_name, site_data in self.sites.items()
+                for channel_name in site_data
+            )
+        )
+        start_ns = 0
+        if start_time is not None:
+            offset_ns = round((start_time - self.start_time).total_seconds() * 1e9)
+            start_ns = max(0, offset_ns // step_ns * step_ns)
+        end_ns = self.duration_ns
+        if end_time is not None:
+            offset_ns = round((end_time - self.start_time).total_seconds() * 1e9)
+            end_ns = min(end_ns, -(-offset_ns // step_ns) * step_ns)
+        end_ns = max(start_ns, end_ns)
+        # Early out if there is nothing to crop
+        if start_ns == 0 and end_ns == self.duration_ns:
+            return self
+        sites: dict[str, SiteData] = {}
+        for site_name, site_data in self.sites.items():
+            sites[site_name] = {}
+            for channel_name, channel in site_data.items():
+                channel_header = ihdr[site_name][channel_name]
+                begin = start_ns // channel_header.time_step_ns
+                begin *= channel_header.byte_depth
+                end = end_ns // channel_header.time_step_ns * channel_header.byte_depth
+                sites[site_name][channel_name] = IqsChannelData(
+                    memoryview(channel.re).cast("B")[begin:end],
+                    memoryview(channel.im).cast("B")[begin:end],
+                )
+        start = self.start_time + timedelta(microseconds=start_ns * 1e-3)
+        return IdatChunk(start, end_ns - start_ns, sites)
+
     @classmethod
     def merge_all(
         cls,
-        *chunks: IdatChunk,
+        *chunks: IdatChunk | ZdatChunk,
         ihdr: IhdrChunk,
         contiguous_tolerance: timedelta | None = None,
         fill_missing_values_with: bytes | None = None,
+        channels: Collection[tuple[str, str]] | None = None,
     ) -> IdatChunk:
         """Merge all the chunks into one.
 
         This function assumes that the given chunks follow the same site and channel
         hierarchy.
+
+        We decompress zDAT chunks directly into the merged channel data.
+
+        Give `channels` as (site name, channel name) pairs to only merge the data of
+        said channels. The merged chunk then only contains these channels. The
+        duration is the same as if we merged all channels.
+
+        The merged chunk lists the time spans between the chunks (if any) in its
+        `gaps` (see `find_gaps`). The merged data is zero within these gaps. Give
+        `fill_missing_values_with` to fill them with a (repeated) byte pattern
+        instead. Either way, we only ever touch the bytes within the gaps.
         """
         # Early out if there are no chunks
         if not chunks:
@@ -53,16 +150,66 @@ class IdatChunk:
         cls.raise_if_not_contiguous(*chunks, tolerance=contiguous_tolerance)
         # Compute the total duration. We need this to pre-allocate memory
         # inside the loop.
-        # Note that `total_duration_ns` is NOT a multiple of `time_step_ns`
-        # at this point. We account for this fact inside the for loop
-        total_duration_ns = int(  # [1]
-            (chunks[-1].end_time - chunks[0].start_time).total_seconds() * 1e9
-        )
+        total_duration_ns = cls.merged_duration_ns(*chunks, ihdr=ihdr)
+        gaps = cls.find_gaps(*chunks)
         # Go through the site/channel hierarchy based on that of the first chunk.
         # We assume that the subsequent chunks follow the same hierarchy.
         merged_value: dict[str, SiteData] = {}
         for site_name, site_data in first_chunk.sites.items():
             merged_site: SiteData = {}
+            for channel_name in site_data:
+                if channels is not None and (site_name, channel_name) not in channels:
+                    continue
+                merged_site[channel_name] = _merge_channel(
+                    chunks,
+                    ihdr=ihdr,
+                    site_name=site_name,
+                    channel_name=channel_name,
+                    total_duration_ns=total_duration_ns,
+                    gaps=gaps,
+                    fill_missing_values_with=fill_missing_values_with,
+                )
+            # Keep sites without any channels. Only leave out the sites that the
+            # `channels` filter empties.
+            if merged_site or channels is None:
+                merged_value[site_name] = merged_site
+        return cls(first_chunk.start_time, total_duration_ns, merged_value, gaps)
+
+    @classmethod
+    def find_gaps(cls, *chunks: IdatChunk | ZdatChunk) -> tuple[IqsGap, ...]:
+        """Return the time spans between the (chronologically ordered) chunks.
+
+        This is cheap: We only look at the start time and duration of each chunk.
+        Offsets are relative to the start of the first chunk. This is the same
+        layout that `merge_all` uses.
+        """
+        first_chunk = chunks[0]
+        gaps: list[IqsGap] = []
+        for previous_chunk, chunk in pairwise(chunks):
+            previous_start_delta = previous_chunk.start_time - first_chunk.start_time
+            start_delta = chunk.start_time - first_chunk.start_time
+            gap_start_ns = (
+                round(previous_start_delta.total_seconds() * 1e9)
+                + previous_chunk.duration_ns
+            )
+            gap_end_ns = round(start_delta.total_seconds() * 1e9)
+            if gap_start_ns < gap_end_ns:
+                gaps.append(IqsGap(gap_start_ns, gap_end_ns))
+        return tuple(gaps)
+
+    @classmethod
+    def merged_duration_ns(cls, *chunks: IdatChunk | ZdatChunk, ihdr: IhdrChunk) -> int:
+        """Return the duration of the chunks once merged.
+
+        The result is a multiple of the time step of all channels.
+        """
+        first_chunk = chunks[0]
+        # Note that `total_duration_ns` is NOT a multiple of `time_step_ns`
+        # at this point. We account for this fact inside the for loop
+        total_duration_ns = int(  # [1]
+            (chunks[-1].end_time - first_chunk.start_time).total_seconds() * 1e9
+        )
+        for site_name, site_data in first_chunk.sites.items():
             for channel_name in site_data:
                 channel_header = ihdr[site_name][channel_name]
                 # Make sure that the rough computation of `total_duration_ns` at [1]
@@ -71,63 +218,12 @@ class IdatChunk:
                 # remainder is always zero on subsequent iterations (see [2]).
                 total_duration_ns -= total_duration_ns % channel_header.time_step_ns
                 assert total_duration_ns % channel_header.time_step_ns == 0  # [2]
-                total_logical_length = total_duration_ns // channel_header.time_step_ns
-                total_byte_length = total_logical_length * channel_header.byte_depth
-                # We pre-allocate the memory up front. This avoids a lot of memory
-                # allocations inside the for loop itself.
-                if fill_missing_values_with is None:
-                    merged_re = bytearray(total_byte_length)
-                    merged_im = bytearray(total_byte_length)
-                else:
-                    merged_re = bytearray(fill_missing_values_with * total_byte_length)
-                    merged_im = bytearray(fill_missing_values_with * total_byte_length)
-                for chunk in chunks:
-                    # We compute `offset` based on the chunk's start time to
-                    # account for non-overlapping chunks. E.g., if the system time
-                    # suddenly jumped ahead/behind during the IQS save.
-                    start_delta = chunk.start_time - first_chunk.start_time
-                    start_delta_ns = start_delta.total_seconds() * 1e9
-                    offset = (
-                        round(start_delta_ns / channel_header.time_step_ns)
-                        * channel_header.byte_depth
-                    )
-                    site = chunk.sites[site_name]
-                    channel = site[channel_name]
-                    length = len(channel.re)
-                    assert length == len(channel.im)
-                    # [3] Note that `bytearray` is pretty lenient about splicing:
-                    #
-                    #   >>> x = bytearray(3)
-                    #   >>> len(x)
-                    #   3
-                    #   >>> x[1:7] = bytes(7)
-                    #   >>> len(x)
-                    #   8
-                    #
-                    # In other words, `bytearray` allows us not only to modify
-                    # its contents but also to go beyond the existing bounds.
-                    merged_re[offset : offset + length] = channel.re
-                    merged_im[offset : offset + length] = channel.im
-                # Bound the data because the last chunk may extend a bit beyond
-                # the `total_byte_length`. We expect this to occur since we round
-                # down at [1] and [2] and because of [3].
-                merged_re_bound = merged_re[0:total_byte_length]
-                merged_im_bound = merged_im[0:total_byte_length]
-                merged_channel = IqsChannelData(
-                    bytes(merged_re_bound),
-                    bytes(merged_im_bound),
-                )
-                # Check that our bounds hold
-                assert len(merged_channel.re) == total_byte_length
-                assert len(merged_channel.im) == total_byte_length
-                merged_site[channel_name] = merged_channel
-            merged_value[site_name] = merged_site
-        return cls(first_chunk.start_time, total_duration_ns, merged_value)
+        return total_duration_ns
 
     @classmethod
     def raise_if_not_contiguous(
         cls,
-        *chunks: IdatChunk,
+        *chunks: IdatChunk | ZdatChunk,
         tolerance: timedelta | None = None,
     ) -> None:
         """Raise a `PilusDeserializeError` if chunks are not adjoined in time."""
@@ -151,22 +247,44 @@ class IdatChunk:
 
     @classmethod
     def from_sdat(
-        cls, sdat: SdatChunk, *, site_name: str, time_step_ns: int
+        cls,
+        sdat: SdatChunk,
+        *,
+        site_name: str,
+        time_step_ns: int,
+        buffer: bytearray | None = None,
     ) -> IdatChunk:
         """Convert the SDAT chunk into an IDAT chunk.
 
+        Give a `buffer` to de-interleave the data into (instead of into new
+        `bytes` objects). It must be at least as large as the interleaved data.
+        The channel data of the returned chunk refers directly to `buffer`. That
+        is, it's only valid until you reuse said buffer.
+
         May raise:
           * `RuntimeError` if the platform doesn't natively support 4-byte integers.
+          * `ValueError` if the buffer is too small.
         """
         # We de-interleave the data first
         format_string: Literal["i"] = "i"  # 4-byte integer
         interleaved = memoryview(sdat.interleaved_data).cast(format_string)
         if interleaved.itemsize != 4:
             raise RuntimeError("The native integer size must be 4 bytes")
-        hf_re = interleaved[0::4].tobytes()
-        hf_im = interleaved[1::4].tobytes()
-        lf_re = interleaved[2::4].tobytes()
-        lf_im = interleaved[3::4].tobytes()
+        parts: list[RawData]
+        if buffer is None:
+            parts = [interleaved[index::4].tobytes() for index in range(4)]
+        else:
+            if len(buffer) < interleaved.nbytes:
+                raise ValueError("The buffer is too small for the interleaved data")
+            # Copy each (strided) part into its own contiguous section of the buffer
+            part_length = interleaved.nbytes // 4
+            target = memoryview(buffer)
+            parts = []
+            for index in range(4):
+                part = target[index * part_length : (index + 1) * part_length]
+                part.cast(format_string)[:] = interleaved[index::4]
+                parts.append(part)
+        hf_re, hf_im, lf_re, lf_im = parts
         hf_channel = IqsChannelData(hf_re, hf_im)
         lf_channel = IqsChannelData(lf_re, lf_im)
         site: SiteData = {
@@ -181,14 +299,58 @@ class IdatChunk:
     def from_io(cls, io: BinaryIO, **kwargs: Any) -> IdatChunk:
         """Deserialize the IO stream into an IDAT chunk.
 
+        Give `channels` as (site name, channel name) pairs to only read the data
+        of said channels. We seek past the data of all other channels.
+
         May raise `PilusDeserializeError` or one of its derivatives.
         """
         ihdr = kwargs["header"]
         assert isinstance(ihdr, IhdrChunk)
+        timestamp_us, duration_ns = _PREFIX.read(io)
+        # Note that we use `read_view` to avoid a copy of the (potentially very
+        # large) channel data.
+        return cls._from_channel_data(
+            lambda size: read_view(io, size),
+            lambda size: seek(io, size, SEEK_CUR),
+            ihdr=ihdr,
+            timestamp_us=timestamp_us,
+            duration_ns=duration_ns,
+            channels=kwargs.get("channels"),
+        )
 
-        timestamp_us = read_int(io, 8)
-        duration_ns = read_int(io, 8)
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> IdatChunk:
+        """Deserialize the in-memory data into an IDAT chunk.
 
+        The channel data refers directly to the memory behind `cursor` (zero-copy).
+
+        See `from_io` for the `channels` argument.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        ihdr = kwargs["header"]
+        assert isinstance(ihdr, IhdrChunk)
+        timestamp_us, duration_ns = cursor.read_layout(_PREFIX)
+        return cls._from_channel_data(
+            cursor.read_view,
+            cursor.skip,
+            ihdr=ihdr,
+            timestamp_us=timestamp_us,
+            duration_ns=duration_ns,
+            channels=kwargs.get("channels"),
+        )
+
+    @classmethod
+    def _from_channel_data(  # noqa: PLR0913
+        cls,
+        read_view: Callable[[int], memoryview],
+        skip: Callable[[int], None],
+        *,
+        ihdr: IhdrChunk,
+        timestamp_us: int,
+        duration_ns: int,
+        channels: Collection[tuple[str, str]] | None,
+    ) -> IdatChunk:
         idat_value: dict[str, SiteData] = {}
         for site_name, site_header in ihdr.items():
             site_data: SiteData = {}
@@ -199,13 +361,20 @@ class IdatChunk:
                     )
                 logical_length = duration_ns // channel_header.time_step_ns
                 byte_length = logical_length * channel_header.byte_depth
-                re_data = read_exactly(io, byte_length)
-                im_data = read_exactly(io, byte_length)
+                # The IHDR chunk tells us the length of the channel data up
+                # front. Hence, we can skip the channels that we don't need.
+                if channels is not None and (site_name, channel_name) not in channels:
+                    skip(2 * byte_length)
+                    continue
+                re_data = read_view(byte_length)
+                im_data = read_view(byte_length)
                 # Add channel data to site data
                 channel_data = IqsChannelData(re_data, im_data)
                 site_data[channel_name] = channel_data
-            # Add site header to chunk
-            idat_value[site_name] = site_data
+            # Add site to chunk. Only leave out the sites that the `channels`
+            # filter empties.
+            if site_data or channels is None:
+                idat_value[site_name] = site_data
         start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
         return IdatChunk(start_time, duration_ns, idat_value)
 
@@ -217,19 +386,103 @@ class IdatChunk:
         May raise `PilusSerializeError` or one of its derivatives.
         """
         timestamp_us = int(self.start_time.timestamp() * 1e6)
-        write_int(io, timestamp_us, 8)
-        write_int(io, self.duration_ns, 8)
-        for site in self.sites.values():
-            for channel in site.values():
-                write_exactly(io, channel.re)
-                write_exactly(io, channel.im)
+        _PREFIX.write(io, timestamp_us, self.duration_ns)
+        # We write the existing channel buffers as-is (vectored I/O). There is
+        # no need to concatenate them first.
+        write_buffers(
+            io,
+            [
+                data
+                for site in self.sites.values()
+                for channel in site.values()
+                for data in (channel.re, channel.im)
+            ],
+        )
 
     def data_length(self) -> int:
         """Return the byte size of this chunk in serialized form."""
         # Timestamp and duration
-        result = 8 + 8
+        result = _PREFIX.size
         # Actual data
         for site in self.sites.values():
             for channel in site.values():
                 result += len(channel.re) + len(channel.im)
         return result
+
+
+def _merge_channel(  # noqa: PLR0913
+    chunks: tuple[IdatChunk | ZdatChunk, ...],
+    *,
+    ihdr: IhdrChunk,
+    site_name: str,
+    channel_name: str,
+    total_duration_ns: int,
+    gaps: tuple[IqsGap, ...],
+    fill_missing_values_with: bytes | None,
+) -> IqsChannelData:
+    """Merge the data of a single channel.
+
+    We size the merged data exactly up front and fill it in a single pass. In
+    turn, we copy the data of each chunk exactly once. We then hand the merged
+    data over as a read-only view without any further copies.
+    """
+    first_chunk = chunks[0]
+    channel_header = ihdr[site_name][channel_name]
+    assert total_duration_ns % channel_header.time_step_ns == 0
+    total_logical_length = total_duration_ns // channel_header.time_step_ns
+    total_byte_length = total_logical_length * channel_header.byte_depth
+    # Early out if there is a single IDAT chunk of the exact size. We simply use
+    # its data as-is (no copies at all).
+    if len(chunks) == 1 and isinstance(first_chunk, IdatChunk):
+        channel = first_chunk.sites[site_name][channel_name]
+        if len(channel.re) == total_byte_length:
+            return channel
+    # Zero-initialized. Note that we only fill the gaps (if at all). Not the
+    # entire data.
+    re_view = memoryview(bytearray(total_byte_length))
+    im_view = memoryview(bytearray(total_byte_length))
+    if fill_missing_values_with:
+        for gap in gaps:
+            samples = gap.samples(channel_header.time_step_ns)
+            begin = samples.start * channel_header.byte_depth
+            end = samples.stop * channel_header.byte_depth
+            _fill(re_view[begin:end], fill_missing_values_with)
+            _fill(im_view[begin:end], fill_missing_values_with)
+    for chunk in chunks:
+        # We compute `offset` based on the chunk's start time to account for
+        # non-overlapping chunks. E.g., if the system time suddenly jumped
+        # ahead/behind during the IQS save.
+        start_delta = chunk.start_time - first_chunk.start_time
+        start_delta_ns = start_delta.total_seconds() * 1e9
+        offset = (
+            round(start_delta_ns / channel_header.time_step_ns)
+            * channel_header.byte_depth
+        )
+        if isinstance(chunk, IdatChunk):
+            channel = chunk.sites[site_name][channel_name]
+            length = len(channel.re)
+            assert length == len(channel.im)
+        else:
+            length = chunk.byte_length(ihdr, site_name, channel_name)
+        # Note that slices of a `memoryview` never go beyond its bounds. This
+        # way, we cut off the last chunk if it extends a bit beyond
+        # `total_byte_length`. We expect this to occur since we round down in
+        # `IdatChunk.merged_duration_ns`.
+        re_destination = re_view[offset : offset + length]
+        im_destination = im_view[offset : offset + length]
+        if isinstance(chunk, IdatChunk):
+            size = len(re_destination)
+            re_destination[:] = memoryview(channel.re).cast("B")[:size]
+            im_destination[:] = memoryview(channel.im).cast("B")[:size]
+        else:
+            # Decompress straight into the merged data
+            chunk.decompress_into(
+                ihdr, site_name, channel_name, re_destination, im_destination
+            )
+    return IqsChannelData(re_view.toreadonly(), im_view.toreadonly())
+
+
+def _fill(destination: memoryview, pattern: bytes) -> None:
+    """Repeat the byte pattern across the destination."""
+    count, remainder = divmod(len(destination), len(pattern))
+    destination[:] = pattern * count + pattern[:remainder]
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import dataclasses
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, Literal
 
 from ...._model import IqsChannelHeader
-from ..._io import read_int, read_terminated_string, write_int, write_terminated_string
+from ..._io import (
+    ByteCursor,
+    LayoutField,
+    StructLayout,
+    long_int_field,
+    terminated_string_field,
+)
 
 if TYPE_CHECKING:
     from ._shdr import ShdrChunk
@@ -12,6 +19,20 @@ if TYPE_CHECKING:
 MaxAmplitudeMode = Literal["from-header-as-is", "from-header-with-corrections"]
 SiteHeader = dict[str, IqsChannelHeader]
 
+_SITE_COUNT = StructLayout(LayoutField("number_of_sites", "I"))
+_SITE = StructLayout(
+    terminated_string_field("site_name", 256),  # E.g.: "site0"
+    LayoutField("number_of_channels", "I"),
+)
+_CHANNEL = StructLayout(
+    terminated_string_field("channel_name", 256),  # E.g.: "hf"
+    LayoutField("time_step_ns", "I"),
+    LayoutField("byte_depth", "B"),
+    # Yes, this is actually a 64-byte integer (not a 64-bit integer). This is by
+    # design since byte depth theoretically goes to 64 (though it's usually only 4).
+    long_int_field("max_amplitude", 64, signed=True),
+)
+
 
 class IhdrChunk(dict[str, SiteHeader]):
     """Used to interpret the subsequent IDAT chunks."""
@@ -35,20 +56,29 @@ class IhdrChunk(dict[str, SiteHeader]):
 
         May raise `IqsError` or one of its derivatives.
         """
-        number_of_sites = read_int(io, 4)
+        return cls._from_records(lambda layout: layout.read(io))
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **_kwargs: Any) -> IhdrChunk:
+        """Deserialize the in-memory data into an IHDR chunk.
+
+        May raise `IqsError` or one of its derivatives.
+        """
+        return cls._from_records(cursor.read_layout)
+
+    @classmethod
+    def _from_records(
+        cls, read_record: Callable[[StructLayout], tuple[Any, ...]]
+    ) -> IhdrChunk:
+        (number_of_sites,) = read_record(_SITE_COUNT)
         sites: dict[str, SiteHeader] = {}
         for _ in range(number_of_sites):
-            site_name = read_terminated_string(io, 256)  # E.g.: "site0"
-            number_of_channels = read_int(io, 4)
+            site_name, number_of_channels = read_record(_SITE)
             site_header: SiteHeader = {}
             for _ in range(number_of_channels):
-                channel_name = read_terminated_string(io, 256)  # E.g.: "hf"
-                time_step_ns = read_int(io, 4)
-                byte_depth = read_int(io, 1)
-                # Yes, this is actually a 64-byte integer (not a 64-bit integer).
-                # This is by design since byte depth theoretically goes to 64
-                # (though it's usually only 4).
-                max_amplitude = read_int(io, 64, signed=True)
+                channel_name, time_step_ns, byte_depth, max_amplitude = read_record(
+                    _CHANNEL
+                )
                 # Add channel header to site header
                 channel_header = IqsChannelHeader(
                     time_step_ns, byte_depth, max_amplitude
@@ -65,23 +95,25 @@ class IhdrChunk(dict[str, SiteHeader]):
 
         May raise `IqsError` or one of its derivatives.
         """
-        write_int(io, len(self), 4)
+        _SITE_COUNT.write(io, len(self))
         for site_name, site in self.items():
-            write_terminated_string(io, site_name, 256)
-            write_int(io, len(site), 4)
+            _SITE.write(io, site_name, len(site))
             for channel_name, channel in site.items():
-                write_terminated_string(io, channel_name, 256)
-                write_int(io, channel.time_step_ns, 4)
-                write_int(io, channel.byte_depth, 1)
-                write_int(io, channel.max_amplitude, 64, signed=True)
+                _CHANNEL.write(
+                    io,
+                    channel_name,
+                    channel.time_step_ns,
+                    channel.byte_depth,
+                    channel.max_amplitude,
+                )
 
     def data_length(self) -> int:
         """Return the byte size of this chunk in serialized form."""
-        # Site names and length
-        result = len(self) * 256 + 4
-        # Channel names, length
-        result += sum(4 + len(site) * (256 + 4 + 1 + 64) for site in self.values())
-        return result
+        return (
+            _SITE_COUNT.size
+            + len(self) * _SITE.size
+            + sum(len(site) for site in self.values()) * _CHANNEL.size
+        )
 
     def with_corrections(self, *, max_amplitude_mode: MaxAmplitudeMode) -> IhdrChunk:
         """Apply corrections to known issues in IQS I/O."""
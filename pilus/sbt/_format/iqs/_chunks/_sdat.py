@@ -5,7 +5,9 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar, Literal
 
 from .....errors import PilusDeserializeError
-from ..._io import read_exactly, read_int, write_exactly, write_int
+from ...._model import RawData
+from ..._io import ByteCursor, read_int, read_view, write_exactly, write_int
+from ._shdr import ShdrChunk
 
 if TYPE_CHECKING:
     from ._idat import IdatChunk
@@ -17,8 +19,31 @@ class SdatChunk:
 
     type_: ClassVar[bytes] = b"SDAT"
 
+    # Byte size of the start of the chunk data that `read_time_span` needs
+    time_span_size: ClassVar[int] = 8
+
     start_time: datetime
-    interleaved_data: bytes
+    interleaved_data: RawData
+
+    @classmethod
+    def read_time_span(cls, cursor: ByteCursor, **kwargs: Any) -> tuple[datetime, int]:
+        """Return the start time and duration (in nanoseconds) of the chunk.
+
+        Only needs the start of the chunk data (see `time_span_size`). We derive
+        the duration from the data length and the time step of the SHDR chunk.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        shdr = kwargs["header"]
+        if not isinstance(shdr, ShdrChunk):
+            raise PilusDeserializeError("Need an SHDR chunk to time an SDAT chunk")
+        data_length = kwargs["data_length"]
+        assert isinstance(data_length, int)
+        timestamp_us = cursor.read_int(8)
+        start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
+        # Four channels (HF and LF, each real and imaginary) of 4-byte samples
+        logical_length = (data_length - 8) // 16
+        return start_time, logical_length * shdr.time_step_ns
 
     @classmethod
     def from_idat(cls, idat: IdatChunk, *, site_to_keep: str) -> SdatChunk:
@@ -64,7 +89,7 @@ class SdatChunk:
         """
         timestamp_us = int(self.start_time.timestamp() * 1e6)
         write_int(io, timestamp_us, 8)
-        write_exactly(io, self.interleaved_data)
+        write_exactly(io, memoryview(self.interleaved_data))
 
     @classmethod
     def from_io(cls, io: BinaryIO, **kwargs: Any) -> SdatChunk:
@@ -76,7 +101,23 @@ class SdatChunk:
         assert isinstance(data_length, int)
         timestamp_us = read_int(io, 8)
         start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
-        interleaved_data = read_exactly(io, data_length - 8)
+        interleaved_data = read_view(io, data_length - 8)
+        return cls(start_time, interleaved_data)
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> SdatChunk:
+        """Deserialize the in-memory data into an SDAT chunk.
+
+        The interleaved data refers directly to the memory behind `cursor`
+        (zero-copy).
+
+        May raise `IqsError` or one of its derivatives.
+        """
+        data_length = kwargs["data_length"]
+        assert isinstance(data_length, int)
+        timestamp_us = cursor.read_int(8)
+        start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
+        interleaved_data = cursor.read_view(data_length - 8)
         return cls(start_time, interleaved_data)
 
     def data_length(self) -> int:
@@ -4,11 +4,16 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar
 
 from .....errors import PilusDeserializeError
-from ..._io import read_int, write_int
+from ..._io import ByteCursor, LayoutField, StructLayout
 
 if TYPE_CHECKING:
     from ._ihdr import IhdrChunk
 
+_LAYOUT = StructLayout(
+    LayoutField("time_step_ns", "I"),
+    LayoutField("max_amplitude", "I"),
+)
+
 
 @dataclass(frozen=True)
 class ShdrChunk:
@@ -45,7 +50,17 @@ class ShdrChunk:
 
         May raise `PilusDeserializeError` or one of its derivatives.
         """
-        return cls(time_step_ns=read_int(io, 4), max_amplitude=read_int(io, 4))
+        time_step_ns, max_amplitude = _LAYOUT.read(io)
+        return cls(time_step_ns=time_step_ns, max_amplitude=max_amplitude)
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **_kwargs: Any) -> ShdrChunk:
+        """Deserialize the in-memory data into an SHDR chunk.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        time_step_ns, max_amplitude = cursor.read_layout(_LAYOUT)
+        return cls(time_step_ns=time_step_ns, max_amplitude=max_amplitude)
 
     def to_io(self, io: BinaryIO) -> None:
         """Serialize this chunk to the IO stream.
@@ -54,9 +69,8 @@ class ShdrChunk:
 
         May raise `PilusSerializeError` or one of its derivatives.
         """
-        write_int(io, self.time_step_ns, 4)
-        write_int(io, self.max_amplitude, 4)
+        _LAYOUT.write(io, self.time_step_ns, self.max_amplitude)
 
     def data_length(self) -> int:
         """Return the byte size of this chunk in serialized form."""
-        return 8
+        return _LAYOUT.size
@@ -0,0 +1,491 @@
+from __future__ import annotations
+
+import lzma
+import sys
+import zlib
+from array import array
+from collections.abc import Callable, Collection, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from io import SEEK_CUR
+from itertools import accumulate, islice, repeat
+from operator import and_, sub
+from typing import Any, BinaryIO, ClassVar, Literal, Protocol
+
+from .....errors import PilusDeserializeError
+from ...._model import IqsChannelData, RawData
+from ..._io import (
+    ByteCursor,
+    LayoutField,
+    StructLayout,
+    read_view,
+    seek,
+    write_buffers,
+)
+from ._idat import IdatChunk
+from ._ihdr import IhdrChunk
+
+# Compression algorithm of the channel data in a zDAT chunk:
+#
+#  * "zlib": Deflate. Fast. Use this as the default.
+#  * "lzma": Slower but compresses better. Use this for archival.
+IqsCompression = Literal["zlib", "lzma"]
+
+_CODEC_IDS: dict[IqsCompression, int] = {"zlib": 0, "lzma": 1}
+_CODECS = {codec_id: codec for codec, codec_id in _CODEC_IDS.items()}
+
+# Comes before the channel data
+_PREFIX = StructLayout(
+    LayoutField("timestamp_us", "Q"),
+    LayoutField("duration_ns", "Q"),
+    LayoutField("codec", "B"),
+)
+# Comes before each (compressed) part of the channel data
+_PART_PREFIX = StructLayout(
+    LayoutField("delta_encoded", "?"),
+    LayoutField("compressed_length", "Q"),
+)
+
+# We decompress the channel data in blocks of (at most) this size.
+BLOCK_SIZE = 1024 * 1024  # 1 MiB
+# We feed the compressed data to the decompressor in slices of (at most) this
+# size. With an output limit, zlib copies all input that it didn't consume yet
+# into `unconsumed_tail` on each call. If we gave it the entire compressed part
+# at once, we would copy said part once per block.
+INPUT_SLICE_SIZE = 64 * 1024  # 64 KiB
+
+# Array type codes for the unsigned integer sizes that `array` supports
+_TYPECODES = {array(typecode).itemsize: typecode for typecode in "QLIHB"}
+
+
+@dataclass(frozen=True)
+class CompressedPart:
+    """Single compressed part (real or imaginary) of the channel data."""
+
+    # If true, we store the difference between consecutive samples. This gives
+    # much better compression for slowly-varying signals.
+    delta_encoded: bool
+    data: RawData
+
+
+@dataclass(frozen=True)
+class CompressedChannelData:
+    """Compressed channel data split into complex parts."""
+
+    re: CompressedPart
+    im: CompressedPart
+
+
+CompressedSiteData = dict[str, CompressedChannelData]
+
+
+class _Compressor(Protocol):
+    def compress(self, data: RawData, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _Decompressor(Protocol):
+    @property
+    def eof(self) -> bool: ...
+
+    def decompress(self, data: RawData, max_length: int = ..., /) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class ZdatChunk:
+    """Compressed LPCM signal data.
+
+    Same content as an IDAT chunk. We delta-encode and compress each part of the
+    channel data separately.
+
+    Note that this is an ancilliary chunk (lowercase first letter). Readers that
+    don't know about zDAT simply skip it.
+    """
+
+    type_: ClassVar[bytes] = b"zDAT"
+
+    start_time: datetime
+    duration_ns: int
+    compression: IqsCompression
+    sites: dict[str, CompressedSiteData]
+
+    # Byte size of the start of the chunk data that `read_time_span` needs
+    time_span_size: ClassVar[int] = _PREFIX.size
+
+    @property
+    def end_time(self) -> datetime:
+        """Return the time that this chunk ends on (not inclusive)."""
+        duration = timedelta(microseconds=self.duration_ns * 1e-3)
+        return self.start_time + duration
+
+    @classmethod
+    def read_time_span(cls, cursor: ByteCursor, **_: Any) -> tuple[datetime, int]:
+        """Return the start time and duration (in nanoseconds) of the chunk.
+
+        Only needs the start of the chunk data (see `time_span_size`).
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        timestamp_us, duration_ns, _codec_id = cursor.read_layout(_PREFIX)
+        start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
+        return start_time, duration_ns
+
+    @classmethod
+    def from_idat(
+        cls, idat: IdatChunk, *, ihdr: IhdrChunk, compression: IqsCompression
+    ) -> ZdatChunk:
+        """Compress the IDAT chunk into a zDAT chunk."""
+        sites: dict[str, CompressedSiteData] = {}
+        for site_name, site_data in idat.sites.items():
+            compressed_site: CompressedSiteData = {}
+            for channel_name, channel in site_data.items():
+                byte_depth = ihdr[site_name][channel_name].byte_depth
+                compressed_site[channel_name] = CompressedChannelData(
+                    _compress(channel.re, byte_depth, compression),
+                    _compress(channel.im, byte_depth, compression),
+                )
+            sites[site_name] = compressed_site
+        return cls(idat.start_time, idat.duration_ns, compression, sites)
+
+    def to_idat(self, *, ihdr: IhdrChunk) -> IdatChunk:
+        """Decompress this chunk into an IDAT chunk."""
+        sites: dict[str, dict[str, IqsChannelData]] = {}
+        for site_name, site_data in self.sites.items():
+            sites[site_name] = {}
+            for channel_name in site_data:
+                byte_length = self.byte_length(ihdr, site_name, channel_name)
+                re = bytearray(byte_length)
+                im = bytearray(byte_length)
+                self.decompress_into(ihdr, site_name, channel_name, re, im)
+                sites[site_name][channel_name] = IqsChannelData(
+                    memoryview(re).toreadonly(), memoryview(im).toreadonly()
+                )
+        return IdatChunk(self.start_time, self.duration_ns, sites)
+
+    def byte_length(self, ihdr: IhdrChunk, site_name: str, channel_name: str) -> int:
+        """Return the decompressed byte size of each part of the given channel."""
+        channel_header = ihdr[site_name][channel_name]
+        if self.duration_ns % channel_header.time_step_ns != 0:
+            raise PilusDeserializeError(
+                "zDAT duration is not a multiple of the IHDR time step"
+            )
+        logical_length = self.duration_ns // channel_header.time_step_ns
+        return logical_length * channel_header.byte_depth
+
+    def decompress_into(
+        self,
+        ihdr: IhdrChunk,
+        site_name: str,
+        channel_name: str,
+        re: memoryview | bytearray,
+        im: memoryview | bytearray,
+    ) -> None:
+        """Decompress the given channel directly into the `re` and `im` buffers.
+
+        We decompress block-by-block. This way, we never hold the entire
+        decompressed channel data in a temporary buffer.
+
+        If a destination buffer is shorter than the decompressed data, we simply
+        stop once it is full.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        byte_depth = ihdr[site_name][channel_name].byte_depth
+        channel = self.sites[site_name][channel_name]
+        for part, destination in ((channel.re, re), (channel.im, im)):
+            _decompress_into(
+                part,
+                memoryview(destination).cast("B"),
+                byte_depth=byte_depth,
+                compression=self.compression,
+            )
+
+    @classmethod
+    def from_io(cls, io: BinaryIO, **kwargs: Any) -> ZdatChunk:
+        """Deserialize the IO stream into a zDAT chunk.
+
+        Give `channels` as (site name, channel name) pairs to only read the
+        (compressed) data of said channels. We seek past the rest.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        ihdr = kwargs["header"]
+        if not isinstance(ihdr, IhdrChunk):
+            raise PilusDeserializeError("Need an IHDR chunk to read a zDAT chunk")
+        timestamp_us, duration_ns, codec_id = _PREFIX.read(io)
+
+        def read_part(*, keep: bool) -> CompressedPart | None:
+            delta_encoded, compressed_length = _PART_PREFIX.read(io)
+            if not keep:
+                seek(io, compressed_length, SEEK_CUR)
+                return None
+            return CompressedPart(delta_encoded, read_view(io, compressed_length))
+
+        return cls._from_parts(
+            read_part,
+            ihdr=ihdr,
+            timestamp_us=timestamp_us,
+            duration_ns=duration_ns,
+            codec_id=codec_id,
+            channels=kwargs.get("channels"),
+        )
+
+    @classmethod
+    def from_cursor(cls, cursor: ByteCursor, **kwargs: Any) -> ZdatChunk:
+        """Deserialize the in-memory data into a zDAT chunk.
+
+        The compressed data refers directly to the memory behind `cursor`
+        (zero-copy).
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        ihdr = kwargs["header"]
+        if not isinstance(ihdr, IhdrChunk):
+            raise PilusDeserializeError("Need an IHDR chunk to read a zDAT chunk")
+        timestamp_us, duration_ns, codec_id = cursor.read_layout(_PREFIX)
+
+        def read_part(*, keep: bool) -> CompressedPart | None:
+            delta_encoded, compressed_length = cursor.read_layout(_PART_PREFIX)
+            if not keep:
+                cursor.skip(compressed_length)
+                return None
+            return CompressedPart(delta_encoded, cursor.read_view(compressed_length))
+
+        return cls._from_parts(
+            read_part,
+            ihdr=ihdr,
+            timestamp_us=timestamp_us,
+            duration_ns=duration_ns,
+            codec_id=codec_id,
+            channels=kwargs.get("channels"),
+        )
+
+    @classmethod
+    def _from_parts(  # noqa: PLR0913
+        cls,
+        read_part: Callable[..., CompressedPart | None],
+        *,
+        ihdr: IhdrChunk,
+        timestamp_us: int,
+        duration_ns: int,
+        codec_id: int,
+        channels: Collection[tuple[str, str]] | None,
+    ) -> ZdatChunk:
+        try:
+            compression = _CODECS[codec_id]
+        except KeyError as exc:
+            raise PilusDeserializeError(
+                f"Unknown zDAT compression codec: {codec_id}"
+            ) from exc
+        sites: dict[str, CompressedSiteData] = {}
+        for site_name, site_header in ihdr.items():
+            site_data: CompressedSiteData = {}
+            for channel_name in site_header:
+                keep = channels is None or (site_name, channel_name) in channels
+                re = read_part(keep=keep)
+                im = read_part(keep=keep)
+                if re is None or im is None:
+                    continue
+                site_data[channel_name] = CompressedChannelData(re, im)
+            # Only leave out the sites that the `channels` filter empties
+            if site_data or channels is None:
+                sites[site_name] = site_data
+        start_time = datetime.fromtimestamp(timestamp_us * 1e-6, tz=UTC)
+        return cls(start_time, duration_ns, compression, sites)
+
+    def to_io(self, io: BinaryIO) -> None:
+        """Serialize this chunk into the IO stream.
+
+        This only returns the "data" and not the "length", "type", or "CRC".
+
+        May raise `PilusSerializeError` or one of its derivatives.
+        """
+        timestamp_us = int(self.start_time.timestamp() * 1e6)
+        _PREFIX.write(io, timestamp_us, self.duration_ns, _CODEC_IDS[self.compression])
+        buffers: list[RawData] = []
+        for part in self._parts():
+            buffers.append(_PART_PREFIX.pack(part.delta_encoded, len(part.data)))
+            buffers.append(part.data)
+        write_buffers(io, buffers)
+
+    def data_length(self) -> int:
+        """Return the byte size of this chunk in serialized form."""
+        return _PREFIX.size + sum(
+            _PART_PREFIX.size + len(part.data) for part in self._parts()
+        )
+
+    def _parts(self) -> Iterator[CompressedPart]:
+        for site in self.sites.values():
+            for channel in site.values():
+                yield channel.re
+                yield channel.im
+
+
+def _compress(
+    data: RawData, byte_depth: int, compression: IqsCompression
+) -> CompressedPart:
+    typecode = _TYPECODES.get(byte_depth)
+    # We only delta-encode the integer sizes that `array` supports natively
+    delta_encoded = typecode is not None
+    compressor: _Compressor
+    match compression:
+        case "zlib":
+            compressor = zlib.compressobj()
+        case "lzma":
+            compressor = lzma.LZMACompressor()
+    chunks: list[bytes] = []
+    view = memoryview(data).cast("B")
+    # Block size that is a multiple of the sample size
+    block_size = BLOCK_SIZE - BLOCK_SIZE % byte_depth
+    previous = 0
+    for start in range(0, len(view), block_size):
+        block: RawData = view[start : start + block_size]
+        if typecode is not None:
+            block, previous = _delta_encode(block, typecode, previous)
+        chunks.append(compressor.compress(block))
+    chunks.append(compressor.flush())
+    return CompressedPart(delta_encoded, b"".join(chunks))
+
+
+def _decompress_into(
+    part: CompressedPart,
+    destination: memoryview,
+    *,
+    byte_depth: int,
+    compression: IqsCompression,
+) -> None:
+    decompressor: _Decompressor
+    match compression:
+        case "zlib":
+            decompressor = zlib.decompressobj()
+        case "lzma":
+            decompressor = lzma.LZMADecompressor()
+    typecode = _TYPECODES.get(byte_depth) if part.delta_encoded else None
+    if part.delta_encoded and typecode is None:
+        raise PilusDeserializeError(
+            f"Can not delta-decode samples of {byte_depth} bytes"
+        )
+    # Block size that is a multiple of the sample size
+    block_size = BLOCK_SIZE - BLOCK_SIZE % byte_depth
+    previous = 0
+    try:
+        for block in _decompress_blocks(
+            decompressor,
+            memoryview(part.data).cast("B"),
+            destination,
+            block_size=block_size,
+        ):
+            if typecode is not None:
+                previous = _delta_decode_into(block, typecode, previous)
+    except (zlib.error, lzma.LZMAError) as exc:
+        raise PilusDeserializeError(
+            f'Could not decompress channel data: "{exc}"'
+        ) from exc
+
+
+def _decompress_blocks(
+    decompressor: _Decompressor,
+    source: memoryview,
+    destination: memoryview,
+    *,
+    block_size: int,
+) -> Iterator[memoryview]:
+    """Decompress straight into the destination. Yield each block once it's full.
+
+    We feed `source` to the decompressor in slices (see `INPUT_SLICE_SIZE`).
+
+    May raise `PilusDeserializeError` if the decompressed data is too short.
+    """
+    # Position of the next input slice within `source`
+    position = 0
+    # Input that the decompressor handed back to us (zlib only)
+    pending: RawData = b""
+    offset = 0
+    while offset < len(destination):
+        block_start = offset
+        block_end = min(offset + block_size, len(destination))
+        # Note that lzma keeps any unused input internally. We only give it more
+        # once it asks for it (`needs_input`). Until then, we pass `b""` to get
+        # the rest of its output.
+        while offset < block_end and not decompressor.eof:
+            if (
+                not pending
+                and position < len(source)
+                and getattr(decompressor, "needs_input", True)
+            ):
+                pending = source[position : position + INPUT_SLICE_SIZE]
+                position += len(pending)
+            decompressed = decompressor.decompress(pending, block_end - offset)
+            pending = getattr(decompressor, "unconsumed_tail", b"")
+            destination[offset : offset + len(decompressed)] = decompressed
+            offset += len(decompressed)
+            # Early out if there is nothing more to get
+            if not decompressed and not pending and position == len(source):
+                break
+        if offset != block_end:
+            raise PilusDeserializeError(
+                "Compressed channel data is shorter than expected"
+            )
+        yield destination[block_start:block_end]
+
+
+def _delta_encode(data: RawData, typecode: str, previous: int) -> tuple[bytes, int]:
+    """Return the differences between consecutive samples (modulo the sample size).
+
+    Use `previous` to carry the last sample over from the previous block.
+    """
+    samples = _to_array(data, typecode)
+    if not samples:
+        return b"", previous
+    mask = (1 << (8 * samples.itemsize)) - 1
+    deltas = array(
+        typecode, map(and_, map(sub, samples, _shift(samples, previous)), repeat(mask))
+    )
+    return _to_bytes(deltas), samples[-1]
+
+
+def _delta_decode_into(samples: memoryview, typecode: str, previous: int) -> int:
+    """Reverse `_delta_encode` in place. Returns the last sample.
+
+    Use `previous` to carry the last sample over from the previous block.
+    """
+    if not samples:
+        return previous
+    # Fast path: Reinterpret the little-endian bytes as native integers
+    if sys.byteorder == "little":
+        view = samples.cast(typecode)  # type: ignore[call-overload]
+        view[:] = _running_sum(view, typecode, previous)
+        return int(view[-1])
+    decoded = _running_sum(_to_array(samples, typecode), typecode, previous)
+    last = decoded[-1]
+    samples[:] = _to_bytes(decoded)
+    return last
+
+
+def _running_sum(deltas: Iterable[int], typecode: str, previous: int) -> array[int]:
+    """Return the sums of the deltas (modulo the sample size) after `previous`."""
+    mask = (1 << (8 * array(typecode).itemsize)) - 1
+    # Skip `previous` itself
+    sums = islice(accumulate(deltas, initial=previous), 1, None)
+    return array(typecode, map(and_, sums, repeat(mask)))
+
+
+def _shift(samples: array[int], previous: int) -> Iterator[int]:
+    yield previous
+    yield from samples
+
+
+def _to_array(data: RawData, typecode: str) -> array[int]:
+    result = array(typecode)
+    result.frombytes(data)
+    # The samples are little-endian in the file
+    if sys.byteorder != "little":
+        result.byteswap()
+    return result
+
+
+def _to_bytes(samples: array[int]) -> bytes:
+    if sys.byteorder != "little":
+        samples.byteswap()
+    return samples.tobytes()
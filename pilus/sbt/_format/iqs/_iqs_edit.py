@@ -0,0 +1,227 @@
+from collections.abc import Callable, Mapping, Sequence
+from datetime import timedelta
+from io import SEEK_SET
+from typing import BinaryIO, get_args
+
+from ...._magic.signatures import IQS_SIGNATURE
+from ....errors import PilusDeserializeError
+from .._chunk import (
+    ChunkIndexEntry,
+    ReadableChunk,
+    UnidentifiedAncilliaryChunk,
+    read_chunk_at,
+    require_single_chunk,
+    scan_chunks,
+    stream_chunks,
+    write_chunk,
+)
+from .._io import copy_exactly, read_and_validate_signature, seek, write_signature
+from ._chunks import HeaderChunk, IdatChunk, IhdrChunk, ZdatChunk
+from ._iqs_window import IqsTimeBound, scan_data_in_window
+
+# Types of the chunks that `_read_data_chunk` supports
+_DATA_TYPES = frozenset((IdatChunk.type_, ZdatChunk.type_))
+
+
+def concat_io(
+    inputs: Sequence[BinaryIO],
+    output: BinaryIO,
+    *,
+    contiguous_tolerance: timedelta | None = None,
+) -> None:
+    """Concatenate the IQS recordings into a single recording.
+
+    All recordings must have the same IHDR chunk and each recording must start
+    where the previous one ended (see `IdatChunk.raise_if_not_contiguous`). We
+    only read the first and last data chunk of each recording to check the
+    latter. We copy all other chunks byte-for-byte (no decoding and no new
+    CRCs). If both sides are files, the kernel does the copy.
+
+    This requires seekable input streams.
+
+    May raise:
+      * `PilusDeserializeError` or one of its derivatives.
+      * `PilusSerializeError` or one of its derivatives.
+      * `ValueError` if there are no inputs.
+    """
+    if not inputs:
+        raise ValueError("Need at least one IQS recording to concatenate")
+    recordings = [_scan_recording(io) for io in inputs]
+    # Validate everything before we write anything
+    first_ihdr = recordings[0][0]
+    previous_chunk: IdatChunk | ZdatChunk | None = None
+    for io, (ihdr, _, entries) in zip(inputs, recordings, strict=True):
+        if ihdr != first_ihdr:
+            raise PilusDeserializeError("The IQS recordings have different headers")
+        data_entries = [entry for entry in entries if entry.type_ in _DATA_TYPES]
+        # Skip recordings without data
+        if not data_entries:
+            continue
+        first_chunk = _read_data_chunk(io, data_entries[0], ihdr=ihdr)
+        if previous_chunk is not None:
+            IdatChunk.raise_if_not_contiguous(
+                previous_chunk, first_chunk, tolerance=contiguous_tolerance
+            )
+        previous_chunk = _read_data_chunk(io, data_entries[-1], ihdr=ihdr)
+    # Signature and header of the first recording. Then the remaining chunks of
+    # each recording in turn.
+    write_signature(output, IQS_SIGNATURE)
+    _copy_chunk(inputs[0], output, recordings[0][1])
+    for io, (_, _, entries) in zip(inputs, recordings, strict=True):
+        # Early out if there is nothing to copy
+        if not entries:
+            continue
+        # The chunks are back-to-back so we copy them all at once
+        copy_exactly(
+            io,
+            output,
+            offset=entries[0].offset,
+            size=entries[-1].end_offset - entries[0].offset,
+        )
+
+
+def crop_io(
+    input_io: BinaryIO,
+    output_io: BinaryIO,
+    *,
+    start: IqsTimeBound | None = None,
+    end: IqsTimeBound | None = None,
+) -> None:
+    """Write the part of the IQS recording within the given time window.
+
+    See `from_io` for the meaning of `start` and `end`. We copy the data chunks
+    within the window byte-for-byte. We only decode (and crop) the chunks at the
+    edges of the window. Note that we write the cropped part of a zDAT chunk as an
+    (uncompressed) IDAT chunk. We drop all ancillary chunks.
+
+    This requires a seekable input stream.
+
+    May raise:
+      * `PilusDeserializeError` or one of its derivatives.
+      * `PilusSerializeError` or one of its derivatives.
+      * `ValueError` if the window is invalid (see `TimeWindow.resolve`).
+    """
+    ihdr, header_entry, _ = _scan_recording(input_io)
+    seek(input_io, header_entry.end_offset, SEEK_SET)
+    entries, window = scan_data_in_window(input_io, header=ihdr, start=start, end=end)
+    write_signature(output_io, IQS_SIGNATURE)
+    _copy_chunk(input_io, output_io, header_entry)
+    for index, entry in enumerate(entries):
+        # Only the chunks at the edges of the window may stick out of it
+        if window is None or 0 < index < len(entries) - 1:
+            _copy_chunk(input_io, output_io, entry)
+            continue
+        chunk = _read_data_chunk(input_io, entry, ihdr=ihdr)
+        cropped = window.crop(chunk, ihdr=ihdr)
+        if cropped is chunk:
+            _copy_chunk(input_io, output_io, entry)
+        else:
+            write_chunk(output_io, cropped)
+
+
+def split_io(
+    input_io: BinaryIO,
+    outputs: Mapping[str, BinaryIO] | Callable[[str], BinaryIO],
+) -> None:
+    """Write the data of each site into its own IQS recording.
+
+    `outputs` maps site names to output streams. We drop the sites that aren't in
+    `outputs`. Alternatively, give a function that returns the output stream for
+    a site name. Then we call it for every site of the header.
+
+    The data of all sites shares the same data chunks. Therefore, we have to
+    write new data chunks (and CRCs). We never decode the channel data, though.
+    Compressed (zDAT) data stays compressed. We drop all ancillary chunks.
+
+    May raise:
+      * `PilusDeserializeError` or one of its derivatives.
+      * `PilusSerializeError` or one of its derivatives.
+    """
+    read_and_validate_signature(input_io, IQS_SIGNATURE)
+    ihdr = _require_ihdr(
+        require_single_chunk(input_io, chunk_models=get_args(HeaderChunk))
+    )
+    if callable(outputs):
+        outputs = {site_name: outputs(site_name) for site_name in ihdr}
+    for site_name in outputs:
+        if site_name not in ihdr:
+            raise PilusDeserializeError(f'No such site: "{site_name}"')
+    for site_name, output in outputs.items():
+        write_signature(output, IQS_SIGNATURE)
+        write_chunk(output, IhdrChunk({site_name: ihdr[site_name]}))
+    # We seek past the data of the sites that we drop
+    channels = frozenset(
+        (site_name, channel_name)
+        for site_name in outputs
+        for channel_name in ihdr[site_name]
+    )
+    for chunk in stream_chunks(
+        input_io, chunk_models=(IdatChunk, ZdatChunk), header=ihdr, channels=channels
+    ):
+        for site_name, output in outputs.items():
+            site_chunk: IdatChunk | ZdatChunk
+            if isinstance(chunk, ZdatChunk):
+                site_chunk = ZdatChunk(
+                    chunk.start_time,
+                    chunk.duration_ns,
+                    chunk.compression,
+                    {site_name: chunk.sites[site_name]},
+                )
+            else:
+                assert isinstance(chunk, IdatChunk)
+                site_chunk = IdatChunk(
+                    chunk.start_time,
+                    chunk.duration_ns,
+                    {site_name: chunk.sites[site_name]},
+                )
+            write_chunk(output, site_chunk)
+
+
+def _scan_recording(
+    io: BinaryIO,
+) -> tuple[IhdrChunk, ChunkIndexEntry, tuple[ChunkIndexEntry, ...]]:
+    """Return the IHDR chunk, its index entry, and the entries of all other chunks.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    read_and_validate_signature(io, IQS_SIGNATURE)
+    entries = scan_chunks(io).entries
+    if not entries:
+        raise PilusDeserializeError("Could not find the IHDR chunk")
+    header_entry = entries[0]
+    header = read_chunk_at(io, header_entry, chunk_models=get_args(HeaderChunk))
+    return _require_ihdr(header), header_entry, entries[1:]
+
+
+def _require_ihdr(header: ReadableChunk | UnidentifiedAncilliaryChunk) -> IhdrChunk:
+    """Return the IHDR chunk.
+
+    May raise `PilusDeserializeError` if it's not an IHDR chunk.
+    """
+    if not isinstance(header, IhdrChunk):
+        raise PilusDeserializeError(
+            "Requires version 2.0.0 of the IQS specification (see `upgrade_io`)"
+        )
+    return header
+
+
+def _read_data_chunk(
+    io: BinaryIO, entry: ChunkIndexEntry, *, ihdr: IhdrChunk
+) -> IdatChunk | ZdatChunk:
+    """Read the IDAT or zDAT chunk that the index entry refers to.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    chunk = read_chunk_at(io, entry, chunk_models=(IdatChunk, ZdatChunk), header=ihdr)
+    if not isinstance(chunk, IdatChunk | ZdatChunk):
+        raise PilusDeserializeError(f"Expected a data chunk at offset {entry.offset}")
+    return chunk
+
+
+def _copy_chunk(
+    source: BinaryIO, destination: BinaryIO, entry: ChunkIndexEntry
+) -> None:
+    """Copy the chunk (length, type, data, and CRC) byte-for-byte."""
+    copy_exactly(
+        source, destination, offset=entry.offset, size=entry.end_offset - entry.offset
+    )
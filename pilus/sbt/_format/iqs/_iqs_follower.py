@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import cast, get_args
+
+from ...._magic.signatures import IQS_SIGNATURE
+from ..._model import IqsAggregate
+from .._chunk import ChunkFollower, CrcPolicy
+from ._chunks import DataChunk, HeaderChunk, MaxAmplitudeMode
+from ._iqs_from_io import _merge_chunks
+
+
+class IqsFollower:
+    """Follow an IQS file that is still being written.
+
+    Use this for, e.g., live dashboards. Each call to `poll` only parses the data
+    that arrived since the previous call.
+    """
+
+    def __init__(
+        self,
+        file: Path,
+        *,
+        version_1_0_0_site_name: str | None = None,
+        contiguous_tolerance: timedelta | None = None,
+        max_amplitude_mode: MaxAmplitudeMode | None = None,
+        verify_crc: CrcPolicy | None = None,
+    ) -> None:
+        # Default arguments
+        if version_1_0_0_site_name is None:
+            version_1_0_0_site_name = "site0"
+        if max_amplitude_mode is None:
+            max_amplitude_mode = "from-header-with-corrections"
+        self._version_1_0_0_site_name = version_1_0_0_site_name
+        self._contiguous_tolerance = contiguous_tolerance
+        self._max_amplitude_mode: MaxAmplitudeMode = max_amplitude_mode
+        self._follower = ChunkFollower(
+            file,
+            signature=IQS_SIGNATURE,
+            verify_crc=verify_crc,
+        )
+        self._header: HeaderChunk | None = None
+
+    @property
+    def offset(self) -> int:
+        """Return the position right after the last complete chunk."""
+        return self._follower.offset
+
+    def poll(self) -> IqsAggregate | None:
+        """Return the data that arrived since the previous call.
+
+        Returns `None` if there is no new data.
+
+        May raise `PilusDeserializeError` or one of its derivatives.
+        """
+        # Read header (it must come first)
+        if self._header is None:
+            headers = self._follower.poll(chunk_models=get_args(HeaderChunk), limit=1)
+            if not headers:
+                return None
+            self._header = cast(HeaderChunk, headers[0])
+        # Read data
+        data = cast(
+            list[DataChunk],
+            self._follower.poll(chunk_models=get_args(DataChunk), header=self._header),
+        )
+        if not data:
+            return None
+        return _merge_chunks(
+            self._header,
+            data,
+            version_1_0_0_site_name=self._version_1_0_0_site_name,
+            contiguous_tolerance=self._contiguous_tolerance,
+            max_amplitude_mode=self._max_amplitude_mode,
+        )
@@ -1,30 +1,73 @@
+import os
+from collections.abc import Collection, Iterator, Sequence
+from concurrent.futures import Executor
+from dataclasses import replace
 from datetime import timedelta
+from pathlib import Path
 from typing import Annotated, BinaryIO, cast, get_args
 
 from ...._magic.signatures import IQS_SIGNATURE
 from ....errors import PilusDeserializeError
 from ....forge import FORGE
-from ..._model import IqsAggregate, IqsAggregateChannel, IqsAggregateSite
-from .._chunk import require_single_chunk, stream_chunks
-from .._io import read_and_validate_signature
+from ..._model import (
+    IqsAggregate,
+    IqsAggregateChannel,
+    IqsAggregateSite,
+    IqsChannelData,
+    LazyRawData,
+    RawData,
+)
+from .._chunk import (
+    RANGES_PER_WORKER,
+    ChunkIndexEntry,
+    CrcPolicy,
+    CrcVerifier,
+    borrow_or_create_pool,
+    file_behind,
+    read_chunk_at,
+    read_chunks_from_file,
+    require_single_chunk,
+    require_single_chunk_async,
+    scan_chunks,
+    split_into_ranges,
+    stream_chunks,
+    stream_chunks_async,
+)
+from .._io import (
+    AsyncByteSource,
+    map_io,
+    read_and_validate_signature,
+    read_and_validate_signature_async,
+)
 from ._chunks import (
     DataChunk,
     HeaderChunk,
     IdatChunk,
     IhdrChunk,
     MaxAmplitudeMode,
-    SdatChunk,
     ShdrChunk,
+    SiteData,
+    ZdatChunk,
 )
+from ._iqs_window import IqsTimeBound, TimeWindow, scan_data_in_window
 
 
 @FORGE.register_deserializer
-def from_io(
+def from_io(  # noqa: PLR0913
     io: Annotated[BinaryIO, "application/vnd.sbt.iqs"],
     *,
     version_1_0_0_site_name: str | None = None,
     contiguous_tolerance: timedelta | None = None,
     max_amplitude_mode: MaxAmplitudeMode | None = None,
+    memory_map: bool = False,
+    verify_crc: CrcPolicy | None = None,
+    workers: int | None = None,
+    executor: Executor | None = None,
+    lazy: bool = False,
+    start: IqsTimeBound | None = None,
+    end: IqsTimeBound | None = None,
+    sites: Collection[str] | None = None,
+    channels: Collection[str] | None = None,
 ) -> IqsAggregate:
     """Deserialize IO stream into an IQS aggregate.
 
@@ -35,12 +78,60 @@ def from_io(
 
     Merges all data chunks (IDAT or SDAT) into a single chunk. This way, all the
     raw binary data is contiguous.
+
+    If `memory_map` is true, we memory-map the file behind `io` and deserialize
+    directly from the mapped pages. This way, we avoid intermediate copies of the
+    chunk data.
+
+    See `CrcPolicy` for the options of `verify_crc`. Defaults to "strict".
+
+    If `workers` is more than one, we decode the data chunks on a pool of that many
+    processes. This requires a file behind `io`. The workers import the
+    `__main__` module. Therefore, guard the entry point of your script with
+    `if __name__ == "__main__":` (see `process_pool`).
+
+    Give `executor` to decode the data chunks on said executor instead (e.g., to
+    reuse a single process pool across many files). You own the executor. We
+    don't shut it down. In this case, `workers` is the number of pieces (times
+    `RANGES_PER_WORKER`) that we split the work into. Defaults to the number of
+    CPUs.
+
+    If `lazy` is true, we memory-map the file behind `io` and only read the chunk
+    headers up front. The channel data of the returned aggregate are `LazyRawData`
+    proxies. We merge (and read) the data of a channel on first access. This way,
+    you only pay for the channels that you actually use. Lazy loading can't verify
+    the CRCs (it would have to read the entire file). Therefore, `verify_crc`
+    must be "skip" (the default in this case). Lazy loading doesn't work with
+    `workers` or `executor`.
+
+    Give `start` and/or `end` to only read the data within that time window (end
+    not inclusive). Each is either a timezone-aware `datetime` or an offset in
+    nanoseconds from the start of the recording. We only read the timestamps of
+    the data chunks outside the window and skip the rest of them. We crop the
+    chunks at the edges of the window to the nearest sample boundaries (rounding
+    outwards). This requires a seekable IO stream.
+
+    Give `sites` and/or `channels` (names) to only read the data of said sites
+    and channels. The IHDR chunk tells us the byte length of each channel up
+    front. Hence, we seek past the data of all other channels within each data
+    chunk (this requires a seekable IO stream). The returned aggregate only
+    contains the selected channels. Version 1.0.0 data is interleaved, so we
+    only drop the other channels after we read it.
     """
     # Default arguments
     if version_1_0_0_site_name is None:
         version_1_0_0_site_name = "site0"
     if max_amplitude_mode is None:
         max_amplitude_mode = "from-header-with-corrections"
+    if workers is None:
+        workers = 1 if executor is None else os.cpu_count() or 1
+    parallel = workers > 1 or executor is not None
+    if lazy:
+        _raise_if_not_lazy_compatible(verify_crc=verify_crc, parallel=parallel)
+        memory_map = True
+        verify_crc = "skip"
+    if memory_map and not parallel:
+        io = cast(BinaryIO, map_io(io))
     # Signature
     read_and_validate_signature(io, IQS_SIGNATURE)
     # Read header (it must come first).
@@ -49,30 +140,465 @@ def from_io(
     # in the subsequent iterations. We use it internally to deserialize
     # the data chunk(s).
     header = cast(
-        HeaderChunk, require_single_chunk(io, chunk_models=get_args(HeaderChunk))
+        HeaderChunk,
+        require_single_chunk(
+            io, chunk_models=get_args(HeaderChunk), verify_crc=verify_crc
+        ),
+    )
+    # The (site name, channel name) pairs to read. `None` means all of them.
+    selected_channels = _select_channels(
+        _ensure_ihdr(header, site_name=version_1_0_0_site_name),
+        sites=sites,
+        channels=channels,
+    )
+    # Find the data chunks within the time window (if any)
+    entries: Sequence[ChunkIndexEntry] | None = None
+    window: TimeWindow | None = None
+    if start is not None or end is not None:
+        entries, window = scan_data_in_window(io, header=header, start=start, end=end)
+    # Read data
+    data = _read_data(
+        io,
+        entries,
+        header=header,
+        workers=workers,
+        executor=executor,
+        version_1_0_0_site_name=version_1_0_0_site_name,
+        verify_crc=verify_crc,
+        channels=selected_channels,
+    )
+    return _merge_chunks(
+        header,
+        data,
+        version_1_0_0_site_name=version_1_0_0_site_name,
+        contiguous_tolerance=contiguous_tolerance,
+        max_amplitude_mode=max_amplitude_mode,
+        lazy=lazy,
+        window=window,
+        channels=selected_channels,
+    )
+
+
+@FORGE.register_deserializer
+def from_version_1_0_0_io(
+    io: Annotated[BinaryIO, "application/vnd.sbt.iqs;version=1.0.0"],
+) -> IqsAggregate:
+    """Deserialize IO stream (version 1.0.0) into an IQS aggregate.
+
+    We detect the version from the first chunk (see `detect_media_type`). This
+    deserializer simply forwards to `from_io` that handles both versions.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    return from_io(io)
+
+
+async def from_stream(
+    source: AsyncByteSource,
+    *,
+    version_1_0_0_site_name: str | None = None,
+    contiguous_tolerance: timedelta | None = None,
+    max_amplitude_mode: MaxAmplitudeMode | None = None,
+    verify_crc: CrcPolicy | None = None,
+) -> IqsAggregate:
+    """Deserialize asynchronous byte source into an IQS aggregate.
+
+    Use this for, e.g., data that streams in over a socket or pipe. We parse each
+    chunk as soon as we received all of it.
+
+    Otherwise, this is the same as `from_io`.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if version_1_0_0_site_name is None:
+        version_1_0_0_site_name = "site0"
+    if max_amplitude_mode is None:
+        max_amplitude_mode = "from-header-with-corrections"
+    # Signature
+    await read_and_validate_signature_async(source, IQS_SIGNATURE)
+    # Read header (it must come first). See `from_io` for details.
+    header = cast(
+        HeaderChunk,
+        await require_single_chunk_async(
+            source, chunk_models=get_args(HeaderChunk), verify_crc=verify_crc
+        ),
     )
     # Read data
     data = cast(
         list[DataChunk],
-        list(stream_chunks(io, chunk_models=get_args(DataChunk), header=header)),
+        [
+            chunk
+            async for chunk in stream_chunks_async(
+                source,
+                chunk_models=get_args(DataChunk),
+                verify_crc=verify_crc,
+                header=header,
+            )
+        ],
+    )
+    return _merge_chunks(
+        header,
+        data,
+        version_1_0_0_site_name=version_1_0_0_site_name,
+        contiguous_tolerance=contiguous_tolerance,
+        max_amplitude_mode=max_amplitude_mode,
+    )
+
+
+def _select_channels(
+    ihdr: IhdrChunk,
+    *,
+    sites: Collection[str] | None,
+    channels: Collection[str] | None,
+) -> frozenset[tuple[str, str]] | None:
+    """Return the (site name, channel name) pairs that match the given names.
+
+    Returns `None` if there is nothing to select (i.e., we read all channels).
+
+    May raise `PilusDeserializeError` if a given site or channel doesn't exist.
+    """
+    # Early out if there is nothing to select
+    if sites is None and channels is None:
+        return None
+    for site_name in sites or ():
+        if site_name not in ihdr:
+            raise PilusDeserializeError(f'No such site: "{site_name}"')
+    all_channel_names = {
+        channel_name for site_header in ihdr.values() for channel_name in site_header
+    }
+    for channel_name in channels or ():
+        if channel_name not in all_channel_names:
+            raise PilusDeserializeError(f'No such channel: "{channel_name}"')
+    selected = frozenset(
+        (site_name, channel_name)
+        for site_name, site_header in ihdr.items()
+        if sites is None or site_name in sites
+        for channel_name in site_header
+        if channels is None or channel_name in channels
+    )
+    if not selected:
+        raise PilusDeserializeError("None of the given sites has any of the channels")
+    return selected
+
+
+def _read_data(  # noqa: PLR0913
+    io: BinaryIO,
+    entries: Sequence[ChunkIndexEntry] | None,
+    *,
+    header: HeaderChunk,
+    workers: int,
+    executor: Executor | None,
+    version_1_0_0_site_name: str,
+    verify_crc: CrcPolicy | None,
+    channels: frozenset[tuple[str, str]] | None,
+) -> list[DataChunk]:
+    """Read the data chunks that the index entries refer to.
+
+    Reads all remaining data chunks if `entries` is `None`.
+
+    We decode on a process pool (or `executor`) if `workers` is more than one or
+    if we got an `executor`.
+
+    May raise:
+      * `ValueError` if there is no file behind `io` (only for parallel decoding)
+      * `PilusDeserializeError` or one of its derivatives
+    """
+    if workers > 1 or executor is not None:
+        if entries is None:
+            entries = scan_chunks(io).entries
+        return list(
+            _read_data_in_parallel(
+                io,
+                entries,
+                header=header,
+                workers=workers,
+                executor=executor,
+                version_1_0_0_site_name=version_1_0_0_site_name,
+                verify_crc=verify_crc,
+                channels=channels,
+            )
+        )
+    if entries is not None:
+        return _read_data_at(
+            io, entries, header=header, verify_crc=verify_crc, channels=channels
+        )
+    return cast(
+        list[DataChunk],
+        list(
+            stream_chunks(
+                io,
+                chunk_models=get_args(DataChunk),
+                verify_crc=verify_crc,
+                header=header,
+                channels=channels,
+            )
+        ),
+    )
+
+
+def _read_data_at(
+    io: BinaryIO,
+    entries: Sequence[ChunkIndexEntry],
+    *,
+    header: HeaderChunk,
+    verify_crc: CrcPolicy | None,
+    channels: frozenset[tuple[str, str]] | None,
+) -> list[DataChunk]:
+    """Read the data chunks that the index entries refer to.
+
+    May raise `PilusDeserializeError` or one of its derivatives.
+    """
+    # Default arguments
+    if verify_crc is None:
+        verify_crc = "strict"
+    with CrcVerifier(verify_crc) as crc_verifier:
+        return [
+            cast(
+                DataChunk,
+                read_chunk_at(
+                    io,
+                    entry,
+                    chunk_models=get_args(DataChunk),
+                    crc_verifier=crc_verifier,
+                    header=header,
+                    channels=channels,
+                ),
+            )
+            for entry in entries
+        ]
+
+
+def _read_data_in_parallel(  # noqa: PLR0913
+    io: BinaryIO,
+    entries: Sequence[ChunkIndexEntry],
+    *,
+    header: HeaderChunk,
+    workers: int,
+    executor: Executor | None,
+    version_1_0_0_site_name: str,
+    verify_crc: CrcPolicy | None,
+    channels: frozenset[tuple[str, str]] | None,
+) -> Iterator[IdatChunk]:
+    """Decode the chunks that the index entries refer to on a process pool.
+
+    Uses `executor` if given. Otherwise, we create a pool of `workers` processes.
+
+    Each worker decodes (and verifies) a contiguous range of data chunks. We yield
+    the resulting IDAT chunks in file order.
+
+    May raise:
+      * `ValueError` if there is no file behind `io`
+      * `PilusDeserializeError` or one of its derivatives
+    """
+    file = file_behind(io)
+    ranges = split_into_ranges(entries, workers * RANGES_PER_WORKER)
+    with borrow_or_create_pool(executor, workers) as pool:
+        futures = [
+            pool.submit(
+                _decode_data_range,
+                file,
+                entries,
+                header=header,
+                version_1_0_0_site_name=version_1_0_0_site_name,
+                verify_crc=verify_crc,
+                channels=channels,
+            )
+            for entries in ranges
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def _decode_data_range(  # noqa: PLR0913
+    file: Path,
+    entries: Sequence[ChunkIndexEntry],
+    *,
+    header: HeaderChunk,
+    version_1_0_0_site_name: str,
+    verify_crc: CrcPolicy | None,
+    channels: frozenset[tuple[str, str]] | None,
+) -> list[IdatChunk]:
+    """Decode the data chunks that the index entries refer to.
+
+    This runs in a worker process. We copy the channel data out of the
+    memory-mapped file so that we can send the chunks back to the parent process.
+    """
+    data = cast(
+        list[DataChunk],
+        read_chunks_from_file(
+            file,
+            entries,
+            chunk_models=get_args(DataChunk),
+            verify_crc=verify_crc,
+            header=header,
+            channels=channels,
+        ),
+    )
+    ihdr = _ensure_ihdr(header, site_name=version_1_0_0_site_name)
+    chunks = (
+        _ensure_v2_data(chunk, site_name=version_1_0_0_site_name, header=header)
+        for chunk in data
+    )
+    # We might as well decompress in the worker process
+    idats = (
+        chunk.to_idat(ihdr=ihdr) if isinstance(chunk, ZdatChunk) else chunk
+        for chunk in chunks
     )
+    return [
+        replace(
+            idat,
+            sites={
+                site_name: {
+                    channel_name: IqsChannelData(bytes(channel.re), bytes(channel.im))
+                    for channel_name, channel in site.items()
+                }
+                for site_name, site in idat.sites.items()
+            },
+        )
+        for idat in idats
+    ]
+
+
+def _raise_if_not_lazy_compatible(
+    *, verify_crc: CrcPolicy | None, parallel: bool
+) -> None:
+    if verify_crc not in (None, "skip"):
+        raise ValueError(
+            'Lazy loading can\'t verify CRCs. Use `verify_crc="skip"` or leave it out.'
+        )
+    if parallel:
+        raise ValueError("Lazy loading doesn't work with `workers` or `executor`")
+
+
+def _merge_chunks(  # noqa: PLR0913
+    header: HeaderChunk,
+    data: list[DataChunk],
+    *,
+    version_1_0_0_site_name: str,
+    contiguous_tolerance: timedelta | None,
+    max_amplitude_mode: MaxAmplitudeMode,
+    lazy: bool = False,
+    window: TimeWindow | None = None,
+    channels: frozenset[tuple[str, str]] | None = None,
+) -> IqsAggregate:
+    """Convert and merge the header and data chunks into an IQS aggregate.
+
+    If `lazy` is true, we defer the merge of each channel until first access.
+
+    If given, we crop the data to the `window` and only keep the `channels`.
+    """
     if not data:
         raise PilusDeserializeError("No data chunks.")
-    # Convert everything to the version 2.0.0 chunk types (IHDR and IDAT)
+    # Convert everything to the version 2.0.0 chunk types (IHDR and IDAT/zDAT)
     ihdr = _ensure_ihdr(header, site_name=version_1_0_0_site_name)
     # Corrections due to, e.g., rounding issues during serilization
     ihdr = ihdr.with_corrections(max_amplitude_mode=max_amplitude_mode)
-    idats = (
-        _ensure_idat(chunk, site_name=version_1_0_0_site_name, header=header)
+    idats = [
+        _ensure_v2_data(chunk, site_name=version_1_0_0_site_name, header=header)
         for chunk in data
-    )
-    # Merge all data together
+    ]
+    if window is not None:
+        idats = [window.crop(chunk, ihdr=ihdr) for chunk in idats]
+    if lazy:
+        lazy_idat = _merge_lazily(
+            idats,
+            ihdr=ihdr,
+            contiguous_tolerance=contiguous_tolerance,
+            channels=channels,
+        )
+        return _chunks_to_aggregate(ihdr, lazy_idat)
+    # Merge all data together. This also decompresses any zDAT chunks.
     merged_idat = IdatChunk.merge_all(
-        *idats, ihdr=ihdr, contiguous_tolerance=contiguous_tolerance
+        *idats,
+        ihdr=ihdr,
+        contiguous_tolerance=contiguous_tolerance,
+        channels=channels,
     )
     return _chunks_to_aggregate(ihdr, merged_idat)
 
 
+def _merge_lazily(
+    chunks: list[IdatChunk | ZdatChunk],
+    *,
+    ihdr: IhdrChunk,
+    contiguous_tolerance: timedelta | None,
+    channels: frozenset[tuple[str, str]] | None,
+) -> IdatChunk:
+    """Return IDAT chunk with `LazyRawData` proxies for the merged channel data.
+
+    We check the timing (and compute the merged duration) right away. This is
+    cheap. We defer the actual merge until first access.
+    """
+    IdatChunk.raise_if_not_contiguous(*chunks, tolerance=contiguous_tolerance)
+    duration_ns = IdatChunk.merged_duration_ns(*chunks, ihdr=ihdr)
+    gaps = IdatChunk.find_gaps(*chunks)
+    first_chunk = chunks[0]
+    sites: dict[str, SiteData] = {}
+    for site_name, site_data in first_chunk.sites.items():
+        lazy_site: SiteData = {}
+        for channel_name in site_data:
+            # Version 1.0.0 data contains all channels
+            if channels is not None and (site_name, channel_name) not in channels:
+                continue
+            channel_header = ihdr[site_name][channel_name]
+            byte_length = (
+                duration_ns // channel_header.time_step_ns * channel_header.byte_depth
+            )
+            merge = _ChannelMerge(
+                chunks,
+                ihdr=ihdr,
+                site_name=site_name,
+                channel_name=channel_name,
+                contiguous_tolerance=contiguous_tolerance,
+            )
+            lazy_site[channel_name] = IqsChannelData(
+                LazyRawData(byte_length, merge.re), LazyRawData(byte_length, merge.im)
+            )
+        # Only leave out the sites that the `channels` filter empties
+        if lazy_site or channels is None:
+            sites[site_name] = lazy_site
+    return IdatChunk(first_chunk.start_time, duration_ns, sites, gaps)
+
+
+class _ChannelMerge:
+    """Merge the data of a single channel on first access."""
+
+    def __init__(
+        self,
+        chunks: list[IdatChunk | ZdatChunk],
+        *,
+        ihdr: IhdrChunk,
+        site_name: str,
+        channel_name: str,
+        contiguous_tolerance: timedelta | None,
+    ) -> None:
+        self._chunks = chunks
+        self._ihdr = ihdr
+        self._site_name = site_name
+        self._channel_name = channel_name
+        self._contiguous_tolerance = contiguous_tolerance
+        self._merged: IqsChannelData | None = None
+
+    def re(self) -> RawData:
+        return self._merge().re
+
+    def im(self) -> RawData:
+        return self._merge().im
+
+    def _merge(self) -> IqsChannelData:
+        # We merge both parts (re and im) at once. Usually, you need both anyhow.
+        if self._merged is None:
+            merged_idat = IdatChunk.merge_all(
+                *self._chunks,
+                ihdr=self._ihdr,
+                contiguous_tolerance=self._contiguous_tolerance,
+                channels={(self._site_name, self._channel_name)},
+            )
+            self._merged = merged_idat.sites[self._site_name][self._channel_name]
+        return self._merged
+
+
 def _chunks_to_aggregate(ihdr: IhdrChunk, idat: IdatChunk) -> IqsAggregate:
     """Construct an aggregate from the given IHDR and (merged) IDAT chunks.
 
@@ -94,7 +620,10 @@ def _chunks_to_aggregate(ihdr: IhdrChunk, idat: IdatChunk) -> IqsAggregate:
             aggregate_site[channel_name] = aggregate_channel
         aggregate_sites[site_name] = aggregate_site
     return IqsAggregate(
-        start_time=idat.start_time, duration_ns=idat.duration_ns, sites=aggregate_sites
+        start_time=idat.start_time,
+        duration_ns=idat.duration_ns,
+        sites=aggregate_sites,
+        gap_map=idat.gaps,
     )
 
 
@@ -105,11 +634,11 @@ def _ensure_ihdr(header: HeaderChunk, *, site_name: str) -> IhdrChunk:
     return IhdrChunk.from_shdr(header, site_name=site_name)
 
 
-def _ensure_idat(
-    chunk: SdatChunk | IdatChunk, site_name: str, header: HeaderChunk | None
-) -> IdatChunk:
-    # Early out if we already got an IDAT chunk
-    if isinstance(chunk, IdatChunk):
+def _ensure_v2_data(
+    chunk: DataChunk, site_name: str, header: HeaderChunk | None
+) -> IdatChunk | ZdatChunk:
+    # Early out if we already got an IDAT or zDAT chunk
+    if isinstance(chunk, IdatChunk | ZdatChunk):
         return chunk
     # Convert SDAT to IDAT
     if not isinstance(header, ShdrChunk):
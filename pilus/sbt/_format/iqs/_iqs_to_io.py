@@ -1,11 +1,9 @@
 from typing import BinaryIO
 
-from ...._magic.signatures import IQS_SIGNATURE
 from ..._model import IqsAggregate, IqsChannelData, IqsChannelHeader
-from .._chunk import write_chunk
-from .._io import write_signature
-from ._chunks import IdatChunk, IhdrChunk, SdatChunk, ShdrChunk, SiteData, SiteHeader
+from ._chunks import IhdrChunk, IqsCompression, SiteData, SiteHeader
 from ._iqs_globals import IqsVersion
+from ._iqs_writer import IqsWriter
 
 
 def to_io(
@@ -14,39 +12,42 @@ def to_io(
     *,
     version: IqsVersion = IqsVersion.V2_0_0,
     site_to_keep: str | None = None,
+    compression: IqsCompression | None = None,
 ) -> None:
     """Serialize IQS aggregate to the IO stream.
 
+    We write all the data as a single data chunk. Use `IqsWriter` to write the
+    data incrementally instead.
+
+    If you give a `compression`, we write the data as a compressed zDAT chunk
+    instead of an IDAT chunk. This requires version 2.0.0 of the IQS
+    specification. Note that readers that don't know about zDAT won't find any
+    data in the resulting file.
+
+    Before compression, we delta-encode the samples. This runs per sample in pure
+    Python: Roughly 0.2 µs per sample to encode and 0.1 µs per sample to decode
+    (i.e., seconds per channel with tens of millions of samples). This outweighs
+    the cost of zlib itself by far.
+
     May raise:
       * `PilusSerializeError` or one of its derivatives.
       * `RuntimeError` if the platform doesn't natively support 4-byte integers.
       * `ValueError` if the function arguments are not compatible.
     """
-    write_signature(io, IQS_SIGNATURE)
-    ihdr, idat = _aggregate_to_chunks(aggregate)
-    match version:
-        case IqsVersion.V2_0_0:
-            write_chunk(io, ihdr)
-            write_chunk(io, idat)
-        case IqsVersion.V1_0_0:
-            if site_to_keep is None:
-                raise ValueError(
-                    "You must specify `site_to_keep` when you target "
-                    "version 1.0.0 of the IQS specification."
-                )
-            write_chunk(io, ShdrChunk.from_ihdr(ihdr, site_to_keep=site_to_keep))
-            write_chunk(io, SdatChunk.from_idat(idat, site_to_keep=site_to_keep))
-        case _:
-            raise ValueError(f"Unsupported IQS version: {version}")
-
-
-def _aggregate_to_chunks(aggregate: IqsAggregate) -> tuple[IhdrChunk, IdatChunk]:
-    """Convert aggregate into an IHDR and an IDAT chunk."""
-    return (_aggregate_to_ihdr(aggregate), _aggregate_to_idat(aggregate))
+    writer = IqsWriter(
+        io,
+        header=_aggregate_to_ihdr(aggregate),
+        start_time=aggregate.start_time,
+        version=version,
+        site_to_keep=site_to_keep,
+        compression=compression,
+    )
+    # The aggregate knows its duration. Even if it has no channels at all.
+    writer.append(_aggregate_to_sites(aggregate), duration_ns=aggregate.duration_ns)
 
 
-def _aggregate_to_idat(aggregate: IqsAggregate) -> IdatChunk:
-    """Return the data-specific parts of the aggregate as an IDAT chunk."""
+def _aggregate_to_sites(aggregate: IqsAggregate) -> dict[str, SiteData]:
+    """Return the data-specific parts of the aggregate."""
     idat_sites: dict[str, SiteData] = {}
     for site_name, site in aggregate.sites.items():
         idat_site: SiteData = {}
@@ -54,7 +55,7 @@ def _aggregate_to_idat(aggregate: IqsAggregate) -> IdatChunk:
             idat_channel = IqsChannelData(channel.re, channel.im)
             idat_site[channel_name] = idat_channel
         idat_sites[site_name] = idat_site
-    return IdatChunk(aggregate.start_time, aggregate.duration_ns, idat_sites)
+    return idat_sites
 
 
 def _aggregate_to_ihdr(aggregate: IqsAggregate) -> IhdrChunk:
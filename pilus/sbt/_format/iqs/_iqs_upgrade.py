@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import Annotated, BinaryIO, get_args
+
+from ...._magic.signatures import IQS_SIGNATURE
+from ....errors import PilusDeserializeError
+from ....forge import FORGE
+from .._chunk import CrcPolicy, require_single_chunk, stream_chunks, write_chunk
+from .._io import read_and_validate_signature, write_signature
+from ._chunks import HeaderChunk, IdatChunk, IhdrChunk, SdatChunk, ShdrChunk
+
+
+@FORGE.register_converter
+def upgrade_io(
+    input_io: Annotated[BinaryIO, "application/vnd.sbt.iqs;version=1.0.0"],
+    output_io: Annotated[BinaryIO, "application/vnd.sbt.iqs"],
+    *,
+    site_name: str | None = None,
+    verify_crc: CrcPolicy | None = None,
+) -> None:
+    """Convert IQS data from version 1.0.0 to version 2.0.0 of the specification.
+
+    We convert chunk by chunk: The SHDR chunk into an IHDR chunk and each SDAT
+    chunk into an IDAT chunk. We never merge the data chunks. Moreover, we
+    de-interleave the data into a single buffer that we reuse for all chunks.
+    This way, memory use depends on the largest SDAT chunk and not on the length
+    of the recording. The data chunks keep their timestamps (gaps and all).
+
+    The IHDR chunk has a single site (`site_name`) with the "hf" and "lf"
+    channels. Defaults to "site0" (as in `from_io`).
+
+    See `CrcPolicy` for the options of `verify_crc`. Defaults to "strict".
+
+    May raise:
+      * `PilusDeserializeError` or one of its derivatives.
+      * `PilusSerializeError` or one of its derivatives.
+      * `RuntimeError` if the platform doesn't natively support 4-byte integers.
+    """
+    # Default arguments
+    if site_name is None:
+        site_name = "site0"
+    read_and_validate_signature(input_io, IQS_SIGNATURE)
+    header = require_single_chunk(
+        input_io, chunk_models=get_args(HeaderChunk), verify_crc=verify_crc
+    )
+    if isinstance(header, IhdrChunk):
+        raise PilusDeserializeError("The IQS data is already version 2.0.0")
+    assert isinstance(header, ShdrChunk)
+    write_signature(output_io, IQS_SIGNATURE)
+    write_chunk(output_io, IhdrChunk.from_shdr(header, site_name=site_name))
+    buffer = bytearray()
+    for sdat in stream_chunks(
+        input_io, chunk_models=(SdatChunk,), verify_crc=verify_crc, header=header
+    ):
+        assert isinstance(sdat, SdatChunk)
+        # Grow the buffer as needed. Note that we replace it (instead of resizing
+        # it in place). The previous IDAT chunk may still refer to it.
+        if len(buffer) < len(sdat.interleaved_data):
+            buffer = bytearray(len(sdat.interleaved_data))
+        idat = IdatChunk.from_sdat(
+            sdat,
+            site_name=site_name,
+            time_step_ns=header.time_step_ns,
+            buffer=buffer,
+        )
+        write_chunk(output_io, idat)
+
+
+@FORGE.register_converter
+def upgrade_file(
+    input_file: Annotated[Path, "application/vnd.sbt.iqs;version=1.0.0"],
+    output_file: Annotated[Path, "application/vnd.sbt.iqs"],
+) -> None:
+    """Convert IQS file from version 1.0.0 to version 2.0.0 of the specification.
+
+    See `upgrade_io` for details.
+
+    May raise:
+      * `OSError` if we can't open either file.
+      * `PilusDeserializeError` or one of its derivatives.
+      * `PilusSerializeError` or one of its derivatives.
+      * `RuntimeError` if the platform doesn't natively support 4-byte integers.
+    """
+    with input_file.open("rb") as input_io, output_file.open("wb") as output_io:
+        upgrade_io(input_io, output_io)
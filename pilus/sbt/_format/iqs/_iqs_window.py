@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import BinaryIO
+
+from .._chunk import ChunkIndexEntry, iter_chunk_entries, peek_chunk_data
+from .._io import ByteCursor
+from ._chunks import HeaderChunk, IdatChunk, IhdrChunk, SdatChunk, ZdatChunk
+
+# Start or end of a time window. Either an absolute (timezone-aware) time or an
+# offset in nanoseconds from the start of the recording.
+IqsTimeBound = datetime | int
+
+_DATA_CHUNK_MODELS: dict[bytes, type[IdatChunk | SdatChunk | ZdatChunk]] = {
+    model.type_: model for model in (IdatChunk, SdatChunk, ZdatChunk)
+}
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Time span to read from an IQS file. `None` means unbounded."""
+
+    start: datetime | None
+    end: datetime | None
+
+    @classmethod
+    def resolve(
+        cls,
+        start: IqsTimeBound | None,
+        end: IqsTimeBound | None,
+        *,
+        recording_start: datetime,
+    ) -> TimeWindow:
+        """Convert the given bounds into absolute times.
+
+        We interpret integer bounds as nanoseconds since `recording_start`.
+
+        May raise `ValueError` if a bound is a naive datetime or if the window is
+        empty.
+        """
+        window = cls(
+            _resolve_bound(start, recording_start=recording_start),
+            _resolve_bound(end, recording_start=recording_start),
+        )
+        if (
+            window.start is not None
+            and window.end is not None
+            and window.end <= window.start
+        ):
+            raise ValueError("The end of the time window must come after its start")
+        return window
+
+    def overlaps(self, start_time: datetime, end_time: datetime) -> bool:
+        """Return true if the given time span overlaps this window."""
+        if self.start is not None and end_time <= self.start:
+            return False
+        return self.end is None or start_time < self.end
+
+    def crop(
+        self, chunk: IdatChunk | ZdatChunk, *, ihdr: IhdrChunk
+    ) -> IdatChunk | ZdatChunk:
+        """Return the part of the data chunk within this window.
+
+        Chunks that lie entirely within the window pass through as-is. We
+        decompress zDAT chunks that we need to crop.
+        """
+        # Early out if the chunk is within the window
+        if (self.start is None or self.start <= chunk.start_time) and (
+            self.end is None or chunk.end_time <= self.end
+        ):
+            return chunk
+        if isinstance(chunk, ZdatChunk):
+            chunk = chunk.to_idat(ihdr=ihdr)
+        return chunk.crop(ihdr=ihdr, start_time=self.start, end_time=self.end)
+
+
+def scan_data_in_window(
+    io: BinaryIO,
+    *,
+    header: HeaderChunk,
+    start: IqsTimeBound | None,
+    end: IqsTimeBound | None,
+) -> tuple[list[ChunkIndexEntry], TimeWindow | None]:
+    """Find the data chunks that overlap the given time window.
+
+    We only read the first few bytes (start time and duration) of each data chunk.
+    We seek past the rest. Moreover, we stop at the first chunk that starts after
+    the window. This way, the cost is proportional to the window and not to the
+    file.
+
+    Returns the index entries of the overlapping chunks and the resolved window.
+    The window is `None` if there are no data chunks at all.
+
+    May raise:
+      * `ValueError` if the window is invalid (see `TimeWindow.resolve`)
+      * `PilusDeserializeError` or one of its derivatives
+    """
+    entries: list[ChunkIndexEntry] = []
+    window: TimeWindow | None = None
+    for entry in iter_chunk_entries(io):
+        model = _DATA_CHUNK_MODELS.get(entry.type_)
+        # Skip everything but data chunks
+        if model is None:
+            continue
+        prefix = peek_chunk_data(io, entry, model.time_span_size)
+        start_time, duration_ns = model.read_time_span(
+            ByteCursor(prefix), header=header, data_length=entry.data_length
+        )
+        # The first data chunk marks the start of the recording
+        if window is None:
+            window = TimeWindow.resolve(start, end, recording_start=start_time)
+        # The chunks are in chronological order. Hence, there is nothing more to
+        # find once we are past the window.
+        if window.end is not None and start_time >= window.end:
+            break
+        end_time = start_time + timedelta(microseconds=duration_ns * 1e-3)
+        if window.overlaps(start_time, end_time):
+            entries.append(entry)
+    return entries, window
+
+
+def _resolve_bound(
+    bound: IqsTimeBound | None, *, recording_start: datetime
+) -> datetime | None:
+    if bound is None:
+        return None
+    if isinstance(bound, datetime):
+        if bound.tzinfo is None:
+            raise ValueError("Time bounds must be timezone-aware")
+        return bound
+    return recording_start + timedelta(microseconds=bound * 1e-3)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import BinaryIO
+
+from ...._magic.signatures import IQS_SIGNATURE
+from ..._model import IqsChannelData, IqsChannelHeader
+from .._chunk import WritableChunk, write_chunk
+from .._io import write_signature
+from ._chunks import (
+    IdatChunk,
+    IhdrChunk,
+    IqsCompression,
+    SdatChunk,
+    ShdrChunk,
+    SiteData,
+    ZdatChunk,
+)
+from ._iqs_globals import IqsVersion
+
+
+class IqsWriter:
+    """Write IQS data incrementally (append-only).
+
+    We write the signature and header chunk right away. Each call to `append`
+    writes a single data chunk. This way, you only ever need a single block of
+    samples in memory. E.g., for acquisition or simulation tools that produce
+    hours of signal.
+
+    We don't close `io`. That's up to you.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        io: BinaryIO,
+        *,
+        header: Mapping[str, Mapping[str, IqsChannelHeader]],
+        start_time: datetime,
+        version: IqsVersion = IqsVersion.V2_0_0,
+        site_to_keep: str | None = None,
+        compression: IqsCompression | None = None,
+    ) -> None:
+        """Write the signature and header chunk to the IO stream.
+
+        If you give a `compression`, we write compressed zDAT chunks instead of
+        IDAT chunks (see `to_io`). For version 1.0.0, you must give the
+        `site_to_keep`. We write SDAT chunks with the data of said site.
+
+        May raise:
+          * `PilusSerializeError` or one of its derivatives.
+          * `ValueError` if the function arguments are not compatible.
+        """
+        _raise_if_incompatible(
+            version, site_to_keep=site_to_keep, compression=compression
+        )
+        self._io = io
+        # Strip any data (e.g., if you pass the sites of an `IqsAggregate`)
+        self._ihdr = IhdrChunk(
+            {
+                site_name: {
+                    channel_name: IqsChannelHeader(
+                        channel.time_step_ns, channel.byte_depth, channel.max_amplitude
+                    )
+                    for channel_name, channel in site.items()
+                }
+                for site_name, site in header.items()
+            }
+        )
+        self._start_time = start_time
+        self._version = version
+        self._site_to_keep = site_to_keep
+        self._compression = compression
+        self._duration_ns = 0
+        write_signature(io, IQS_SIGNATURE)
+        if version == IqsVersion.V1_0_0:
+            assert site_to_keep is not None
+            write_chunk(io, ShdrChunk.from_ihdr(self._ihdr, site_to_keep=site_to_keep))
+        else:
+            write_chunk(io, self._ihdr)
+
+    @property
+    def start_time(self) -> datetime:
+        """Return the start time of the first data chunk."""
+        return self._start_time
+
+    @property
+    def duration_ns(self) -> int:
+        """Return the total duration of all data appended so far."""
+        return self._duration_ns
+
+    @property
+    def end_time(self) -> datetime:
+        """Return the start time of the next data chunk."""
+        duration = timedelta(microseconds=self._duration_ns * 1e-3)
+        return self._start_time + duration
+
+    def append(
+        self,
+        sites: Mapping[str, Mapping[str, IqsChannelData]],
+        *,
+        duration_ns: int | None = None,
+    ) -> None:
+        """Write a block of samples as a single data chunk.
+
+        Give the raw channel data of each site and channel of the header. All
+        channels must cover the same time span. The block starts right where the
+        previous block ended.
+
+        Give `duration_ns` to set the time span of the block explicitly. E.g.,
+        for a header without any channels. Defaults to the time span of the
+        channels. If there are channels, `duration_ns` must be within one time
+        step of said span (e.g., to account for a partial last sample).
+
+        May raise:
+          * `PilusSerializeError` or one of its derivatives.
+          * `RuntimeError` if the platform doesn't natively support 4-byte integers.
+          * `ValueError` if the block doesn't match the header.
+        """
+        self._raise_if_incompatible_block(sites)
+        # Default arguments
+        if duration_ns is None:
+            duration_ns = self._block_duration_ns(sites)
+        else:
+            self._raise_if_incompatible_duration(sites, duration_ns)
+        # Follow the order of the header. This is the order that readers expect.
+        idat_sites: dict[str, SiteData] = {
+            site_name: {
+                channel_name: sites[site_name][channel_name]
+                for channel_name in site_header
+            }
+            for site_name, site_header in self._ihdr.items()
+        }
+        idat = IdatChunk(self.end_time, duration_ns, idat_sites)
+        chunk: WritableChunk
+        if self._version == IqsVersion.V1_0_0:
+            assert self._site_to_keep is not None
+            chunk = SdatChunk.from_idat(idat, site_to_keep=self._site_to_keep)
+        elif self._compression is not None:
+            chunk = ZdatChunk.from_idat(
+                idat, ihdr=self._ihdr, compression=self._compression
+            )
+        else:
+            chunk = idat
+        write_chunk(self._io, chunk)
+        self._duration_ns += duration_ns
+
+    def _raise_if_incompatible_block(
+        self, sites: Mapping[str, Mapping[str, IqsChannelData]]
+    ) -> None:
+        """Raise `ValueError` if the block doesn't match the header."""
+        if sites.keys() != self._ihdr.keys():
+            raise ValueError("The block must contain exactly the sites of the header")
+        for site_name, site_header in self._ihdr.items():
+            site = sites[site_name]
+            if site.keys() != site_header.keys():
+                raise ValueError(
+                    f'The block must contain exactly the channels of site "{site_name}"'
+                )
+            for channel_name, channel_header in site_header.items():
+                if len(site[channel_name].re) % channel_header.byte_depth != 0:
+                    raise ValueError(
+                        f'The data of channel "{site_name}/{channel_name}" is not a '
+                        "whole number of samples"
+                    )
+
+    def _block_duration_ns(
+        self, sites: Mapping[str, Mapping[str, IqsChannelData]]
+    ) -> int:
+        """Return the time span of the block.
+
+        May raise `ValueError` if the channels cover different time spans or if
+        there are no channels at all.
+        """
+        durations_ns = {
+            len(sites[site_name][channel_name].re)
+            // channel_header.byte_depth
+            * channel_header.time_step_ns
+            for site_name, site_header in self._ihdr.items()
+            for channel_name, channel_header in site_header.items()
+        }
+        if not durations_ns:
+            raise ValueError("Give `duration_ns` for a block without channels")
+        if len(durations_ns) != 1:
+            raise ValueError("All channels must cover the same time span")
+        return durations_ns.pop()
+
+    def _raise_if_incompatible_duration(
+        self, sites: Mapping[str, Mapping[str, IqsChannelData]], duration_ns: int
+    ) -> None:
+        """Raise if the explicit duration doesn't match the channel data.
+
+        Any duration goes for a header without channels.
+
+        May raise `ValueError` if the duration is off by more than one time step.
+        """
+        time_steps_ns = [
+            channel_header.time_step_ns
+            for site_header in self._ihdr.values()
+            for channel_header in site_header.values()
+        ]
+        # Early out if there is no channel data to compare with
+        if not time_steps_ns:
+            return
+        if abs(duration_ns - self._block_duration_ns(sites)) > max(time_steps_ns):
+            raise ValueError(
+                "The duration must be within one time step of the channel data"
+            )
+
+
+def _raise_if_incompatible(
+    version: IqsVersion,
+    *,
+    site_to_keep: str | None,
+    compression: IqsCompression | None,
+) -> None:
+    """Raise a `ValueError` if the function arguments are not compatible."""
+    match version:
+        case IqsVersion.V2_0_0:
+            pass
+        case IqsVersion.V1_0_0:
+            if compression is not None:
+                raise ValueError(
+                    "Compression requires version 2.0.0 of the IQS specification."
+                )
+            if site_to_keep is None:
+                raise ValueError(
+                    "You must specify `site_to_keep` when you target "
+                    "version 1.0.0 of the IQS specification."
+                )
+        case _:
+            raise ValueError(f"Unsupported IQS version: {version}")
@@ -10,5 +10,10 @@ from ._iqs_aggregate import IqsAggregateChannel as IqsAggregateChannel
 from ._iqs_aggregate import IqsAggregateSite as IqsAggregateSite
 from ._iqs_aggregate import IqsChannelData as IqsChannelData
 from ._iqs_aggregate import IqsChannelHeader as IqsChannelHeader
+from ._iqs_aggregate import IqsGap as IqsGap
+from ._iqs_aggregate import RawData as RawData
+from ._lazy_raw_data import LazyRawData as LazyRawData
 from ._transition_fit import FitComplex as FitComplex
 from ._transition_fit import TransitionFit as TransitionFit
+from ._transition_fit_columns import FitComplexColumns as FitComplexColumns
+from ._transition_fit_columns import TransitionFitColumns as TransitionFitColumns
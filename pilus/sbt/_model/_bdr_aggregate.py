@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from typing import Any
 
 from ...forge import ForgeIO
 from ._transition_fit import FitComplex, TransitionFit
+from ._transition_fit_columns import FitComplexColumns
 
-TransitionFitChannel = tuple[FitComplex, ...]
+# E.g., a tuple of `FitComplex` objects or (more compact) `FitComplexColumns`
+TransitionFitChannel = Sequence[FitComplex]
 
 
 @dataclass(frozen=True)
@@ -21,17 +23,30 @@ class BdrAggregateChannel:
     def __post_init__(self) -> None:
         if self.time_start > self.time_end:
             raise ValueError("Start time must come before end time")
-        if not _is_sorted(self.transition_fits_re) or not _is_sorted(
-            self.transition_fits_im
-        ):
+        if isinstance(self.transition_fits, FitComplexColumns):
+            # `TransitionFit` compares by center. Therefore, we can check the
+            # center columns directly (without any `TransitionFit` objects).
+            is_sorted = _is_sorted(self.transition_fits.re.center) and _is_sorted(
+                self.transition_fits.im.center
+            )
+        else:
+            is_sorted = _is_sorted(self.transition_fits_re) and _is_sorted(
+                self.transition_fits_im
+            )
+        if not is_sorted:
             raise ValueError("Transition fits must be sorted")
 
     @property
     def transition_fits_re(self) -> Iterable[TransitionFit]:
+        # Skip the `FitComplex` objects altogether if we got columns
+        if isinstance(self.transition_fits, FitComplexColumns):
+            return self.transition_fits.re
         return (fit.re for fit in self.transition_fits)
 
     @property
     def transition_fits_im(self) -> Iterable[TransitionFit]:
+        if isinstance(self.transition_fits, FitComplexColumns):
+            return self.transition_fits.im
         return (fit.im for fit in self.transition_fits)
 
 
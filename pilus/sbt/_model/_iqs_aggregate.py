@@ -2,8 +2,20 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING, Any
 
 from ...forge import ForgeIO
+from ._lazy_raw_data import LazyRawData
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import DTypeLike, NDArray
+
+    from ...numpy import SampleArray
+
+# Raw binary data. Either in its own `bytes` object, as a view into some larger
+# buffer (e.g., a memory-mapped file), or as a proxy that we load on first access.
+RawData = bytes | memoryview | LazyRawData
 
 
 @dataclass(frozen=True)
@@ -15,12 +27,29 @@ class IqsChannelHeader:
     max_amplitude: int
 
 
+@dataclass(frozen=True)
+class IqsGap:
+    """Time span without any data (e.g., due to a jump in the system clock).
+
+    Offsets in nanoseconds from the start of the recording (end not inclusive).
+    """
+
+    start_ns: int
+    end_ns: int
+
+    def samples(self, time_step_ns: int) -> range:
+        """Return the range of sample indices of a channel with the given time step."""
+        return range(
+            round(self.start_ns / time_step_ns), round(self.end_ns / time_step_ns)
+        )
+
+
 @dataclass(frozen=True)
 class IqsChannelData:
     """Raw binary channel data split into complex parts."""
 
-    re: bytes
-    im: bytes
+    re: RawData
+    im: RawData
 
     def __post_init__(self) -> None:
         if len(self.re) != len(self.im):
@@ -29,7 +58,38 @@ class IqsChannelData:
 
 @dataclass(frozen=True)
 class IqsAggregateChannel(IqsChannelData, IqsChannelHeader):
-    """Aggregation of header and data chunks for a single channel."""
+    """Aggregation of header and data chunks for a single channel.
+
+    The `*_numpy` accessors require NumPy. We only import it on first use.
+    """
+
+    def to_numpy(self) -> tuple[SampleArray, SampleArray]:
+        """Return the real and imaginary parts as zero-copy NumPy arrays."""
+        from ...numpy import iqs_channel_arrays  # noqa: PLC0415
+
+        return iqs_channel_arrays(self)
+
+    def to_scaled_numpy(
+        self, *, dtype: DTypeLike | None = None
+    ) -> tuple[NDArray[np.floating[Any]], NDArray[np.floating[Any]]]:
+        """Return the real and imaginary parts normalized by the max amplitude.
+
+        Defaults to `float32`.
+        """
+        from ...numpy import iqs_channel_scaled  # noqa: PLC0415
+
+        return iqs_channel_scaled(self, dtype=dtype)
+
+    def to_complex_numpy(
+        self, *, dtype: DTypeLike | None = None
+    ) -> NDArray[np.complexfloating[Any, Any]]:
+        """Return the channel as a complex array normalized by the max amplitude.
+
+        Defaults to `complex64`.
+        """
+        from ...numpy import iqs_channel_complex  # noqa: PLC0415
+
+        return iqs_channel_complex(self, dtype=dtype)
 
 
 IqsAggregateSite = dict[str, IqsAggregateChannel]
@@ -42,3 +102,18 @@ class IqsAggregate(ForgeIO):
     start_time: datetime
     duration_ns: int
     sites: dict[str, IqsAggregateSite]
+    # Time spans without data. The channel data is dense regardless: We fill the
+    # gaps with zeros (or a fill value of your choice).
+    gap_map: tuple[IqsGap, ...] = ()
+
+    def gaps(self, site_name: str, channel_name: str) -> tuple[range, ...]:
+        """Return the ranges of sample indices of the given channel without data.
+
+        May raise `KeyError` if there is no such site or channel.
+        """
+        channel = self.sites[site_name][channel_name]
+        return tuple(
+            samples
+            for gap in self.gap_map
+            if (samples := gap.samples(channel.time_step_ns))
+        )
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Buffer, Callable, Iterator
+from typing import overload
+
+
+class LazyRawData:
+    """Raw binary data that we only load on first access.
+
+    Behaves like a read-only `bytes` object. E.g., it supports `len`, iteration,
+    indexing, slicing, comparison, and the buffer protocol (`memoryview`, `bytes`,
+    etc.).
+
+    We know the length up front. Hence, `len` doesn't load the data.
+    """
+
+    def __init__(self, byte_length: int, load: Callable[[], Buffer]) -> None:
+        self._byte_length = byte_length
+        self._load = load
+        self._view: memoryview | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Return true if we already loaded the data."""
+        return self._view is not None
+
+    def view(self) -> memoryview:
+        """Return (read-only) view of the data. Loads the data if necessary.
+
+        May raise:
+          * `ValueError` if the loaded data doesn't have the expected length.
+          * Whatever the loader itself raises (e.g., `PilusOSError`).
+        """
+        if self._view is None:
+            view = memoryview(self._load()).cast("B").toreadonly()
+            if len(view) != self._byte_length:
+                raise ValueError(
+                    f"Expected {self._byte_length} bytes of data but loaded "
+                    f"{len(view)} bytes"
+                )
+            self._view = view
+        return self._view
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.view().__buffer__(flags)
+
+    def __bytes__(self) -> bytes:
+        return self.view().tobytes()
+
+    def __len__(self) -> int:
+        return self._byte_length
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.view())
+
+    @overload
+    def __getitem__(self, key: int) -> int: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> memoryview: ...
+
+    def __getitem__(self, key: int | slice) -> int | memoryview:
+        return self.view()[key]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LazyRawData | bytes | bytearray | memoryview):
+            return NotImplemented
+        # Early out if the lengths differ. This way, we don't load anything.
+        if len(self) != len(other):
+            return False
+        return self.view() == memoryview(other).cast("B")
+
+    # Mutable in the sense that we load the data on first access. Like
+    # `memoryview`, we don't support hashing.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<{type(self).__name__} of {self._byte_length} bytes ({state})>"
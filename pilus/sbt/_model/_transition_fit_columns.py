@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, overload
+
+from ._transition_fit import FitComplex, TransitionFit
+
+# Same order as the fields of `TransitionFit`
+_FIELD_NAMES = tuple(field.name for field in fields(TransitionFit))
+_FIELD_VALUES = attrgetter(*_FIELD_NAMES)
+# Array type codes. Same as the tRAN chunk: Doubles and 4-byte unsigned integers.
+_TYPE_CODES = tuple(
+    "I" if name in ("iterations", "origin") else "d" for name in _FIELD_NAMES
+)
+
+
+@dataclass(frozen=True, eq=False)
+class TransitionFitColumns(Sequence[TransitionFit]):
+    """Transition fits stored as one contiguous array per field (struct of arrays).
+
+    This takes 96 bytes per fit. We only create `TransitionFit` objects when you
+    index or iterate.
+    """
+
+    scale: array[float]
+    center: array[float]
+    width: array[float]
+    baseline: array[float]
+    offset: array[float]
+    peak_height: array[float]
+    transition_time: array[float]
+    mse: array[float]
+    noise: array[float]
+    snr: array[float]
+    ascend: array[float]
+    iterations: array[int]
+    origin: array[int]
+
+    def __post_init__(self) -> None:
+        if len({len(column) for column in self.columns()}) > 1:
+            raise ValueError("All columns must have the same length")
+
+    @classmethod
+    def from_values(cls, columns: Iterable[Iterable[Any]]) -> TransitionFitColumns:
+        """Return the fits from the values of each field (in field order).
+
+        May raise `ValueError` if there isn't a column for each field.
+        """
+        return cls(
+            *(
+                array(type_code, values)
+                for type_code, values in zip(_TYPE_CODES, columns, strict=True)
+            )
+        )
+
+    @classmethod
+    def from_fits(cls, fits: Iterable[TransitionFit]) -> TransitionFitColumns:
+        """Return the fits as columns."""
+        columns: list[Iterable[Any]] = list(zip(*map(_FIELD_VALUES, fits), strict=True))
+        # Early out if there are no fits. There are no columns to transpose.
+        if not columns:
+            return cls.from_values(() for _ in _FIELD_NAMES)
+        return cls.from_values(columns)
+
+    def columns(self) -> tuple[array[Any], ...]:
+        """Return the arrays of all fields (in field order)."""
+        return tuple(getattr(self, name) for name in _FIELD_NAMES)
+
+    def take(self, indices: Sequence[int]) -> TransitionFitColumns:
+        """Return the fits at the given indices (in that order)."""
+        return TransitionFitColumns.from_values(
+            map(column.__getitem__, indices) for column in self.columns()
+        )
+
+    def __len__(self) -> int:
+        return len(self.center)
+
+    @overload
+    def __getitem__(self, index: int) -> TransitionFit: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> TransitionFitColumns: ...
+
+    def __getitem__(self, index: int | slice) -> TransitionFit | TransitionFitColumns:
+        if isinstance(index, slice):
+            return TransitionFitColumns(*(column[index] for column in self.columns()))
+        return TransitionFit(*(column[index] for column in self.columns()))
+
+    def __iter__(self) -> Iterator[TransitionFit]:
+        for values in zip(*self.columns(), strict=True):
+            yield TransitionFit(*values)
+
+    def __eq__(self, rhs: object) -> bool:
+        if isinstance(rhs, TransitionFitColumns):
+            return self.columns() == rhs.columns()
+        if not isinstance(rhs, Sequence):
+            return NotImplemented
+        return _sequence_eq(self, rhs)
+
+    def __hash__(self) -> int:
+        # Same as the equivalent tuple of fits (see `__eq__`). Don't modify the
+        # arrays of a hashed instance.
+        return hash(tuple(self))
+
+
+@dataclass(frozen=True, eq=False)
+class FitComplexColumns(Sequence[FitComplex]):
+    """Complex transition fits stored as columns (see `TransitionFitColumns`).
+
+    This takes 208 bytes per transition. This is an order of magnitude less than
+    the equivalent `FitComplex` objects. We only create said objects when you
+    index or iterate. Therefore, it's a drop-in replacement for a tuple of
+    `FitComplex` objects.
+    """
+
+    time_start: array[float]
+    time_end: array[float]
+    re: TransitionFitColumns
+    im: TransitionFitColumns
+
+    def __post_init__(self) -> None:
+        if (
+            not len(self.time_start)
+            == len(self.time_end)
+            == len(self.re)
+            == len(self.im)
+        ):
+            raise ValueError("All columns must have the same length")
+        # Same checks as `FitComplex`
+        for time_start, time_end, re_center, im_center in zip(
+            self.time_start, self.time_end, self.re.center, self.im.center, strict=True
+        ):
+            if time_start > time_end:
+                raise ValueError("Start time must come before end time")
+            if not time_start <= re_center <= time_end:
+                raise ValueError(
+                    "Real part center must be within the overall time interval"
+                )
+            if not time_start <= im_center <= time_end:
+                raise ValueError(
+                    "Imaginary part center must be within the overall time interval"
+                )
+
+    @classmethod
+    def _validated(
+        cls,
+        *,
+        time_start: array[float],
+        time_end: array[float],
+        re: TransitionFitColumns,
+        im: TransitionFitColumns,
+    ) -> FitComplexColumns:
+        """Return the columns without the checks of `__post_init__`.
+
+        Only for columns derived from already validated columns (e.g., a slice).
+        The checks loop over all transitions in Python.
+        """
+        columns = object.__new__(cls)
+        object.__setattr__(columns, "time_start", time_start)
+        object.__setattr__(columns, "time_end", time_end)
+        object.__setattr__(columns, "re", re)
+        object.__setattr__(columns, "im", im)
+        return columns
+
+    @classmethod
+    def from_fits(cls, fits: Iterable[FitComplex]) -> FitComplexColumns:
+        """Return the fits as columns.
+
+        Returns `fits` as-is if it's already columns.
+        """
+        if isinstance(fits, FitComplexColumns):
+            return fits
+        fits = tuple(fits)
+        return cls(
+            time_start=array("d", (fit.time_start for fit in fits)),
+            time_end=array("d", (fit.time_end for fit in fits)),
+            re=TransitionFitColumns.from_fits(fit.re for fit in fits),
+            im=TransitionFitColumns.from_fits(fit.im for fit in fits),
+        )
+
+    @classmethod
+    def concat(cls, parts: Iterable[Iterable[FitComplex]]) -> FitComplexColumns:
+        """Return the fits of all parts as a single set of columns."""
+        columns = [cls.from_fits(part) for part in parts]
+        # Early out if there is nothing to concatenate
+        if len(columns) == 1:
+            return columns[0]
+        time_start, time_end = array("d"), array("d")
+        re: list[array[Any]] = [array(type_code) for type_code in _TYPE_CODES]
+        im: list[array[Any]] = [array(type_code) for type_code in _TYPE_CODES]
+        for part in columns:
+            time_start.extend(part.time_start)
+            time_end.extend(part.time_end)
+            for lhs, rhs in zip(re, part.re.columns(), strict=True):
+                lhs.extend(rhs)
+            for lhs, rhs in zip(im, part.im.columns(), strict=True):
+                lhs.extend(rhs)
+        # Each part is validated already (see `from_fits`)
+        return cls._validated(
+            time_start=time_start,
+            time_end=time_end,
+            re=TransitionFitColumns(*re),
+            im=TransitionFitColumns(*im),
+        )
+
+    def take(self, indices: Sequence[int]) -> FitComplexColumns:
+        """Return the fits at the given indices (in that order)."""
+        return FitComplexColumns._validated(
+            time_start=array("d", map(self.time_start.__getitem__, indices)),
+            time_end=array("d", map(self.time_end.__getitem__, indices)),
+            re=self.re.take(indices),
+            im=self.im.take(indices),
+        )
+
+    def sorted(self) -> FitComplexColumns:
+        """Return the fits in the order of `FitComplex` (stable).
+
+        Returns `self` if the fits are already in order.
+        """
+        keys = list(map(min, self.re.center, self.im.center))
+        indices = sorted(range(len(keys)), key=keys.__getitem__)
+        # Early out if there is nothing to reorder
+        if indices == list(range(len(keys))):
+            return self
+        return self.take(indices)
+
+    def __len__(self) -> int:
+        return len(self.time_start)
+
+    @overload
+    def __getitem__(self, index: int) -> FitComplex: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> FitComplexColumns: ...
+
+    def __getitem__(self, index: int | slice) -> FitComplex | FitComplexColumns:
+        if isinstance(index, slice):
+            return FitComplexColumns._validated(
+                time_start=self.time_start[index],
+                time_end=self.time_end[index],
+                re=self.re[index],
+                im=self.im[index],
+            )
+        return FitComplex(
+            re=self.re[index],
+            im=self.im[index],
+            time_start=self.time_start[index],
+            time_end=self.time_end[index],
+        )
+
+    def __iter__(self) -> Iterator[FitComplex]:
+        for re, im, time_start, time_end in zip(
+            self.re, self.im, self.time_start, self.time_end, strict=True
+        ):
+            yield FitComplex(re=re, im=im, time_start=time_start, time_end=time_end)
+
+    def __eq__(self, rhs: object) -> bool:
+        if isinstance(rhs, FitComplexColumns):
+            return (
+                self.time_start == rhs.time_start
+                and self.time_end == rhs.time_end
+                and self.re == rhs.re
+                and self.im == rhs.im
+            )
+        if not isinstance(rhs, Sequence):
+            return NotImplemented
+        return _sequence_eq(self, rhs)
+
+    def __hash__(self) -> int:
+        # Same as the equivalent tuple of fits (see `__eq__`). Don't modify the
+        # arrays of a hashed instance.
+        return hash(tuple(self))
+
+
+def _sequence_eq(lhs: Sequence[Any], rhs: Sequence[Any]) -> bool:
+    """Compare element-wise with any other sequence (e.g., a tuple of fits)."""
+    return len(lhs) == len(rhs) and all(
+        lhs_item == rhs_item for lhs_item, rhs_item in zip(lhs, rhs, strict=True)
+    )
@@ -0,0 +1,172 @@
+from datetime import UTC, datetime, timedelta
+from io import BytesIO
+
+from pilus._magic.signatures import BDR_SIGNATURE
+from pilus.sbt import IqsAggregate, IqsAggregateChannel, IqsAggregateSite
+from pilus.sbt._format import iqs
+from pilus.sbt._format._chunk import write_chunk
+from pilus.sbt._format._io import write_signature
+from pilus.sbt._format.bdr._chunks import AhdrChunk, TranChunk
+from pilus.sbt._model import FitComplex, TransitionFit
+
+START_TIME = datetime(2024, 1, 1, tzinfo=UTC)
+TIME_STEP_NS = 1000
+BYTE_DEPTH = 4
+MAX_AMPLITUDE = 178433195
+
+
+def make_iqs_aggregate(
+    *,
+    samples: int = 1000,
+    site_names: tuple[str, ...] = ("site0", "site1"),
+    channel_names: tuple[str, ...] = ("hf", "lf"),
+    start_time: datetime = START_TIME,
+    offset: int = 0,
+) -> IqsAggregate:
+    """Return IQS aggregate with deterministic (yet distinct) sample values.
+
+    Sample `i` of a given part has the value `offset + i` plus a part-specific
+    constant. Use `offset` to generate data that continues a previous aggregate.
+    """
+    sites: dict[str, IqsAggregateSite] = {}
+    part_index = 0
+    for site_name in site_names:
+        site: IqsAggregateSite = {}
+        for channel_name in channel_names:
+            re = _ramp(samples, offset=offset, part_index=part_index)
+            im = _ramp(samples, offset=offset, part_index=part_index + 1)
+            part_index += 2
+            site[channel_name] = IqsAggregateChannel(
+                TIME_STEP_NS, BYTE_DEPTH, MAX_AMPLITUDE, re, im
+            )
+        sites[site_name] = site
+    return IqsAggregate(
+        start_time=start_time, duration_ns=samples * TIME_STEP_NS, sites=sites
+    )
+
+
+def iqs_to_bytes(
+    aggregate: IqsAggregate,
+    *,
+    chunk_samples: int | None = None,
+    compression: iqs.IqsCompression | None = None,
+) -> bytes:
+    """Serialize the aggregate into IQS data (v2.0.0).
+
+    Splits the data into IDAT (or zDAT) chunks of `chunk_samples` samples (if
+    given).
+    """
+    if chunk_samples is None:
+        with BytesIO() as io:
+            iqs.to_io(aggregate, io, compression=compression)
+            return io.getvalue()
+    # Split the aggregate into smaller aggregates. We use the first aggregate for
+    # the signature and IHDR chunk and only take the IDAT chunk of the rest.
+    samples = aggregate.duration_ns // TIME_STEP_NS
+    result = bytearray()
+    for start in range(0, samples, chunk_samples):
+        end = min(start + chunk_samples, samples)
+        part = slice_iqs_aggregate(aggregate, start, end)
+        data = iqs_to_bytes(part, compression=compression)
+        if start == 0:
+            result += data
+        else:
+            result += data[idat_offset(data) :]
+    return bytes(result)
+
+
+def slice_iqs_aggregate(aggregate: IqsAggregate, start: int, end: int) -> IqsAggregate:
+    """Return the samples in the `[start, end)` range of the aggregate."""
+    sites: dict[str, IqsAggregateSite] = {}
+    for site_name, site in aggregate.sites.items():
+        sites[site_name] = {
+            channel_name: IqsAggregateChannel(
+                channel.time_step_ns,
+                channel.byte_depth,
+                channel.max_amplitude,
+                channel.re[start * BYTE_DEPTH : end * BYTE_DEPTH],
+                channel.im[start * BYTE_DEPTH : end * BYTE_DEPTH],
+            )
+            for channel_name, channel in site.items()
+        }
+    return IqsAggregate(
+        start_time=aggregate.start_time
+        + timedelta(microseconds=start * TIME_STEP_NS * 1e-3),
+        duration_ns=(end - start) * TIME_STEP_NS,
+        sites=sites,
+    )
+
+
+def make_bdr_chunks(
+    *,
+    transitions: int = 10,
+    site_name: str = "site0",
+    channel_names: tuple[str, ...] = ("hf", "lf"),
+    time_start: int = 0,
+) -> tuple[AhdrChunk, TranChunk]:
+    """Return AHDR and tRAN chunk with deterministic (yet distinct) fit values."""
+    time_end = time_start + transitions
+    ahdr = AhdrChunk(
+        site_name=site_name,
+        channel_names=channel_names,
+        time_start=time_start,
+        time_end=time_end,
+    )
+    site_data = {
+        channel_name: tuple(
+            FitComplex(
+                re=_transition_fit(time_start + i + 0.25, seed=2 * j),
+                im=_transition_fit(time_start + i + 0.5, seed=2 * j + 1),
+                time_start=time_start + i,
+                time_end=time_start + i + 1,
+            )
+            for i in range(transitions)
+        )
+        for j, channel_name in enumerate(channel_names)
+    }
+    return ahdr, TranChunk(site_data=site_data)
+
+
+def bdr_to_bytes(*chunks: AhdrChunk | TranChunk) -> bytes:
+    """Serialize the chunks into BDR data."""
+    with BytesIO() as io:
+        write_signature(io, BDR_SIGNATURE)
+        for chunk in chunks:
+            write_chunk(io, chunk)
+        return io.getvalue()
+
+
+def idat_offset(data: bytes) -> int:
+    """Return the offset of the first chunk after the IHDR chunk."""
+    signature_length = 8
+    ihdr_length = int.from_bytes(
+        data[signature_length : signature_length + 4], "little"
+    )
+    # Length, type, data, and CRC
+    return signature_length + 4 + 4 + ihdr_length + 4
+
+
+def _transition_fit(center: float, *, seed: int) -> TransitionFit:
+    return TransitionFit(
+        scale=seed + 0.5,
+        center=center,
+        width=seed + 1.5,
+        baseline=seed + 2.5,
+        offset=seed + 3.5,
+        peak_height=seed + 4.5,
+        transition_time=seed + 5.5,
+        mse=seed + 6.5,
+        noise=seed + 7.5,
+        snr=seed + 8.5,
+        ascend=seed + 9.5,
+        iterations=seed + 10,
+        origin=seed + 11,
+    )
+
+
+def _ramp(samples: int, *, offset: int, part_index: int) -> bytes:
+    base = part_index * 1_000_000
+    return b"".join(
+        (base + offset + i).to_bytes(BYTE_DEPTH, "little", signed=True)
+        for i in range(samples)
+    )
@@ -0,0 +1,153 @@
+from dataclasses import replace
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pilus.errors import PilusDeserializeError
+from pilus.sbt import FitComplexColumns
+from pilus.sbt._format import bdr
+from pilus.sbt._format._chunk import process_pool, read_chunk, write_chunk
+from pilus.sbt._format.bdr._chunks import AhdrChunk, TranChunk
+from pilus.sbt._format.bdr._chunks._tran import _record_layout
+
+from ._synthetic import bdr_to_bytes, make_bdr_chunks
+
+
+def test_tran_record_layout() -> None:
+    # Time span and the complex fit (26 doubles and 4 integers) of two channels
+    assert _record_layout(2).size == 400
+
+
+def test_bdr_chunk_round_trip() -> None:
+    ahdr, tran = make_bdr_chunks()
+    with BytesIO() as io:
+        write_chunk(io, ahdr)
+        write_chunk(io, tran)
+        io.seek(0)
+        assert read_chunk(io, chunk_models=(AhdrChunk,)) == ahdr
+        assert (
+            read_chunk(io, chunk_models=(TranChunk,), channel_names=("hf", "lf"))
+            == tran
+        )
+
+    # Three channels
+    ahdr, tran = make_bdr_chunks(channel_names=("hf", "mf", "lf"))
+    with BytesIO() as io:
+        write_chunk(io, tran)
+        io.seek(0)
+        assert (
+            read_chunk(io, chunk_models=(TranChunk,), channel_names=ahdr.channel_names)
+            == tran
+        )
+
+
+def test_ahdr_corrupt_channel_count() -> None:
+    ahdr, _ = make_bdr_chunks()
+    with BytesIO() as io:
+        write_chunk(io, ahdr)
+        data = bytearray(io.getvalue())
+    # Length and type fields. Then the site name.
+    count_offset = 4 + 4 + 256
+    data[count_offset : count_offset + 4] = (3_000_000).to_bytes(4, "little")
+    with pytest.raises(PilusDeserializeError, match="claims 3000000 channels"):
+        read_chunk(BytesIO(data), chunk_models=(AhdrChunk,))
+
+
+def test_bdr_from_io() -> None:
+    ahdr0, tran0 = make_bdr_chunks(site_name="site0")
+    ahdr1, tran1 = make_bdr_chunks(site_name="site1", time_start=10)
+    data = bdr_to_bytes(ahdr0, tran0, ahdr1, tran1)
+    for memory_map in (False, True):
+        aggregate = bdr.from_io(BytesIO(data), memory_map=memory_map)
+        assert aggregate.sites.keys() == {"site0", "site1"}
+        assert aggregate.sites["site1"]["lf"].transition_fits == tran1.site_data["lf"]
+
+    # Truncate the last chunk
+    with pytest.raises(PilusDeserializeError):
+        bdr.from_io(BytesIO(data[:-10]))
+
+
+def test_bdr_parallel() -> None:
+    chunks = [
+        chunk
+        for i in range(6)
+        for chunk in make_bdr_chunks(site_name=f"site{i % 2}", time_start=10 * i)
+    ]
+    data = bdr_to_bytes(*chunks)
+    with TemporaryDirectory() as temp_dir:
+        bdr_file = Path(temp_dir) / "data.bdr"
+        bdr_file.write_bytes(data)
+        with bdr_file.open("rb") as io:
+            parallel = bdr.from_io(io, workers=2)
+        # Caller-owned pool that outlives the call
+        with process_pool(2) as executor:
+            with bdr_file.open("rb") as io:
+                assert bdr.from_io(io, executor=executor) == parallel
+            with bdr_file.open("rb") as io:
+                assert bdr.from_io(io, workers=1, executor=executor) == parallel
+    assert parallel == bdr.from_io(BytesIO(data))
+
+    # There is no file behind `BytesIO`
+    with pytest.raises(ValueError, match="backed by a file"):
+        bdr.from_io(BytesIO(data), workers=2)
+
+
+def test_bdr_columns() -> None:
+    ahdr0, tran0 = make_bdr_chunks(time_start=10)
+    ahdr1, tran1 = make_bdr_chunks(time_start=0)
+    aggregate = bdr.from_io(BytesIO(bdr_to_bytes(ahdr0, tran0, ahdr1, tran1)))
+    fits = aggregate.sites["site0"]["hf"].transition_fits
+    assert isinstance(fits, FitComplexColumns)
+    # Concatenated and sorted
+    expected = sorted((*tran0.site_data["hf"], *tran1.site_data["hf"]))
+    assert fits == tuple(expected)
+    assert tuple(expected) == fits
+    assert fits[3] == expected[3]
+    assert fits[-1] == expected[-1]
+    assert fits[2:5] == expected[2:5]
+    assert isinstance(fits[2:5], FitComplexColumns)
+    assert list(aggregate.sites["site0"]["hf"].transition_fits_im) == [
+        fit.im for fit in expected
+    ]
+    assert FitComplexColumns.from_fits(expected) == fits
+    # Hashes like the equivalent tuple (as does the channel)
+    assert hash(fits) == hash(tuple(expected))
+    assert hash(fits.re) == hash(tuple(fit.re for fit in expected))
+    channel = aggregate.sites["site0"]["hf"]
+    assert hash(channel) == hash(replace(channel, transition_fits=tuple(expected)))
+
+    # Same checks as `FitComplex`
+    with pytest.raises(ValueError, match="Real part center"):
+        FitComplexColumns(
+            time_start=fits.time_start,
+            time_end=fits.time_end,
+            re=fits.im[::-1],
+            im=fits.im,
+        )
+
+
+def test_bdr_columns_validate_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    ahdr0, tran0 = make_bdr_chunks(time_start=10)
+    ahdr1, tran1 = make_bdr_chunks(time_start=0)
+    fits = (
+        bdr.from_io(BytesIO(bdr_to_bytes(ahdr0, tran0, ahdr1, tran1)))
+        .sites["site0"]["hf"]
+        .transition_fits
+    )
+    assert isinstance(fits, FitComplexColumns)
+
+    # Columns derived from validated columns skip the per-transition checks
+    def fail(_self: FitComplexColumns) -> None:
+        raise AssertionError("Validated again")
+
+    monkeypatch.setattr(FitComplexColumns, "__post_init__", fail)
+    expected = tuple(fits)
+    assert fits[1:4] == expected[1:4]
+    assert fits.take([2, 0]) == (expected[2], expected[0])
+    assert fits[::-1].sorted() == expected
+    assert FitComplexColumns.concat((fits[:2], fits[2:])) == expected
+    # The boundaries still validate
+    with pytest.raises(AssertionError, match="Validated again"):
+        FitComplexColumns.from_fits(expected)
@@ -0,0 +1,83 @@
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pilus.errors import PilusDeserializeError
+from pilus.sbt._format.bdr._chunks._tran import _record_layout
+
+from ._synthetic import bdr_to_bytes, make_bdr_chunks
+
+np = pytest.importorskip("numpy")
+
+
+def test_tran_data_arrays() -> None:
+    from pilus.numpy import tran_data_arrays, tran_record_dtype  # noqa: PLC0415
+
+    channel_names = ("hf", "mf", "lf")
+    assert tran_record_dtype(channel_names).itemsize == _record_layout(3).size
+
+    _, tran = make_bdr_chunks(channel_names=channel_names)
+    with BytesIO() as io:
+        tran.to_io(io)
+        data = io.getvalue()
+    arrays = tran_data_arrays(data, channel_names=channel_names)
+    assert arrays.channel_names == channel_names
+    assert not arrays.records.flags.writeable
+    for channel_name, fits in tran.site_data.items():
+        assert arrays.time_start.tolist() == [fit.time_start for fit in fits]
+        assert arrays.time_end.tolist() == [fit.time_end for fit in fits]
+        for part in ("re", "im"):
+            columns = arrays.fits(channel_name, part)
+            for field in ("center", "snr", "iterations", "origin"):
+                assert columns[field].tolist() == [
+                    getattr(getattr(fit, part), field) for fit in fits
+                ]
+
+    with pytest.raises(PilusDeserializeError, match="length"):
+        tran_data_arrays(data[:-1], channel_names=channel_names)
+
+    # Same checks as `FitComplex`
+    records = np.frombuffer(bytearray(data), dtype=tran_record_dtype(channel_names))
+    time_end = records["time_end"][3]
+    records["channels"]["mf"]["im"]["center"][3] = time_end + 1
+    with pytest.raises(PilusDeserializeError, match=r'"mf"\) \(transition 3\)'):
+        tran_data_arrays(records, channel_names=channel_names)
+    arrays = tran_data_arrays(records, channel_names=channel_names, validate=False)
+    assert arrays.fits("mf", "im")["center"][3] == time_end + 1
+
+
+def test_load_bdr_arrays() -> None:
+    from pilus.numpy import load_bdr_arrays  # noqa: PLC0415
+
+    ahdr0, tran0 = make_bdr_chunks(site_name="site0")
+    ahdr1, tran1 = make_bdr_chunks(site_name="site1", time_start=10)
+    ahdr2, tran2 = make_bdr_chunks(site_name="site0", time_start=20)
+    data = bdr_to_bytes(ahdr0, tran0, ahdr1, tran1, ahdr2, tran2)
+
+    sites = load_bdr_arrays(BytesIO(data))
+    assert sites.keys() == {"site0", "site1"}
+    # Concatenated in file order
+    assert sites["site0"].time_start.tolist() == [
+        fit.time_start for fit in (*tran0.site_data["hf"], *tran2.site_data["hf"])
+    ]
+    assert sites["site1"].fits("lf", "re")["center"].tolist() == [
+        fit.re.center for fit in tran1.site_data["lf"]
+    ]
+
+    # Zero-copy views of the memory-mapped file
+    with TemporaryDirectory() as temp_dir:
+        file = Path(temp_dir) / "data.bdr"
+        file.write_bytes(data)
+        with file.open("rb") as io:
+            sites = load_bdr_arrays(io, memory_map=True)
+        records = sites["site1"].records
+        assert not records.flags.owndata
+        assert (
+            records.tolist() == load_bdr_arrays(BytesIO(data))["site1"].records.tolist()
+        )
+
+    # Truncate the last chunk
+    with pytest.raises(PilusDeserializeError):
+        load_bdr_arrays(BytesIO(data[:-10]))
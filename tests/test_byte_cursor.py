@@ -0,0 +1,39 @@
+from io import BytesIO
+from struct import pack
+
+import pytest
+
+from pilus.errors import PilusMissingDataError
+from pilus.sbt._format._io import BufferIO, ByteCursor
+from pilus.sbt._format.iqs._chunks import IhdrChunk
+
+from ._synthetic import idat_offset, iqs_to_bytes, make_iqs_aggregate
+
+
+def test_byte_cursor() -> None:
+    data = (
+        pack("<Iqd", 7, -3, 1.5)
+        + b"site0".ljust(256, b"\x00")
+        + (-1).to_bytes(64, "little", signed=True)
+        + pack("=3i", 1, 2, 3)
+    )
+    cursor = ByteCursor(data)
+    assert cursor.read_int(4) == 7
+    assert cursor.read_int(8, signed=True) == -3
+    assert cursor.read_double() == 1.5
+    assert cursor.read_terminated_string(256) == "site0"
+    assert cursor.read_int(64, signed=True) == -1
+    assert cursor.read_array("i", 3).tolist() == [1, 2, 3]
+    assert cursor.remaining == 0
+    with pytest.raises(PilusMissingDataError):
+        cursor.read_int(1)
+
+
+def test_ihdr_from_cursor() -> None:
+    data = iqs_to_bytes(make_iqs_aggregate())
+    # Skip signature, chunk length, and chunk type
+    ihdr_data = memoryview(data)[8 + 4 + 4 : idat_offset(data) - 4]
+    from_cursor = IhdrChunk.from_cursor(ByteCursor(ihdr_data))
+    assert from_cursor == IhdrChunk.from_io(BytesIO(ihdr_data))
+    assert from_cursor == IhdrChunk.from_io(BufferIO(ihdr_data))
+    assert from_cursor["site1"]["lf"].byte_depth == 4
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from pilus.errors import PilusDeserializeError
+from pilus.sbt._format import bdr, iqs
+from pilus.sbt._format._chunk import require_single_chunk_async, stream_chunks_async
+from pilus.sbt._format.iqs._chunks import IdatChunk, IhdrChunk
+
+from ._synthetic import (
+    bdr_to_bytes,
+    idat_offset,
+    iqs_to_bytes,
+    make_bdr_chunks,
+    make_iqs_aggregate,
+)
+
+
+def _stream_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def test_iqs_from_stream() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+
+    async def main() -> None:
+        assert await iqs.from_stream(_stream_reader(data)) == aggregate
+        assert (
+            await iqs.from_stream(_stream_reader(data), verify_crc="background")
+            == aggregate
+        )
+        # Corrupt a sample
+        corrupted = bytearray(data)
+        corrupted[-5] ^= 0xFF
+        with pytest.raises(PilusDeserializeError, match="CRC mismatch"):
+            await iqs.from_stream(_stream_reader(bytes(corrupted)))
+        # Truncated data
+        with pytest.raises(PilusDeserializeError):
+            await iqs.from_stream(_stream_reader(data[:-2]))
+
+    asyncio.run(main())
+
+
+def test_stream_chunks_async() -> None:
+    data = iqs_to_bytes(make_iqs_aggregate(), chunk_samples=300)
+    ihdr_end = idat_offset(data)
+    # Insert an ancilliary chunk (that we don't know of) before the IDAT chunks
+    ancilliary = (3).to_bytes(4, "little") + b"xTRA" + b"abc" + bytes(4)
+    data = data[:ihdr_end] + ancilliary + data[ihdr_end:]
+
+    async def main() -> None:
+        reader = asyncio.StreamReader()
+        # Feed the data (without the signature) in small pieces like a network
+        # connection would.
+        for start in range(8, len(data), 100):
+            reader.feed_data(data[start : start + 100])
+        reader.feed_eof()
+        ihdr = await require_single_chunk_async(reader, chunk_models=(IhdrChunk,))
+        # Note that we don't verify the CRC of ancilliary chunks that we skip
+        idats = [
+            chunk
+            async for chunk in stream_chunks_async(
+                reader, chunk_models=(IdatChunk,), header=ihdr
+            )
+        ]
+        assert len(idats) == 4
+        assert all(isinstance(idat, IdatChunk) for idat in idats)
+
+    asyncio.run(main())
+
+
+def test_bdr_from_stream() -> None:
+    ahdr, tran = make_bdr_chunks()
+    data = bdr_to_bytes(ahdr, tran)
+
+    async def main() -> None:
+        aggregate = await bdr.from_stream(_stream_reader(data))
+        assert aggregate.sites["site0"]["hf"].transition_fits == tran.site_data["hf"]
+
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from pilus.sbt import BdrFollower, IqsFollower
+
+from ._synthetic import (
+    BYTE_DEPTH,
+    bdr_to_bytes,
+    idat_offset,
+    iqs_to_bytes,
+    make_bdr_chunks,
+    make_iqs_aggregate,
+    slice_iqs_aggregate,
+)
+
+
+def test_iqs_follower() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+    first_idat = idat_offset(data)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        follower = IqsFollower(iqs_file)
+
+        # Signature and part of the header
+        iqs_file.write_bytes(data[: first_idat - 10])
+        assert follower.poll() is None
+        # Header and part of the first IDAT chunk
+        iqs_file.write_bytes(data[: first_idat + 100])
+        assert follower.poll() is None
+        assert follower.offset == first_idat
+        # Two complete IDAT chunks and part of the third
+        # Length, type, timestamp, duration, data (2 sites with 2 complex
+        # channels each), and CRC.
+        idat_length = 4 + 4 + 8 + 8 + 2 * 2 * 2 * 300 * BYTE_DEPTH + 4
+        iqs_file.write_bytes(data[: first_idat + 2 * idat_length + 10])
+        assert follower.poll() == slice_iqs_aggregate(aggregate, 0, 600)
+        assert follower.poll() is None
+        # The rest
+        iqs_file.write_bytes(data)
+        assert follower.poll() == slice_iqs_aggregate(aggregate, 600, 1000)
+        assert follower.offset == len(data)
+
+
+def test_bdr_follower() -> None:
+    ahdr0, tran0 = make_bdr_chunks(site_name="site0")
+    ahdr1, tran1 = make_bdr_chunks(site_name="site1", time_start=10)
+    first = bdr_to_bytes(ahdr0, tran0)
+    data = bdr_to_bytes(ahdr0, tran0, ahdr1, tran1)
+
+    with TemporaryDirectory() as temp_dir:
+        bdr_file = Path(temp_dir) / "data.bdr"
+        follower = BdrFollower(bdr_file)
+
+        bdr_file.write_bytes(first)
+        aggregate = follower.poll()
+        assert aggregate is not None
+        assert aggregate.sites.keys() == {"site0"}
+        # Interleaved header and part of the subsequent tRAN chunk
+        bdr_file.write_bytes(data[:-20])
+        assert follower.poll() is None
+        bdr_file.write_bytes(data)
+        aggregate = follower.poll()
+        assert aggregate is not None
+        assert aggregate.sites.keys() == {"site1"}
+        assert aggregate.sites["site1"]["lf"].transition_fits == tran1.site_data["lf"]
@@ -0,0 +1,553 @@
+import os
+from dataclasses import replace
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Thread
+
+import pytest
+
+from pilus._magic import Medium, detect_media_type
+from pilus._magic.signatures import IQS_SIGNATURE
+from pilus.errors import PilusDeserializeError, PilusMissingMorpherError
+from pilus.forge import FORGE, Forge
+from pilus.sbt import IqsAggregate, IqsGap, LazyRawData
+from pilus.sbt._format import iqs
+from pilus.sbt._format._chunk import (
+    ChunkEvent,
+    CrcPolicy,
+    _chunk_data_io,
+    instrument_chunks,
+    load_chunk_index,
+    process_pool,
+    read_chunk_at,
+    scan_chunks,
+    write_chunk,
+)
+from pilus.sbt._format._io import write_signature
+from pilus.sbt._format.iqs._chunks import IdatChunk, IhdrChunk
+
+from ._synthetic import (
+    START_TIME,
+    TIME_STEP_NS,
+    idat_offset,
+    iqs_to_bytes,
+    make_iqs_aggregate,
+    slice_iqs_aggregate,
+)
+
+
+def test_iqs_memory_map() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(data)
+        with iqs_file.open("rb") as io:
+            mapped = iqs.from_io(io, memory_map=True)
+
+    assert mapped == aggregate
+    assert iqs.from_io(BytesIO(data)) == aggregate
+    assert iqs.from_io(BytesIO(data), memory_map=True) == aggregate
+
+
+def test_chunk_index() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(data)
+        index = load_chunk_index(iqs_file, signature=IQS_SIGNATURE)
+        assert [entry.type_ for entry in index.entries] == [b"IHDR"] + [b"IDAT"] * 4
+        # The second call uses the sidecar file
+        assert load_chunk_index(iqs_file, signature=IQS_SIGNATURE) == index
+
+        with iqs_file.open("rb") as io:
+            ihdr = read_chunk_at(io, index.nth(b"IHDR", 0), chunk_models=(IhdrChunk,))
+            last_idat = read_chunk_at(
+                io, index.nth(b"IDAT", -1), chunk_models=(IdatChunk,), header=ihdr
+            )
+    assert isinstance(last_idat, IdatChunk)
+    assert last_idat.duration_ns == 100 * TIME_STEP_NS
+    assert index.latest_before(index.entries[-1], b"IHDR") == index.entries[0]
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 1024 * 1024])
+def test_iqs_streaming(monkeypatch: pytest.MonkeyPatch, block_size: int) -> None:
+    # Use a tiny block size to exercise the block boundaries
+    monkeypatch.setattr(_chunk_data_io, "BLOCK_SIZE", block_size)
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+    assert iqs.from_io(BytesIO(data)) == aggregate
+
+    # Corrupt the last sample
+    corrupted = bytearray(data)
+    corrupted[-5] ^= 0xFF
+    with pytest.raises(PilusDeserializeError, match="CRC mismatch"):
+        iqs.from_io(BytesIO(corrupted))
+
+
+@pytest.mark.parametrize("verify_crc", ["strict", "skip", "background"])
+def test_iqs_crc_policy(verify_crc: CrcPolicy) -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+    # Corrupt a sample in the first IDAT chunk
+    corrupted = bytearray(data)
+    corrupted[len(data) // 4] ^= 0xFF
+
+    for memory_map in (False, True):
+        assert (
+            iqs.from_io(BytesIO(data), memory_map=memory_map, verify_crc=verify_crc)
+            == aggregate
+        )
+        if verify_crc == "skip":
+            assert (
+                iqs.from_io(
+                    BytesIO(corrupted), memory_map=memory_map, verify_crc=verify_crc
+                )
+                != aggregate
+            )
+            continue
+        with pytest.raises(PilusDeserializeError, match='CRC mismatch in "IDAT"'):
+            iqs.from_io(
+                BytesIO(corrupted), memory_map=memory_map, verify_crc=verify_crc
+            )
+
+
+def test_iqs_write_streaming() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        # Unbuffered (raw) file. We use vectored I/O for these.
+        with iqs_file.open("wb", buffering=0) as io:
+            iqs.to_io(aggregate, io)
+        assert iqs_file.read_bytes() == data
+
+    # Non-seekable stream
+    read_fd, write_fd = os.pipe()
+
+    def write() -> None:
+        with os.fdopen(write_fd, "wb") as io:
+            iqs.to_io(aggregate, io)
+
+    thread = Thread(target=write)
+    thread.start()
+    with os.fdopen(read_fd, "rb") as io:
+        received = io.read()
+    thread.join()
+    assert received == data
+
+
+def test_iqs_parallel() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=50)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(data)
+        with iqs_file.open("rb") as io:
+            assert iqs.from_io(io, workers=2) == aggregate
+
+        # Corrupt a sample in the last IDAT chunk
+        corrupted = bytearray(data)
+        corrupted[-5] ^= 0xFF
+        iqs_file.write_bytes(corrupted)
+        with (
+            iqs_file.open("rb") as io,
+            pytest.raises(PilusDeserializeError, match="CRC mismatch"),
+        ):
+            iqs.from_io(io, workers=2)
+
+
+def test_iqs_parallel_executor() -> None:
+    aggregates = [make_iqs_aggregate(), make_iqs_aggregate(offset=1000)]
+
+    with TemporaryDirectory() as temp_dir, process_pool(2) as executor:
+        # Reuse the same pool for all files
+        for i, aggregate in enumerate(aggregates):
+            iqs_file = Path(temp_dir) / f"data{i}.iqs"
+            iqs_file.write_bytes(iqs_to_bytes(aggregate, chunk_samples=50))
+            with iqs_file.open("rb") as io:
+                assert iqs.from_io(io, executor=executor) == aggregate
+            with iqs_file.open("rb") as io:
+                window = iqs.from_io(
+                    io,
+                    executor=executor,
+                    start=250 * TIME_STEP_NS,
+                    end=650 * TIME_STEP_NS,
+                )
+            assert window == slice_iqs_aggregate(aggregate, 250, 650)
+        with iqs_file.open("rb") as io, pytest.raises(ValueError, match="executor"):
+            iqs.from_io(io, executor=executor, lazy=True)
+
+
+@pytest.mark.parametrize("block_size", [64, 1024 * 1024])
+def test_instrument_chunks(monkeypatch: pytest.MonkeyPatch, block_size: int) -> None:
+    # The small block size forces the streaming code path
+    monkeypatch.setattr(_chunk_data_io, "BLOCK_SIZE", block_size)
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+
+    events: list[ChunkEvent] = []
+    with instrument_chunks(events.append) as stats:
+        iqs.from_io(BytesIO(data))
+        iqs.to_io(aggregate, BytesIO())
+    # Everything but the signature
+    assert sum(event.number_of_bytes for event in events[:5]) == len(data) - 8
+    assert stats.reads.keys() == {b"IHDR", b"IDAT"}
+    assert stats.reads[b"IDAT"].count == 4
+    assert stats.writes[b"IDAT"].count == 1
+    assert all(event.io_ns > 0 for event in events)
+    assert all(event.crc_ns > 0 for event in events if event.operation == "write")
+    assert stats.reads[b"IDAT"].crc_ns > 0
+
+    # Nothing is measured outside the context
+    iqs.from_io(BytesIO(data))
+    assert len(events) == 7
+
+
+def test_iqs_lazy() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(data)
+        with iqs_file.open("rb") as io:
+            lazy = iqs.from_io(io, lazy=True)
+            with pytest.raises(ValueError, match="verify CRCs"):
+                iqs.from_io(io, lazy=True, verify_crc="strict")
+
+        parts = [
+            part
+            for site in lazy.sites.values()
+            for channel in site.values()
+            for part in (channel.re, channel.im)
+        ]
+        assert all(isinstance(part, LazyRawData) for part in parts)
+        assert lazy.duration_ns == aggregate.duration_ns
+        # We know the length without loading anything
+        hf = lazy.sites["site0"]["hf"]
+        assert len(hf.re) == len(aggregate.sites["site0"]["hf"].re)
+        assert not any(part.loaded for part in parts if isinstance(part, LazyRawData))
+
+        # Only the channel that we access gets loaded
+        assert hf.re == aggregate.sites["site0"]["hf"].re
+        assert [part.loaded for part in parts if isinstance(part, LazyRawData)] == [
+            True
+        ] + [False] * 7
+        assert lazy == aggregate
+
+
+def test_iqs_merge_without_copies() -> None:
+    aggregate = make_iqs_aggregate()
+
+    # A single IDAT chunk passes through as-is. With `memory_map`, the channel
+    # data refers directly to the original buffer.
+    data = iqs_to_bytes(aggregate)
+    merged = iqs.from_io(BytesIO(data), memory_map=True)
+    re = merged.sites["site0"]["hf"].re
+    assert isinstance(re, memoryview)
+    assert re.obj is data
+
+    # Multiple chunks get merged into a single buffer that we hand over as-is
+    data = iqs_to_bytes(aggregate, chunk_samples=300)
+    merged = iqs.from_io(BytesIO(data))
+    re = merged.sites["site0"]["hf"].re
+    assert isinstance(re, memoryview)
+    assert re.readonly
+    assert isinstance(re.obj, bytearray)
+    assert len(re.obj) == len(re)
+    assert merged == aggregate
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_iqs_time_window(compression: iqs.IqsCompression | None) -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+
+    # Offsets (in nanoseconds) from the start of the recording. The window
+    # overlaps the first three chunks and cuts into the first and third.
+    window = iqs.from_io(
+        BytesIO(data), start=250 * TIME_STEP_NS, end=650 * TIME_STEP_NS
+    )
+    assert window == slice_iqs_aggregate(aggregate, 250, 650)
+    # Absolute times
+    assert iqs.from_io(
+        BytesIO(data), start=START_TIME + timedelta(microseconds=250)
+    ) == slice_iqs_aggregate(aggregate, 250, 1000)
+    with pytest.raises(ValueError, match="after its start"):
+        iqs.from_io(BytesIO(data), start=500 * TIME_STEP_NS, end=100 * TIME_STEP_NS)
+
+    # We only read the data chunks within the window
+    with instrument_chunks() as stats:
+        window = iqs.from_io(
+            BytesIO(data), start=350 * TIME_STEP_NS, end=550 * TIME_STEP_NS
+        )
+    assert window == slice_iqs_aggregate(aggregate, 350, 550)
+    assert sum(per_type.count for per_type in stats.reads.values()) == 2
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(data)
+        for kwargs in ({"workers": 2}, {"lazy": True}):
+            with iqs_file.open("rb") as io:
+                window = iqs.from_io(
+                    io, start=250 * TIME_STEP_NS, end=650 * TIME_STEP_NS, **kwargs
+                )
+            assert window == slice_iqs_aggregate(aggregate, 250, 650)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_iqs_projection(
+    monkeypatch: pytest.MonkeyPatch, compression: iqs.IqsCompression | None
+) -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+    expected = replace(
+        aggregate, sites={"site1": {"hf": aggregate.sites["site1"]["hf"]}}
+    )
+
+    assert iqs.from_io(BytesIO(data), sites=["site1"], channels=["hf"]) == expected
+    assert (
+        iqs.from_io(BytesIO(data), memory_map=True, sites=["site1"], channels=["hf"])
+        == expected
+    )
+    assert iqs.from_io(BytesIO(data), channels=["lf"]).sites.keys() == {
+        "site0",
+        "site1",
+    }
+    # Seek past the skipped channels while we stream the chunk data
+    monkeypatch.setattr(_chunk_data_io, "BLOCK_SIZE", 64)
+    for verify_crc in ("strict", "skip"):
+        assert (
+            iqs.from_io(
+                BytesIO(data), verify_crc=verify_crc, sites=["site1"], channels=["hf"]
+            )
+            == expected
+        )
+    with pytest.raises(PilusDeserializeError, match='No such site: "site9"'):
+        iqs.from_io(BytesIO(data), sites=["site9"])
+
+
+def test_iqs_site_without_channels() -> None:
+    aggregate = make_iqs_aggregate(site_names=("site0",))
+    expected = replace(aggregate, sites={**aggregate.sites, "site1": {}})
+    # The channels of the aggregate double as channel headers
+    sites = {site_name: dict(site) for site_name, site in expected.sites.items()}
+    with BytesIO() as io:
+        write_signature(io, IQS_SIGNATURE)
+        write_chunk(io, IhdrChunk(sites))
+        write_chunk(io, IdatChunk(aggregate.start_time, aggregate.duration_ns, sites))
+        data = io.getvalue()
+
+    # Only the projection leaves out sites
+    for kwargs in ({}, {"memory_map": True}, {"lazy": True}):
+        assert iqs.from_io(BytesIO(data), **kwargs) == expected
+    assert iqs.from_io(BytesIO(data), channels=["hf"]).sites.keys() == {"site0"}
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_iqs_writer(compression: iqs.IqsCompression | None) -> None:
+    aggregate = make_iqs_aggregate()
+
+    with BytesIO() as io:
+        writer = iqs.IqsWriter(
+            io,
+            header=aggregate.sites,
+            start_time=aggregate.start_time,
+            compression=compression,
+        )
+        for start in range(0, 1000, 300):
+            part = slice_iqs_aggregate(aggregate, start, min(start + 300, 1000))
+            writer.append(part.sites)
+        assert writer.duration_ns == aggregate.duration_ns
+        data = io.getvalue()
+    # Same as if we split the aggregate after the fact
+    assert data == iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+    assert iqs.from_io(BytesIO(data)) == aggregate
+
+    part = slice_iqs_aggregate(aggregate, 0, 10)
+    with pytest.raises(ValueError, match='channels of site "site0"'):
+        writer.append({**part.sites, "site0": {"hf": part.sites["site0"]["hf"]}})
+    with pytest.raises(ValueError, match="same time span"):
+        writer.append(
+            {
+                **part.sites,
+                "site0": {**part.sites["site0"], "lf": aggregate.sites["site0"]["lf"]},
+            }
+        )
+    with pytest.raises(ValueError, match="site_to_keep"):
+        iqs.IqsWriter(
+            BytesIO(),
+            header=aggregate.sites,
+            start_time=aggregate.start_time,
+            version=iqs.IqsVersion.V1_0_0,
+        )
+
+
+def test_iqs_writer_without_channels() -> None:
+    # There are no samples to derive the duration from
+    aggregate = make_iqs_aggregate(site_names=("site0",), channel_names=())
+    with BytesIO() as io:
+        iqs.to_io(aggregate, io)
+        data = io.getvalue()
+    assert iqs.from_io(BytesIO(data)) == aggregate
+
+    writer = iqs.IqsWriter(
+        BytesIO(), header=aggregate.sites, start_time=aggregate.start_time
+    )
+    with pytest.raises(ValueError, match="without channels"):
+        writer.append(aggregate.sites)
+    writer.append(aggregate.sites, duration_ns=aggregate.duration_ns)
+    assert writer.duration_ns == aggregate.duration_ns
+
+
+def test_iqs_writer_duration() -> None:
+    aggregate = make_iqs_aggregate(site_names=("site0",))
+    writer = iqs.IqsWriter(
+        BytesIO(), header=aggregate.sites, start_time=aggregate.start_time
+    )
+    # The explicit duration must agree with the channel data (up to one step)
+    with pytest.raises(ValueError, match="within one time step"):
+        writer.append(aggregate.sites, duration_ns=2 * aggregate.duration_ns)
+    with pytest.raises(ValueError, match="within one time step"):
+        writer.append(
+            aggregate.sites, duration_ns=aggregate.duration_ns + TIME_STEP_NS + 1
+        )
+    assert writer.duration_ns == 0
+    writer.append(aggregate.sites, duration_ns=aggregate.duration_ns + TIME_STEP_NS)
+    assert writer.duration_ns == aggregate.duration_ns + TIME_STEP_NS
+
+
+def test_iqs_upgrade() -> None:
+    aggregate = make_iqs_aggregate(site_names=("site0",))
+    with BytesIO() as io:
+        writer = iqs.IqsWriter(
+            io,
+            header=aggregate.sites,
+            start_time=aggregate.start_time,
+            version=iqs.IqsVersion.V1_0_0,
+            site_to_keep="site0",
+        )
+        for start in range(0, 1000, 300):
+            part = slice_iqs_aggregate(aggregate, start, min(start + 300, 1000))
+            writer.append(part.sites)
+        data = io.getvalue()
+    assert detect_media_type(data) == "application/vnd.sbt.iqs;version=1.0.0"
+
+    with BytesIO() as io:
+        iqs.upgrade_io(BytesIO(data), io)
+        upgraded = io.getvalue()
+    assert detect_media_type(upgraded) == "application/vnd.sbt.iqs"
+    # One IDAT chunk per SDAT chunk
+    with BytesIO(upgraded) as io:
+        io.seek(len(IQS_SIGNATURE))
+        assert [entry.type_ for entry in scan_chunks(io).entries] == [b"IHDR"] + [
+            b"IDAT"
+        ] * 4
+    assert iqs.from_io(BytesIO(upgraded)) == iqs.from_io(BytesIO(data))
+    with pytest.raises(PilusDeserializeError, match="already version"):
+        iqs.upgrade_io(BytesIO(upgraded), BytesIO())
+
+    # Direct conversion (without the in-memory aggregate) via the forge
+    with TemporaryDirectory() as temp_dir:
+        v1_file = Path(temp_dir) / "v1.iqs"
+        v2_file = Path(temp_dir) / "v2.iqs"
+        v1_file.write_bytes(data)
+        FORGE.convert(
+            Medium.from_raw(v1_file),
+            Medium.from_raw(v2_file, media_type="application/vnd.sbt.iqs"),
+        )
+        assert v2_file.read_bytes() == upgraded
+        assert FORGE.deserialize(Medium.from_raw(v1_file), IqsAggregate) == (
+            iqs.from_io(BytesIO(data))
+        )
+
+        # Converters are never part of a morph chain. E.g., we can't deserialize
+        # version 1.0.0 data via the upgrade (it needs an output medium).
+        forge = Forge()
+        forge.register_converter(iqs.upgrade_file)
+        forge.register_deserializer(iqs.from_io)
+        with pytest.raises(PilusMissingMorpherError):
+            forge.deserialize(Medium.from_raw(v1_file), IqsAggregate)
+
+
+def test_iqs_upgrade_cli() -> None:
+    # The CLI is an optional extra
+    typer_testing = pytest.importorskip("typer.testing")
+    from pilus.cli import CLI_APP  # noqa: PLC0415
+
+    aggregate = make_iqs_aggregate(site_names=("site0",))
+    runner = typer_testing.CliRunner()
+
+    with TemporaryDirectory() as temp_dir:
+        v1_file = Path(temp_dir) / "v1.iqs"
+        v2_file = Path(temp_dir) / "v2.iqs"
+        with v1_file.open("wb") as io:
+            iqs.to_io(
+                aggregate, io, version=iqs.IqsVersion.V1_0_0, site_to_keep="site0"
+            )
+        result = runner.invoke(
+            CLI_APP,
+            [
+                "convert",
+                str(v1_file),
+                str(v2_file),
+                "--output-media-type",
+                "application/vnd.sbt.iqs",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert detect_media_type(v2_file.read_bytes()) == "application/vnd.sbt.iqs"
+        with v1_file.open("rb") as v1_io, v2_file.open("rb") as v2_io:
+            assert iqs.from_io(v2_io) == iqs.from_io(v1_io)
+
+
+def test_iqs_gaps() -> None:
+    aggregate = make_iqs_aggregate()
+    first = slice_iqs_aggregate(aggregate, 0, 300)
+    # The system clock jumped 2 µs (two samples) ahead. This is just within the
+    # default tolerance.
+    second = replace(
+        slice_iqs_aggregate(aggregate, 300, 1000),
+        start_time=START_TIME + timedelta(microseconds=302),
+    )
+    second_data = iqs_to_bytes(second)
+    data = iqs_to_bytes(first) + second_data[idat_offset(second_data) :]
+
+    for lazy in (False, True):
+        with TemporaryDirectory() as temp_dir:
+            iqs_file = Path(temp_dir) / "data.iqs"
+            iqs_file.write_bytes(data)
+            with iqs_file.open("rb") as io:
+                merged = iqs.from_io(io, lazy=lazy)
+            assert merged.gap_map == (IqsGap(300 * TIME_STEP_NS, 302 * TIME_STEP_NS),)
+            assert merged.gaps("site0", "hf") == (range(300, 302),)
+            assert merged.duration_ns == 1002 * TIME_STEP_NS
+            re = merged.sites["site0"]["hf"].re
+            # Zeros within the gap and data on either side of it
+            assert re[:1200] == aggregate.sites["site0"]["hf"].re[:1200]
+            assert re[1200:1208] == bytes(8)
+            assert re[1208:] == aggregate.sites["site0"]["hf"].re[1200:]
+
+    # Fill the gaps (and only the gaps) with a value of your choice
+    ihdr = IhdrChunk({"site0": {"hf": aggregate.sites["site0"]["hf"]}})
+    chunks = [
+        IdatChunk(
+            part.start_time,
+            part.duration_ns,
+            {"site0": {"hf": part.sites["site0"]["hf"]}},
+        )
+        for part in (first, second)
+    ]
+    merged_idat = IdatChunk.merge_all(
+        *chunks, ihdr=ihdr, fill_missing_values_with=b"\xff"
+    )
+    assert merged_idat.gaps == merged.gap_map
+    assert merged_idat.sites["site0"]["hf"].re[1200:1208] == b"\xff" * 8
@@ -0,0 +1,80 @@
+from dataclasses import replace
+from io import BytesIO
+from random import Random
+from typing import get_args
+
+import pytest
+
+from pilus.errors import PilusDeserializeError
+from pilus.sbt._format import iqs
+from pilus.sbt._format.iqs import IqsCompression, IqsVersion
+from pilus.sbt._format.iqs._chunks import _zdat
+
+from ._synthetic import iqs_to_bytes, make_iqs_aggregate
+
+
+@pytest.mark.parametrize("compression", get_args(IqsCompression))
+def test_iqs_compression_round_trip(
+    monkeypatch: pytest.MonkeyPatch, compression: IqsCompression
+) -> None:
+    # Use a tiny block size to exercise the block boundaries. Note that it is
+    # not a multiple of the sample size.
+    monkeypatch.setattr(_zdat, "BLOCK_SIZE", 42)
+    aggregate = make_iqs_aggregate()
+    uncompressed = iqs_to_bytes(aggregate, chunk_samples=300)
+    compressed = iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+    # The synthetic data is a ramp. Delta encoding makes it trivial to compress.
+    assert len(compressed) < len(uncompressed) // 5
+    for memory_map in (False, True):
+        assert iqs.from_io(BytesIO(compressed), memory_map=memory_map) == aggregate
+
+
+@pytest.mark.parametrize("compression", get_args(IqsCompression))
+def test_iqs_compression_many_blocks(
+    monkeypatch: pytest.MonkeyPatch, compression: IqsCompression
+) -> None:
+    # Noise doesn't compress. Each compressed part spans many blocks and input
+    # slices (neither of which is a multiple of the other).
+    monkeypatch.setattr(_zdat, "BLOCK_SIZE", 1000)
+    monkeypatch.setattr(_zdat, "INPUT_SLICE_SIZE", 300)
+    # Seeded for reproducibility (not for cryptography)
+    random = Random(0)  # noqa: S311
+    aggregate = make_iqs_aggregate(samples=20000, site_names=("site0",))
+    aggregate = replace(
+        aggregate,
+        sites={
+            "site0": {
+                channel_name: replace(
+                    channel,
+                    re=random.randbytes(len(channel.re)),
+                    im=random.randbytes(len(channel.im)),
+                )
+                for channel_name, channel in aggregate.sites["site0"].items()
+            }
+        },
+    )
+    compressed = iqs_to_bytes(aggregate, compression=compression)
+    # Four parts of (at least) 50 blocks each
+    assert len(compressed) > 4 * 50 * _zdat.BLOCK_SIZE
+    for memory_map in (False, True):
+        assert iqs.from_io(BytesIO(compressed), memory_map=memory_map) == aggregate
+
+
+def test_iqs_compression_errors() -> None:
+    aggregate = make_iqs_aggregate()
+    with pytest.raises(ValueError, match=r"requires version 2\.0\.0"):
+        iqs.to_io(
+            aggregate,
+            BytesIO(),
+            version=IqsVersion.V1_0_0,
+            site_to_keep="site0",
+            compression="zlib",
+        )
+
+    # Corrupt the compressed data
+    data = bytearray(iqs_to_bytes(aggregate, compression="zlib"))
+    data[-10] ^= 0xFF
+    with pytest.raises(PilusDeserializeError, match='CRC mismatch in "zDAT"'):
+        iqs.from_io(BytesIO(data))
+    with pytest.raises(PilusDeserializeError, match="decompress"):
+        iqs.from_io(BytesIO(data), verify_crc="skip")
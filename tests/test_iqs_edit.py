@@ -0,0 +1,140 @@
+from dataclasses import replace
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pilus.errors import PilusDeserializeError
+from pilus.sbt._format import iqs
+from pilus.sbt._format._chunk import instrument_chunks
+
+from ._synthetic import (
+    START_TIME,
+    TIME_STEP_NS,
+    iqs_to_bytes,
+    make_iqs_aggregate,
+    slice_iqs_aggregate,
+)
+
+
+def test_iqs_concat() -> None:
+    aggregate = make_iqs_aggregate()
+    first = iqs_to_bytes(slice_iqs_aggregate(aggregate, 0, 600), chunk_samples=300)
+    second = iqs_to_bytes(slice_iqs_aggregate(aggregate, 600, 1000), chunk_samples=300)
+
+    with TemporaryDirectory() as temp_dir:
+        files = [Path(temp_dir) / "first.iqs", Path(temp_dir) / "second.iqs"]
+        files[0].write_bytes(first)
+        files[1].write_bytes(second)
+        output_file = Path(temp_dir) / "output.iqs"
+        with (
+            files[0].open("rb") as first_io,
+            files[1].open("rb") as second_io,
+            output_file.open("wb") as output_io,
+            instrument_chunks() as stats,
+        ):
+            iqs.concat_io([first_io, second_io], output_io)
+        # Only the boundary chunks. We copy the rest as-is.
+        assert stats.reads[b"IDAT"].count == 4
+        assert not stats.writes
+        concatenated = output_file.read_bytes()
+    assert concatenated == iqs_to_bytes(aggregate, chunk_samples=300)
+
+    # Same result without file descriptors
+    with BytesIO() as io:
+        iqs.concat_io([BytesIO(first), BytesIO(second)], io)
+        assert io.getvalue() == concatenated
+
+    with pytest.raises(PilusDeserializeError, match="apart"):
+        iqs.concat_io([BytesIO(second), BytesIO(first)], BytesIO())
+    other = iqs_to_bytes(
+        make_iqs_aggregate(samples=400, site_names=("site0",), start_time=START_TIME)
+    )
+    with pytest.raises(PilusDeserializeError, match="different headers"):
+        iqs.concat_io([BytesIO(first), BytesIO(other)], BytesIO())
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_iqs_crop(compression: iqs.IqsCompression | None) -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+
+    with BytesIO() as io, instrument_chunks() as stats:
+        iqs.crop_io(BytesIO(data), io, start=250 * TIME_STEP_NS, end=950 * TIME_STEP_NS)
+        cropped = io.getvalue()
+    # We only write new chunks for the two boundary chunks
+    assert sum(per_type.count for per_type in stats.writes.values()) == 2
+    assert iqs.from_io(BytesIO(cropped)) == slice_iqs_aggregate(aggregate, 250, 950)
+
+    # Chunk boundaries don't need any new chunks at all
+    with BytesIO() as io, instrument_chunks() as stats:
+        iqs.crop_io(BytesIO(data), io, start=300 * TIME_STEP_NS)
+        cropped = io.getvalue()
+    assert not stats.writes
+    assert iqs.from_io(BytesIO(cropped)) == slice_iqs_aggregate(aggregate, 300, 1000)
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_iqs_split(compression: iqs.IqsCompression | None) -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate, chunk_samples=300, compression=compression)
+
+    outputs = {"site0": BytesIO(), "site1": BytesIO()}
+    iqs.split_io(BytesIO(data), outputs)
+    for site_name, io in outputs.items():
+        assert iqs.from_io(BytesIO(io.getvalue())) == replace(
+            aggregate, sites={site_name: aggregate.sites[site_name]}
+        )
+    with pytest.raises(PilusDeserializeError, match='No such site: "site9"'):
+        iqs.split_io(BytesIO(data), {"site9": BytesIO()})
+    # Every site of the header
+    opened: dict[str, BytesIO] = {}
+    iqs.split_io(
+        BytesIO(data), lambda site_name: opened.setdefault(site_name, BytesIO())
+    )
+    assert list(opened) == list(aggregate.sites)
+    for site_name, io in opened.items():
+        assert io.getvalue() == outputs[site_name].getvalue()
+
+
+def test_iqs_cli() -> None:
+    # The CLI is an optional extra
+    typer_testing = pytest.importorskip("typer.testing")
+    from pilus.cli import CLI_APP  # noqa: PLC0415
+
+    aggregate = make_iqs_aggregate()
+    runner = typer_testing.CliRunner()
+
+    with TemporaryDirectory() as temp_dir:
+        data_file = Path(temp_dir) / "data.iqs"
+        data_file.write_bytes(iqs_to_bytes(aggregate, chunk_samples=300))
+        cropped_file = Path(temp_dir) / "cropped.iqs"
+        result = runner.invoke(
+            CLI_APP,
+            [
+                "iqs",
+                "crop",
+                str(data_file),
+                str(cropped_file),
+                "--start-ns",
+                str(100 * TIME_STEP_NS),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        result = runner.invoke(CLI_APP, ["iqs", "split", str(cropped_file), "site1"])
+        assert result.exit_code == 0, result.output
+        with (Path(temp_dir) / "cropped.site1.iqs").open("rb") as io:
+            site1 = iqs.from_io(io)
+        expected = slice_iqs_aggregate(aggregate, 100, 1000)
+        assert site1 == replace(expected, sites={"site1": expected.sites["site1"]})
+        assert site1.start_time == START_TIME + timedelta(microseconds=100)
+        # Defaults to all sites
+        result = runner.invoke(CLI_APP, ["iqs", "split", str(data_file)])
+        assert result.exit_code == 0, result.output
+        for site_name in aggregate.sites:
+            with (Path(temp_dir) / f"data.{site_name}.iqs").open("rb") as io:
+                assert iqs.from_io(io) == replace(
+                    aggregate, sites={site_name: aggregate.sites[site_name]}
+                )
@@ -0,0 +1,143 @@
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from pilus.forge import FORGE
+from pilus.sbt._format import iqs
+from pilus.sbt._format._chunk import instrument_chunks
+
+from ._synthetic import MAX_AMPLITUDE, iqs_to_bytes, make_iqs_aggregate
+
+np = pytest.importorskip("numpy")
+
+
+def test_iqs_channel_numpy() -> None:
+    aggregate = make_iqs_aggregate()
+    data = iqs_to_bytes(aggregate)
+    channel = iqs.from_io(BytesIO(data), memory_map=True).sites["site0"]["lf"]
+    expected_re = np.frombuffer(aggregate.sites["site0"]["lf"].re, dtype="<i4")
+    expected_im = np.frombuffer(aggregate.sites["site0"]["lf"].im, dtype="<i4")
+
+    # Zero-copy views
+    re, im = channel.to_numpy()
+    assert np.shares_memory(re, np.frombuffer(data, dtype=np.uint8))
+    assert not re.flags.writeable
+    assert np.array_equal(re, expected_re)
+    assert np.array_equal(im, expected_im)
+
+    scaled_re, scaled_im = channel.to_scaled_numpy()
+    assert scaled_re.dtype == np.float32
+    assert np.allclose(scaled_im, expected_im / MAX_AMPLITUDE)
+
+    result = channel.to_complex_numpy(dtype=np.complex128)
+    assert result.dtype == np.complex128
+    assert np.allclose(result, (expected_re + 1j * expected_im) / MAX_AMPLITUDE)
+
+    # On-demand registration in the forge
+    transformed = FORGE.transform(channel, np.ndarray)
+    assert transformed.dtype == np.complex64
+    assert np.allclose(transformed, result)
+
+
+def test_iqs_envelope() -> None:
+    from pilus.numpy import IqsEnvelope, load_iqs_envelope  # noqa: PLC0415
+
+    aggregate = make_iqs_aggregate()
+    block_sizes = (4, 16, 64)
+    envelope = IqsEnvelope.from_aggregate(aggregate, block_sizes=block_sizes)
+    re, _ = aggregate.sites["site1"]["hf"].to_numpy()
+    finest, _, coarsest = envelope.sites["site1"]["hf"].re
+    assert len(finest) == 250
+    assert len(coarsest) == 16  # The last block is partial
+    assert np.allclose(finest.minimum, re[::4] / MAX_AMPLITUDE)
+    assert np.allclose(finest.maximum, re[3::4] / MAX_AMPLITUDE)
+    assert np.allclose(coarsest.mean[-1], re[960:].mean() / MAX_AMPLITUDE)
+
+    # The coarsest level with enough blocks for the requested width
+    level = envelope.select("site1", "hf", "re", width=100)
+    assert level is not None
+    assert level.block_size == 4
+    level = envelope.select("site1", "hf", "re", width=10, start=100_000, end=300_000)
+    assert level is not None
+    assert level.block_size == 16
+    assert level.offset_ns == 96_000
+    assert len(level) == 13
+    assert envelope.select("site1", "hf", "re", width=1000) is None
+
+    with TemporaryDirectory() as temp_dir:
+        iqs_file = Path(temp_dir) / "data.iqs"
+        iqs_file.write_bytes(iqs_to_bytes(aggregate, chunk_samples=300))
+        with instrument_chunks() as stats:
+            loaded = load_iqs_envelope(iqs_file, block_sizes=block_sizes)
+        # A single pass over the data chunks (for all channels)
+        assert stats.reads[b"IDAT"].count == 4
+        # The second call uses the sidecar file
+        assert (Path(temp_dir) / "data.iqs.envelope").exists()
+        cached = load_iqs_envelope(iqs_file, block_sizes=block_sizes)
+        # A damaged (empty or truncated) sidecar file is a cache miss
+        sidecar = Path(temp_dir) / "data.iqs.envelope"
+        sidecar_data = sidecar.read_bytes()
+        for damaged in (b"", sidecar_data[: len(sidecar_data) // 2]):
+            sidecar.write_bytes(damaged)
+            load_iqs_envelope(iqs_file, block_sizes=block_sizes)
+            assert sidecar.read_bytes() == sidecar_data
+        # We write the sidecar file atomically. There are no temporary files left.
+        assert sorted(path.name for path in Path(temp_dir).iterdir()) == [
+            "data.iqs",
+            "data.iqs.envelope",
+        ]
+    for result in (loaded, cached):
+        for part in ("re", "im"):
+            for actual, expected in zip(
+                getattr(result.sites["site0"]["lf"], part),
+                getattr(envelope.sites["site0"]["lf"], part),
+                strict=True,
+            ):
+                assert actual.block_size == expected.block_size
+                assert np.array_equal(actual.minimum, expected.minimum)
+                assert np.array_equal(actual.maximum, expected.maximum)
+                assert np.array_equal(actual.mean, expected.mean)
+
+
+def test_iqs_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    from pilus.numpy import IqsCache, _iqs_cache  # noqa: PLC0415
+
+    aggregate = make_iqs_aggregate()
+    with TemporaryDirectory() as temp_dir:
+        files = [Path(temp_dir) / f"data{i}.iqs" for i in range(3)]
+        for file in files:
+            file.write_bytes(iqs_to_bytes(aggregate, chunk_samples=300))
+        cache = IqsCache(Path(temp_dir) / "cache")
+
+        assert cache.load(files[0]) == aggregate
+        # Now we skip the IQS file altogether and map the cached channel data
+        with monkeypatch.context() as patch:
+            patch.setattr(_iqs_cache, "iqs_from_io", None)
+            cached = cache.load(files[0])
+        assert cached == aggregate
+        re = cached.sites["site1"]["hf"].re
+        assert isinstance(re, memoryview)
+        assert isinstance(re.obj.base, np.memmap)
+
+        # Stale entries get replaced
+        files[0].write_bytes(iqs_to_bytes(make_iqs_aggregate(samples=10)))
+        assert cache.load(files[0]) == make_iqs_aggregate(samples=10)
+
+        # Room for two entries. We evict the least recently used one.
+        files[0].write_bytes(files[1].read_bytes())
+        cache.clear()
+        cache.load(files[0])
+        entry_size = sum(part.stat().st_size for part in cache.directory.rglob("*"))
+        cache = IqsCache(cache.directory, max_size=2 * entry_size + 1024)
+        cache.load(files[1])
+        cache.load(files[0])
+        cache.load(files[2])
+        assert len(list(cache.directory.iterdir())) == 2
+        with monkeypatch.context() as patch:
+            patch.setattr(_iqs_cache, "iqs_from_io", None)
+            cache.load(files[0])
+            cache.load(files[2])
+            with pytest.raises(TypeError):
+                cache.load(files[1])